@@ -1,59 +1,54 @@
 from typing import Annotated, Sequence, TypedDict, Dict, Any, List
-import json
-import asyncio
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
-from prompt.system import poli_agent_system_prompt
-from langchain_community.tools import TavilySearchResults
-from utils.logging_utils import log_tool_usage
+from prompt.registry import get_prompt
+from agents.tool_executor import run_tool_calls
+from state.transcript import TranscriptState
+from utils.context_window import get_context_manager
+from utils.llm import get_site_model
+from utils.metrics import timed_node
 
-class PoliAgentState(TypedDict):
-    messages: Annotated[Sequence[BaseMessage], add_messages]
-    chat_history: Sequence[BaseMessage]
+class PoliAgentState(TranscriptState):
+    """chat_history: 이전 턴, messages: 현재 턴의 메시지만"""
 
 def create_poli_agent():
+    # 도구 라이브러리는 에이전트 생성 시점에 로드
+    from tools.tavily_tool import create_tavily_tool
+
     # 도구 초기화
-    tavily_tool = TavilySearchResults(k=5)
+    tavily_tool = create_tavily_tool(k=5)
    
     tools = [tavily_tool]
     tools_by_name = {tool.name: tool for tool in tools}
     
     # LLM 초기화 (도구 바인딩 추가)
-    model = ChatOpenAI(model="gpt-4o-mini")
+    model = get_site_model("poli")
     model = model.bind_tools(tools)
+    # 고정 시스템 프롬프트 (레지스트리에서 한 번 생성)
+    system_prompt = get_prompt("poliagent.system").template.messages[0]
     
     # 도구 실행 노드 추가
-    def tool_node(state: PoliAgentState) -> Dict:
-        outputs = []    
-        for tool_call in state["messages"][-1].tool_calls:
-            # 도구 사용 로깅
-            log_tool_usage("poli_agent", tool_call["name"], json.dumps(tool_call["args"]))
-            
-            tool_result = tools_by_name[tool_call["name"]].invoke(tool_call["args"])
-            if asyncio.iscoroutine(tool_result):
-                tool_result = asyncio.run(tool_result)
-            outputs.append(
-                ToolMessage(
-                    content=json.dumps(tool_result),
-                    name=tool_call["name"],
-                    tool_call_id=tool_call["id"],
-                )
-            )
+    @timed_node("poliagent", "tools")
+    async def tool_node(state: PoliAgentState) -> Dict:
+        outputs = await run_tool_calls("poli_agent", state["messages"][-1].tool_calls, tools_by_name)
         return {"messages": outputs, "chat_history": state["chat_history"]}
     
     # LLM 노드
-    def call_model(
+    @timed_node("poliagent", "agent")
+    async def call_model(
         state: PoliAgentState,
         config: RunnableConfig,
     ) -> Dict:
-        system_prompt = SystemMessage(content=poli_agent_system_prompt)
-        
-        all_messages = [system_prompt] + list(state["chat_history"]) + list(state["messages"])
+        # 토큰 예산에 맞게 오래된 대화는 요약하고 최근 턴과 현재 턴(도구 결과 포함)은 그대로 유지
+        # chat_history 와 messages 는 겹치지 않으므로 이어 붙여 전체 대화를 구성
+        history, current = get_context_manager("poliagent").fit(
+            list(state["chat_history"]) + list(state["messages"]), system=[system_prompt]
+        )
+        all_messages = [system_prompt] + history + current
         
-        response = model.invoke(all_messages, config)
+        response = await model.ainvoke(all_messages, config)
         return {"messages": [response], "chat_history": state["chat_history"]}
     
     # 그래프 구성 수정
@@ -0,0 +1,241 @@
+"""
+로컬 의도 라우터 (LLM 슈퍼바이저 앞단의 빠른 경로)
+
+1. 키워드/정규식 규칙: 명확한 발화("진정서 작성하고 싶어요", "사기 당했어요", 인사말)를 즉시 분류
+2. 문자 n-gram TF-IDF 분류기: 라우팅 로그로 학습한 클래스별 중심 벡터와의 코사인 유사도로 분류
+
+신뢰도가 LOCAL_ROUTER_THRESHOLD 이상일 때만 결정하고, 그렇지 않으면 None 을 돌려 LLM 라우터가 결정하게 합니다.
+CPU 만 사용하며 외부 의존성이 없습니다.
+
+학습: python -m agents.router --data log/poli_agent.log --out data/router_model.json
+"""
+import argparse
+import json
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.config.settings import settings
+
+ROUTES = ("POLIAGENT", "COLLECTIONAGENT", "CHAT")
+
+
+class RouteDecision(NamedTuple):
+    route: str
+    confidence: float
+    source: str  # rules / classifier
+
+
+# (라우트, 패턴, 신뢰도)
+DEFAULT_RULES: List[Tuple[str, str, float]] = [
+    ("COLLECTIONAGENT", r"(진정서|고소장|신고서|고발장).{0,15}(작성|쓰|써|만들|양식|서식|제출|방법|절차)", 0.95),
+    ("COLLECTIONAGENT", r"(작성|쓰는|써야|양식|서식).{0,10}(진정서|고소장|고발장)", 0.95),
+    ("POLIAGENT", r"(사기|피싱|스미싱|먹튀).{0,10}(당했|당한|당하|피해|신고|맞은|같아)", 0.9),
+    ("POLIAGENT", r"(보이스\s?피싱|메신저\s?피싱|스미싱|로맨스\s?스캠|중고\s?거래\s?사기|투자\s?사기|리딩방)", 0.9),
+    ("POLIAGENT", r"(입금|송금|이체|돈을?\s?보냈).{0,20}(연락.{0,5}(안|두절|끊|차단)|잠수|물건.{0,5}(안|못)|환불.{0,5}(안|거부))", 0.9),
+    ("CHAT", r"^\s*(안녕(하세요|하십니까)?|하이|헬로|hello|hi|hey|반가워요?|반갑습니다|ㅎㅇ|고마워요?|고맙습니다|감사합니다|감사해요|ㄱㅅ)[\s!.~?ㅎㅋ^]*$", 0.95),
+    ("CHAT", r"^\s*(너는?|당신은?)\s?(누구|뭐|뭘)", 0.9),
+]
+
+
+class RuleRouter:
+    """정규식 규칙 기반 라우터 (서로 다른 라우트의 규칙이 동시에 맞으면 결정하지 않음)"""
+
+    def __init__(self, rules: Sequence[Tuple[str, str, float]] = DEFAULT_RULES):
+        self.rules = [(route, re.compile(pattern, re.IGNORECASE), confidence) for route, pattern, confidence in rules]
+
+    def route(self, text: str) -> Optional[RouteDecision]:
+        best: Dict[str, float] = {}
+        for route, pattern, confidence in self.rules:
+            if pattern.search(text):
+                best[route] = max(best.get(route, 0.0), confidence)
+        if len(best) != 1:
+            return None
+        route, confidence = next(iter(best.items()))
+        return RouteDecision(route, confidence, "rules")
+
+
+def _char_ngrams(text: str, ngram_range: Tuple[int, int]) -> Counter:
+    text = " " + " ".join(text.lower().split()) + " "
+    grams: Counter = Counter()
+    low, high = ngram_range
+    for n in range(low, high + 1):
+        for i in range(len(text) - n + 1):
+            gram = text[i:i + n]
+            if not gram.isspace():
+                grams[gram] += 1
+    return grams
+
+
+def _normalize(vector: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    return {k: v / norm for k, v in vector.items()} if norm else vector
+
+
+class NgramClassifier:
+    """문자 n-gram TF-IDF + 클래스 중심 벡터(Rocchio) 분류기"""
+
+    def __init__(self, ngram_range: Tuple[int, int] = (1, 3), temperature: float = 10.0):
+        self.ngram_range = tuple(ngram_range)
+        self.temperature = temperature
+        self.idf: Dict[str, float] = {}
+        self.centroids: Dict[str, Dict[str, float]] = {}
+
+    def _vector(self, text: str) -> Dict[str, float]:
+        grams = _char_ngrams(text, self.ngram_range)
+        return _normalize({g: (1 + math.log(c)) * self.idf[g] for g, c in grams.items() if g in self.idf})
+
+    def fit(self, texts: Sequence[str], labels: Sequence[str]) -> "NgramClassifier":
+        documents = [_char_ngrams(t, self.ngram_range) for t in texts]
+        df: Counter = Counter()
+        for grams in documents:
+            df.update(grams.keys())
+        n = len(documents)
+        self.idf = {g: math.log((1 + n) / (1 + d)) + 1 for g, d in df.items()}
+
+        sums: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for text, label in zip(texts, labels):
+            for g, w in self._vector(text).items():
+                sums[label][g] += w
+        self.centroids = {label: _normalize(dict(vector)) for label, vector in sums.items()}
+        return self
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        vector = self._vector(text)
+        if not vector or not self.centroids:
+            return {}
+        scores = {
+            label: sum(w * centroid.get(g, 0.0) for g, w in vector.items())
+            for label, centroid in self.centroids.items()
+        }
+        top = max(scores.values())
+        exp = {label: math.exp((s - top) * self.temperature) for label, s in scores.items()}
+        total = sum(exp.values())
+        return {label: v / total for label, v in exp.items()}
+
+    def route(self, text: str) -> Optional[RouteDecision]:
+        proba = self.predict_proba(text)
+        if not proba:
+            return None
+        label = max(proba, key=proba.get)
+        return RouteDecision(label, proba[label], "classifier")
+
+    def save(self, path: str) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "ngram_range": list(self.ngram_range),
+                "temperature": self.temperature,
+                "idf": self.idf,
+                "centroids": self.centroids,
+            }, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "NgramClassifier":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        classifier = cls(tuple(data["ngram_range"]), data["temperature"])
+        classifier.idf = data["idf"]
+        classifier.centroids = data["centroids"]
+        return classifier
+
+
+class LocalIntentRouter:
+    """규칙 → 분류기 순서로 시도하고, 신뢰도가 임계값 미만이면 None (LLM 라우터로 위임)"""
+
+    def __init__(self, rules: Optional[RuleRouter] = None, classifier: Optional[NgramClassifier] = None,
+                 threshold: float = None):
+        self.rules = rules if rules is not None else RuleRouter()
+        self.classifier = classifier
+        self.threshold = settings.LOCAL_ROUTER_THRESHOLD if threshold is None else threshold
+
+    def _decide(self, text: str) -> Optional[RouteDecision]:
+        decision = self.rules.route(text)
+        if decision is not None and decision.confidence >= self.threshold:
+            return decision
+        if self.classifier is not None:
+            decision = self.classifier.route(text)
+            if decision is not None and decision.confidence >= self.threshold:
+                return decision
+        return None
+
+    def route(self, text: str, active_agent: Optional[str] = None) -> Optional[RouteDecision]:
+        """
+        마지막 발화만으로 라우팅
+
+        active_agent 가 사용자에게 정보를 묻는 중이면 발화는 그 질문에 대한 답일 수 있으므로
+        (예: 정보 수집 중 "70만원 송금했는데 연락 두절"), 다른 라우트로의 결정은 내리지 않고 LLM 라우터에 맡깁니다.
+        """
+        if not text or not text.strip():
+            return None
+        decision = self._decide(text)
+        if decision is not None and active_agent and decision.route != active_agent:
+            return None
+        return decision
+
+
+def load_routing_samples(path: str, sources: Optional[Iterable[str]] = ("llm",)) -> Tuple[List[str], List[str]]:
+    """
+    JSON lines 에서 (문장, 라우트) 학습 데이터 로드
+
+    - 라우팅 로그: {"event": "agent_routing", "text": ..., "to_agent": ..., "source": "llm"}
+      (기본적으로 LLM 이 결정한 기록만 사용해 로컬 라우터의 결정이 다시 학습되지 않도록 함)
+    - 레이블 데이터: {"text": ..., "route": ...}
+    """
+    sources = set(sources) if sources is not None else None
+    texts: List[str] = []
+    labels: List[str] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict) or not record.get("text"):
+                continue
+            if record.get("event") == "agent_routing":
+                if sources is not None and record.get("source") not in sources:
+                    continue
+                route = record.get("to_agent")
+            else:
+                route = record.get("route")
+            if route in ROUTES:
+                texts.append(record["text"])
+                labels.append(route)
+    return texts, labels
+
+
+@lru_cache(maxsize=None)
+def get_local_router() -> LocalIntentRouter:
+    classifier = None
+    if settings.LOCAL_ROUTER_MODEL_PATH and os.path.exists(settings.LOCAL_ROUTER_MODEL_PATH):
+        classifier = NgramClassifier.load(settings.LOCAL_ROUTER_MODEL_PATH)
+    return LocalIntentRouter(classifier=classifier)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="라우팅 로그로 n-gram 분류기 학습")
+    parser.add_argument("--data", nargs="+", required=True, help="라우팅 로그 또는 레이블 JSONL 파일")
+    parser.add_argument("--out", default=settings.LOCAL_ROUTER_MODEL_PATH)
+    parser.add_argument("--all-sources", action="store_true", help="로컬 라우터가 결정한 기록도 학습에 사용")
+    args = parser.parse_args()
+
+    texts: List[str] = []
+    labels: List[str] = []
+    for path in args.data:
+        t, l = load_routing_samples(path, sources=None if args.all_sources else ("llm",))
+        texts += t
+        labels += l
+    if not texts:
+        raise SystemExit("학습 데이터가 없습니다")
+
+    NgramClassifier().fit(texts, labels).save(args.out)
+    print(f"{len(texts)}개 문장으로 학습: {dict(Counter(labels))} -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
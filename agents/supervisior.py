@@ -1,83 +1,148 @@
-from typing import Annotated, Sequence, TypedDict, Dict, List, Literal
-from pydantic import BaseModel
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+import re
+from typing import Annotated, Sequence, TypedDict, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage, HumanMessage
+from langchain_core.callbacks import adispatch_custom_event
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
 
 from agents.poliagent import create_poli_agent, PoliAgentState
 from agents.collectionagent import create_collection_agent, CollectionAgentState
+from agents.router import get_local_router
+from prompt.registry import get_prompt
+from state.transcript import TranscriptState
+from app.config.settings import settings
 from utils.logging_utils import log_agent_routing
+from utils.context_window import get_context_manager
+from utils.llm import get_site_model
+from utils.metrics import timed_node, ROUTING_DECISIONS
 
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-class SupervisorState(TypedDict):
-    messages: Annotated[Sequence[BaseMessage], add_messages]
-    chat_history: Sequence[BaseMessage]  # Dict 형식에서 BaseMessage로 변경
+class SupervisorState(TranscriptState):
+    # messages: 현재 턴의 메시지만, chat_history: 이전 턴까지의 대화 (TranscriptState 참고)
     next: str
+    active_agent: Optional[str]  # 작업 중인 에이전트 (다음 턴에 슈퍼바이저를 거치지 않고 바로 이어감)
+    sticky_turns: int  # 슈퍼바이저를 거치지 않고 이어간 연속 턴 수
 
 class RouteResponse(BaseModel):
     next: Literal["POLIAGENT", "COLLECTIONAGENT", "CHAT", "FINISH"]
 
+class RouteWithReplyResponse(RouteResponse):
+    """CHAT 답변을 라우팅 결정과 같은 응답에 포함 (CHAT 턴의 LLM 왕복 1회로 단축)"""
+    reply: Optional[str] = Field(
+        default=None,
+        description="next 가 CHAT 인 경우에만 사용자에게 보낼 답변, 그 외에는 비워 둠",
+    )
+
+STICKY_AGENTS = {"POLIAGENT": "poliagent", "COLLECTIONAGENT": "collectionagent"}
+
+# 사용자가 현재 흐름을 벗어나려는 명시적 표현
+STICKY_ESCAPE_PATTERN = re.compile(
+    r"(처음으로|처음부터|다른\s?(질문|얘기|이야기|문의)|주제\s?(를\s?)?바꿀|그만할래|취소|중단|필요\s?없어)"
+)
+
+# 에이전트 답변이 작업을 마쳤음을 나타내는 표현 (진정서 작성 버튼 안내 등)
+AGENT_DONE_PATTERN = re.compile(r"(진정서\s?(작성\s?)?버튼|버튼을\s?눌러)")
+
+def _last_user_text(messages: Sequence[BaseMessage]) -> str:
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            return message.content if isinstance(message.content, str) else ""
+    return ""
+
+def _awaiting_user_input(message: BaseMessage) -> bool:
+    """에이전트 답변이 사용자에게 추가 정보를 묻고 있는지 (작업 진행 중인지) 판단"""
+    content = message.content if isinstance(message.content, str) else ""
+    if not content or AGENT_DONE_PATTERN.search(content):
+        return False
+    return "?" in content[-300:]
+
+def _sticky_update(state: SupervisorState, agent: str, response: BaseMessage) -> Dict:
+    """
+    에이전트 실행 후 다음 턴의 고정 라우팅 상태 계산
+
+    active_agent 는 고정 라우팅을 끈 경우에도 기록해, 로컬 라우터가 진행 중인 흐름을 알 수 있게 합니다.
+    """
+    if not _awaiting_user_input(response):
+        return {"active_agent": None, "sticky_turns": 0}
+    turns = (state.get("sticky_turns") or 0) + 1 if state.get("active_agent") == agent else 0
+    return {"active_agent": agent, "sticky_turns": turns}
+
 def create_supervisor_agent():
     """슈퍼바이저 에이전트를 생성하는 메인 함수"""
     
     # 하위 에이전트들 초기화
     poli_agent = create_poli_agent()
     collection_agent = create_collection_agent()
-    # GPT-4 모델 초기화
-    model = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
+    # 라우팅 모델 초기화 (모델은 MODEL_TIER_POLICY 에 따름)
+    model = get_site_model("router", temperature=0.7)
+    # CHAT 응답용 모델 (매 턴 새로 만들지 않도록 한 번만 생성)
+    chat_model = get_site_model("chat", temperature=0.1)
+    # 명확한 발화는 LLM 호출 없이 로컬에서 라우팅
+    local_router = get_local_router() if settings.LOCAL_ROUTER_ENABLED else None
     
-    # 슈퍼바이저의 메인 프롬프트 설정
-    supervisor_prompt = ChatPromptTemplate.from_messages([
-        ("system", """
-        당신은 친절하고 전문적인 AI 어시스턴트입니다.
-        
-        입력을 정확히 분석하여 다음과 같이 라우팅하세요:
-        
-        1. 사용자가 사기 피해 신고를 원하는 경우, POLIAGENT로 라우팅하세요.
-        2. 사용자가 진정서 작성을 원하는 경우, 진정서 작성하는방법을 물어보는 경우, 대화내용을 보고 정보를 수집중이라면, COLLECTIONAGENT로 라우팅하세요.
-        3. 사용자가 일반적인 대화를 원하는 경우, CHAT로 라우팅하세요.
-        
-        명확하지 않은 경우, 사용자에게 구체적인 의도를 물어보세요.
-        """),
-        MessagesPlaceholder(variable_name="chat_history"),
-        MessagesPlaceholder(variable_name="messages"),
-        ("system", "다음 중 하나를 선택하세요: POLIAGENT, LETTERAGENT, WRITERAGENT, CHAT")
-    ])
+    # 프롬프트는 레지스트리에서 한 번 생성된 것을 사용하고, 체인도 여기서 한 번만 구성
+    if settings.SUPERVISOR_INLINE_CHAT_REPLY:
+        # CHAT 으로 라우팅할 때는 reply 에 답변까지 작성하도록 지시
+        route_prompt = get_prompt("supervisor.route_with_reply")
+        route_chain = route_prompt.template | model.with_structured_output(RouteWithReplyResponse)
+    else:
+        route_prompt = get_prompt("supervisor.route")
+        route_chain = route_prompt.template | model.with_structured_output(RouteResponse)
+    chat_prompt = get_prompt("supervisor.chat")
     
-    def supervisor_node(state: SupervisorState) -> Dict:
+    @timed_node("supervisor", "supervisor")
+    async def supervisor_node(state: SupervisorState, config: RunnableConfig) -> Dict:
         try:
-            # 라우팅 결정 (이미 BaseMessage 형식이므로 변환 불필요)
-            route_chain = supervisor_prompt | model.with_structured_output(RouteResponse)
-            result = route_chain.invoke({
-                "messages": state["messages"],
-                "chat_history": state["chat_history"]
-            })
+            text = _last_user_text(state["messages"])
+            decision = (
+                local_router.route(text, active_agent=state.get("active_agent"))
+                if local_router is not None else None
+            )
+            reply = None
+            if decision is not None:
+                next_route, source, confidence = decision.route, decision.source, round(decision.confidence, 3)
+            else:
+                # 라우팅 결정 (토큰 예산에 맞게 오래된 대화는 요약)
+                # 시스템 프롬프트와 라우팅 지시문 토큰은 예산에서 미리 차감
+                history, current = get_context_manager("supervisor").fit(
+                    list(state["chat_history"]) + list(state["messages"]),
+                    reserved_tokens=route_prompt.static_tokens,
+                )
+                result = await route_chain.ainvoke({
+                    "messages": current,
+                    "chat_history": history
+                })
+                next_route, source, confidence = result.next, "llm", None
+                reply = getattr(result, "reply", None)
             
-            log_agent_routing("supervisor", result.next)
+            log_agent_routing(
+                "supervisor", next_route, source=source, confidence=confidence,
+                text=text if settings.ROUTING_LOG_TEXT else None,
+            )
+            ROUTING_DECISIONS.inc(route=next_route, source=source)
+            # 스트리밍 클라이언트에 라우팅 결정 전달
+            await adispatch_custom_event("route", {"next": next_route, "source": source}, config=config)
             
-            if result.next == "CHAT":
-                chat_model = ChatOpenAI(
-                    model="gpt-4o-mini",
-                    temperature=0.1,
-                )
-                
-                chat_prompt = ChatPromptTemplate.from_messages([
-                    ("system", "당신은 POlI Agent 로 사기피해 진정서에 관련된 특화에이전트입니다. 유저의 질문을 받아서, 관련내용이 아니라면 해당 Task 를 수행할 수 있도록 유도를 하세요."),
-                    MessagesPlaceholder(variable_name="chat_history"),
-                    MessagesPlaceholder(variable_name="messages")
-                ])
-                
-                # 응답 생성 (이미 BaseMessage 형식)
-                response = chat_model.invoke(chat_prompt.format_messages(
-                    messages=state["messages"],
-                    chat_history=state["chat_history"]
-                ))
+            if next_route == "CHAT":
+                if reply:
+                    # 라우터가 함께 생성한 답변 사용 (추가 LLM 호출 없음)
+                    response = AIMessage(content=reply)
+                else:
+                    # 응답 생성 (토큰 예산에 맞게 오래된 대화는 요약)
+                    history, current = get_context_manager("chat").fit(
+                        list(state["chat_history"]) + list(state["messages"]),
+                        reserved_tokens=chat_prompt.static_tokens,
+                    )
+                    response = await chat_model.ainvoke(chat_prompt.template.format_messages(
+                        messages=current,
+                        chat_history=history
+                    ))
                 
                 # 메시지와 채팅 기록 업데이트
                 new_messages = list(state["messages"]) + [response]
@@ -86,30 +151,57 @@ def create_supervisor_agent():
                 return {
                     "messages": new_messages,
                     "chat_history": chat_history,
-                    "next": "FINISH"
+                    "next": "FINISH",
+                    "active_agent": None,
+                    "sticky_turns": 0
                 }
             
+            # 새로 라우팅했으므로 이전 고정 라우팅 상태는 초기화
             return {
                 "messages": state["messages"],
                 "chat_history": state["chat_history"],
-                "next": result.next
+                "next": next_route,
+                "active_agent": None,
+                "sticky_turns": 0
             }
             
         except Exception as e:
             return {
                 "messages": [SystemMessage(content="죄송합니다. 일시적인 오류가 발생했습니다.")],
                 "chat_history": state["chat_history"],
-                "next": "FINISH"
+                "next": "FINISH",
+                "active_agent": None,
+                "sticky_turns": 0
             }
     
-    def collection_node(state: SupervisorState) -> Dict:
+    async def entry_router(state: SupervisorState, config: RunnableConfig) -> str:
+        """작업 중인 에이전트가 있으면 슈퍼바이저(LLM 라우팅)를 건너뛰고 바로 이어감"""
+        agent = state.get("active_agent")
+        if agent not in STICKY_AGENTS or not settings.STICKY_ROUTING_ENABLED:
+            return "supervisor"
+        if (state.get("sticky_turns") or 0) >= settings.STICKY_MAX_TURNS:
+            return "supervisor"
+        
+        text = _last_user_text(state["messages"])
+        # 명시적으로 흐름을 벗어나려는 경우에만 다시 라우팅 (발화 하나에 대한 규칙 일치는 에이전트 질문에 대한
+        # 답일 수 있으므로 고정을 풀지 않음 - 예: 정보 수집 중 "70만원 송금했는데 연락 두절")
+        if STICKY_ESCAPE_PATTERN.search(text):
+            return "supervisor"
+        
+        log_agent_routing("session", agent, source="sticky", text=text if settings.ROUTING_LOG_TEXT else None)
+        ROUTING_DECISIONS.inc(route=agent, source="sticky")
+        await adispatch_custom_event("route", {"next": agent, "source": "sticky"}, config=config)
+        return agent
+    
+    @timed_node("supervisor", "collectionagent")
+    async def collection_node(state: SupervisorState) -> Dict:
         """정보 수집 에이전트 노드"""
         try:
             collection_state = CollectionAgentState(
                 messages=state["messages"],
                 chat_history=state["chat_history"]
             )
-            result = collection_agent.invoke(collection_state)
+            result = await collection_agent.ainvoke(collection_state)
             
             # 응답이 있는지 확인
             if result and "messages" in result and result["messages"]:
@@ -122,7 +214,8 @@ def create_supervisor_agent():
                     return {
                         "messages": result["messages"],
                         "chat_history": new_chat_history,
-                        "next": "FINISH"
+                        "next": "FINISH",
+                        **_sticky_update(state, "COLLECTIONAGENT", response_message)
                     }
             
             raise ValueError("정보 수집 에이전트로부터 유효한 응답을 받지 못했습니다")
@@ -132,10 +225,13 @@ def create_supervisor_agent():
             return {
                 "messages": [error_message],
                 "chat_history": state["chat_history"],
-                "next": "FINISH"
+                "next": "FINISH",
+                "active_agent": None,
+                "sticky_turns": 0
             }
         
-    def poli_node(state: SupervisorState) -> Dict:
+    @timed_node("supervisor", "poliagent")
+    async def poli_node(state: SupervisorState) -> Dict:
         """사기 피해 신고 에이전트 노드
         
         Args:
@@ -148,11 +244,12 @@ def create_supervisor_agent():
             messages=state["messages"],
             chat_history=state["chat_history"]
         )
-        result = poli_agent.invoke(poli_state)
+        result = await poli_agent.ainvoke(poli_state)
         return {
             "messages": result["messages"],
             "chat_history": result["chat_history"],
-            "next": "FINISH"
+            "next": "FINISH",
+            **_sticky_update(state, "POLIAGENT", result["messages"][-1])
         }
     
     # 워크플로우 그래프 구성
@@ -163,8 +260,11 @@ def create_supervisor_agent():
     workflow.add_node("poliagent", poli_node)
     workflow.add_node("collectionagent", collection_node)
     
-    # 시작점을 슈퍼바이저로 설정    
-    workflow.set_entry_point("supervisor")
+    # 시작점: 작업 중인 에이전트가 있으면 해당 에이전트, 아니면 슈퍼바이저
+    workflow.set_conditional_entry_point(entry_router, {
+        "supervisor": "supervisor",
+        **{agent: node for agent, node in STICKY_AGENTS.items()}
+    })
     
     # 조건부 라우팅 규칙 설정
     conditional_map = {
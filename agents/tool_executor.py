@@ -0,0 +1,71 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Sequence
+
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool
+
+from app.config.settings import settings
+from tools.cache import get_tool_cache
+from utils.logging_utils import log_tool_usage
+from utils.metrics import TOOL_LATENCY, TOOL_ERRORS
+from utils.usage import usage_component
+
+logger = logging.getLogger(__name__)
+
+
+def _tool_timeout(tool_name: str) -> float:
+    return settings.TOOL_TIMEOUTS.get(tool_name, settings.TOOL_TIMEOUT_SECONDS)
+
+
+async def _invoke(tool: BaseTool, args: Dict[str, Any]) -> Any:
+    """캐시 대상 도구는 같은 인자의 최근 결과를 재사용"""
+    if settings.TOOL_CACHE_ENABLED and tool.name in settings.TOOL_CACHE_TOOLS:
+        return await get_tool_cache().get_or_call(tool.name, args, lambda: tool.ainvoke(args))
+    return await tool.ainvoke(args)
+
+
+async def _run_tool_call(agent_name: str, tool_call: Dict[str, Any], tools_by_name: Dict[str, BaseTool]) -> ToolMessage:
+    """도구 호출 하나를 실행하고, 실패 시 에러 ToolMessage 반환"""
+    name = tool_call["name"]
+    # 도구 사용 로깅
+    log_tool_usage(agent_name, name, tool_call["args"])
+
+    with TOOL_LATENCY.time(tool=name), usage_component(f"tool.{name}"):
+        try:
+            tool = tools_by_name[name]
+            result = await asyncio.wait_for(_invoke(tool, tool_call["args"]), timeout=_tool_timeout(name))
+        except Exception as e:
+            TOOL_ERRORS.inc(tool=name)
+            if isinstance(e, asyncio.TimeoutError):
+                error = f"도구 실행 시간 초과 ({_tool_timeout(name)}초)"
+            elif isinstance(e, KeyError):
+                error = f"알 수 없는 도구: {name}"
+            else:
+                error = f"도구 실행 실패: {e}"
+            logger.warning("Tool Failed - Agent: %s, Tool: %s, Error: %s", agent_name, name, error)
+            return ToolMessage(
+                content=json.dumps({"error": error}, ensure_ascii=False),
+                name=name,
+                tool_call_id=tool_call["id"],
+                status="error",
+            )
+    return ToolMessage(content=json.dumps(result), name=name, tool_call_id=tool_call["id"])
+
+
+async def run_tool_calls(
+    agent_name: str,
+    tool_calls: Sequence[Dict[str, Any]],
+    tools_by_name: Dict[str, BaseTool],
+) -> List[ToolMessage]:
+    """
+    한 턴의 도구 호출들을 동시에 실행
+
+    각 도구는 TOOL_TIMEOUT_SECONDS(도구별 TOOL_TIMEOUTS 우선) 안에 끝나야 하며,
+    일부 도구가 실패해도 턴 전체를 실패시키지 않고 해당 호출에 대한 에러 ToolMessage 를 돌려줍니다.
+    결과 순서는 tool_calls 순서와 같습니다.
+    """
+    return list(await asyncio.gather(
+        *(_run_tool_call(agent_name, tool_call, tools_by_name) for tool_call in tool_calls)
+    ))
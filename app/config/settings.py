@@ -1,8 +1,136 @@
 from pydantic_settings import BaseSettings
+from typing import Dict, List
 
 class Settings(BaseSettings):
     APP_TITLE: str = "Poli Agent API"
     APP_DESCRIPTION: str = "사기 피해 신고 및 진정서 작성을 도와주는 AI 어시스턴트 API"
     APP_VERSION: str = "1.0.0"
 
+    # 시작 시 서비스(그래프, 모델 클라이언트, 도구)를 미리 생성할지 여부
+    WARMUP_ON_STARTUP: bool = False
+
+    # 대화 기록 저장소 (memory | sqlite | redis)
+    CHAT_HISTORY_BACKEND: str = "memory"
+    CHAT_HISTORY_SQLITE_PATH: str = "data/chat_history.db"
+    CHAT_HISTORY_KEY_PREFIX: str = "poli:chat"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    CHAT_HISTORY_MAX_SESSIONS: int = 10000  # memory 저장소 세션 수 상한 (LRU 제거)
+    CHAT_HISTORY_MAX_MESSAGES: int = 200  # 세션당 보관 메시지 수 상한
+    CHAT_HISTORY_TTL_SECONDS: int = 6 * 60 * 60  # 유휴 세션 만료 시간
+    CHAT_HISTORY_SWEEP_INTERVAL_SECONDS: int = 60
+
+    # LLM/검색 API 공유 HTTP 커넥션 풀
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_TIMEOUT_SECONDS: float = 120.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    HTTP2_ENABLED: bool = False  # h2 패키지 필요
+
+    # 도구 실행 (한 턴의 도구 호출은 동시에 실행)
+    TOOL_TIMEOUT_SECONDS: float = 30.0
+    TOOL_TIMEOUTS: Dict[str, float] = {}  # 도구별 타임아웃, 예: {"perplexity_qa_tool": 60}
+
+    # 로컬 의도 라우터 (신뢰도가 임계값 미만이면 LLM 라우터 사용)
+    LOCAL_ROUTER_ENABLED: bool = True
+    LOCAL_ROUTER_THRESHOLD: float = 0.85
+    LOCAL_ROUTER_MODEL_PATH: str = "data/router_model.json"  # 없으면 규칙만 사용
+    ROUTING_LOG_TEXT: bool = False  # 라우팅 로그에 사용자 발화 기록 (분류기 학습용, 전화/계좌/주민번호와 숫자는 마스킹)
+    SUPERVISOR_INLINE_CHAT_REPLY: bool = True  # CHAT 답변을 라우팅 응답에 함께 생성
+    STICKY_ROUTING_ENABLED: bool = True  # 작업 중인 에이전트로 후속 턴을 바로 전달
+    STICKY_MAX_TURNS: int = 8  # 슈퍼바이저를 거치지 않고 이어갈 최대 연속 턴 수
+
+    # 대화 문맥 토큰 예산 (시스템 프롬프트 + 요약 + 최근 턴 + 현재 턴)
+    CONTEXT_DEFAULT_BUDGET: int = 6000
+    CONTEXT_BUDGETS: Dict[str, int] = {"supervisor": 3000, "chat": 3000, "poliagent": 6000, "collectionagent": 8000}
+    CONTEXT_KEEP_LAST_TURNS: int = 6  # 예산 안에서 그대로 유지할 최근 턴 수
+    CONTEXT_SUMMARY_MAX_TOKENS: int = 800  # 오래된 턴 요약의 최대 토큰 수
+
+    # 도구 결과 캐시 (메모리 LRU + 선택적 SQLite)
+    TOOL_CACHE_ENABLED: bool = True
+    TOOL_CACHE_TOOLS: List[str] = ["tavily_search_results_json", "perplexity_qa_tool"]
+    TOOL_CACHE_TTL_SECONDS: int = 6 * 60 * 60
+    TOOL_CACHE_TTLS: Dict[str, int] = {}  # 도구별 TTL, 예: {"tavily_search_results_json": 86400}
+    TOOL_CACHE_MAX_ENTRIES: int = 1000  # 메모리 계층 항목 수 상한
+    TOOL_CACHE_SQLITE_PATH: str = ""  # 비어 있으면 디스크 계층 사용 안 함 (예: "data/tool_cache.db")
+    TOOL_CACHE_DISK_MAX_ENTRIES: int = 20000
+
+    # 통합 분석 도구 (True: 상세/감정/해결방안을 한 번의 LLM 호출로 - 호출 수/입력 토큰 최소,
+    # False: 세 도구를 동시에 호출 - 출력이 나뉘어 생성되므로 지연시간 최소)
+    # 결과는 도구 결과 캐시에 메시지 기준으로 저장 (TOOL_CACHE_ENABLED, TOOL_CACHE_TTLS["analysis_tool"])
+    ANALYSIS_FUSED: bool = True
+
+    # 모델 등급 정책 (호출 위치 -> 등급 -> 모델)
+    MODEL_TIERS: Dict[str, str] = {
+        "fast": "gpt-4o-mini",
+        "quality": "gpt-4",
+        "search": "llama-3.1-sonar-large-128k-online",  # Perplexity
+    }
+    MODEL_TIER_POLICY: Dict[str, str] = {
+        "router": "fast", "chat": "fast", "poli": "fast", "collection": "fast",
+        "check": "fast", "letter": "quality", "tools": "fast", "search": "search",
+    }
+    MODEL_DOWNGRADE: Dict[str, str] = {"quality": "fast"}  # 부하가 높거나 지연 예산이 부족할 때 낮출 등급
+    MODEL_TIER_LATENCY_MS: Dict[str, float] = {"fast": 3000, "quality": 15000}  # 등급별 예상 응답 시간 (남은 예산과 비교)
+    MODEL_DOWNGRADE_INFLIGHT: int = 0  # 동시 처리 중인 요청이 이 값 이상이면 하향 (0 이면 사용 안 함)
+    MODEL_LATENCY_BUDGET_MS: float = 0  # 요청 지연 예산 기본값 (X-Latency-Budget-Ms 헤더 우선, 0 이면 제한 없음)
+
+    # LLM 게이트웨이 (공유 HTTP 클라이언트에서 호스트별 속도 제한, 우선순위 대기, 429/5xx 재시도를 한 곳에서 처리)
+    LLM_GATEWAY_ENABLED: bool = True  # 켜져 있으면 ChatOpenAI 자체 재시도는 끔 (max_retries=0)
+    # 호스트별 분당 요청/토큰 한도 (0 이면 제한 없음, 목록에 없는 호스트는 그대로 통과)
+    LLM_RATE_LIMITS: Dict[str, Dict[str, float]] = {
+        "api.openai.com": {"rpm": 500, "tpm": 200000},
+        "api.perplexity.ai": {"rpm": 50, "tpm": 0},
+    }
+    LLM_GATEWAY_BURST_SECONDS: float = 6.0  # 버킷 용량 = 분당 한도의 이 시간만큼 (순간 폭주 허용 범위)
+    # 엔드포인트별 대기 우선순위 (작을수록 먼저, 목록에 없으면 LLM_GATEWAY_DEFAULT_PRIORITY)
+    LLM_GATEWAY_PRIORITIES: Dict[str, int] = {
+        "/api/v1/chat": 0,
+        "/api/v1/chat/stream": 0,
+        "/api/v1/check-completion": 1,
+        "/api/v1/letter/generate": 2,
+        "/api/v1/letter/generate/stream": 2,
+    }
+    LLM_GATEWAY_DEFAULT_PRIORITY: int = 1
+    LLM_GATEWAY_MAX_RETRIES: int = 4
+    LLM_GATEWAY_BACKOFF_BASE_SECONDS: float = 0.5  # 지수 백오프 시작값 (full jitter)
+    LLM_GATEWAY_BACKOFF_MAX_SECONDS: float = 30.0
+    LLM_GATEWAY_MAX_WAIT_SECONDS: float = 60.0  # 대기열에서 이보다 오래 기다리면 429 로 응답
+    LLM_GATEWAY_COMPLETION_TOKENS: int = 512  # max_tokens 가 없는 요청의 출력 토큰 예상치 (TPM 차감용)
+
+    # 요청별 LLM 토큰/비용 집계
+    # 모델별 100만 토큰당 (입력, 출력) 단가 USD - 날짜가 붙은 모델명은 가장 긴 접두사로 매칭
+    LLM_PRICES: Dict[str, List[float]] = {
+        "gpt-4o-mini": [0.15, 0.6],
+        "gpt-4o": [2.5, 10.0],
+        "gpt-4-turbo": [10.0, 30.0],
+        "gpt-4": [30.0, 60.0],
+        "gpt-3.5-turbo": [0.5, 1.5],
+        "llama-3.1-sonar-large-128k-online": [1.0, 1.0],
+    }
+    USAGE_RESPONSE_HEADER: bool = False  # 응답에 X-LLM-Usage 헤더, 스트림 done 이벤트에 usage 포함
+    USAGE_MAX_SESSIONS: int = 10000  # 세션별 누적 사용량을 유지할 최대 세션 수
+
+    # 진정서 완성도 확인 (슬롯 상태 기반)
+    CHECK_SLOT_WEIGHTS: Dict[str, float] = {"complainant": 25, "respondent": 25, "damage": 35, "evidence": 15}
+    CHECK_FULFILLED_PERCENTAGE: float = 80.0
+    CHECK_ENTITY_EXTRACTOR: bool = True  # 규칙 기반 추출을 먼저 하고, 결과가 애매할 때만 LLM 으로 추출
+    CHECK_STRUCTURED_OUTPUT_METHOD: str = "json_schema"  # LLM 추출의 구조화 출력 방식 (json_schema | function_calling)
+
+    # 진정서 생성 (llm: 전체를 LLM 으로 작성, template: 고정 양식 + 서술 부분만 LLM)
+    LETTER_GENERATION_MODE: str = "llm"
+    LETTER_NARRATIVE_CACHE_TTL_SECONDS: int = 24 * 60 * 60  # 같은 항목 상태의 서술 부분 재사용 기간
+    LETTER_NARRATIVE_CACHE_MAX_ENTRIES: int = 1000
+
+    # 로깅 (큐 기반 비동기 파이프라인)
+    LOG_DIR: str = "log"  # 비어 있으면 파일 없이 콘솔(stderr)로만 기록 (벤치마크/CLI 스크립트)
+    LOG_LEVEL: str = "INFO"
+    LOG_FILE_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_FILE_BACKUP_COUNT: int = 10
+    LOG_ROTATE_INTERVAL_SECONDS: int = 24 * 60 * 60  # 0 이면 시간 기준 교체 안 함
+    LOG_QUEUE_SIZE: int = 10000  # 가득 차면 WARNING 미만 레코드는 버리고, WARNING 이상은 stderr 에 바로 기록
+    LOG_MAX_FIELD_CHARS: int = 500  # 구조화 필드(도구 인자 등) 최대 길이
+    LOG_SAMPLE_RATES: Dict[str, float] = {}  # 예: {"poli_agent": 0.1}
+    LOG_RATE_LIMITS: Dict[str, float] = {}  # 예: {"supervisor": 50} (초당 레코드 수)
+
 settings = Settings()
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from pydantic import Field
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 class CompletionCheckRequest(BaseModel):
     chat_history: str = Field(..., description="대화 내용",
                               
@@ -11,7 +11,36 @@ class CompletionCheckRequest(BaseModel):
                             사용자: 쇼핑몰 이름은 '스마트마켓'이고 2024년 3월 18일에 결제했어요. 45만원 상당의 전자제품이었어요.
                             챗봇: 네, 확인감사합니다. 결제 방법은 어떻게 되시나요? 그리고 판매자와의 연락 기록이 있으신가요?
                             """)
+    session_id: Optional[str] = Field(default=None, description="세션 ID (지정하면 이전 확인 이후 추가된 대화만 분석)")
 
 class CompletionAnalysis(BaseModel):
     fulfilled: bool = Field(description="진정서 작성 가능 여부 (80% 이상일 때 True)")
-    percentage: float = Field(description="진정서 작성을 위한 정보 완성도 (0-100)")
\ No newline at end of file
+    percentage: float = Field(description="진정서 작성을 위한 정보 완성도 (0-100)")
+    missing: List[str] = Field(default_factory=list, description="아직 확인되지 않은 항목")
+
+
+class ComplainantSlots(BaseModel):
+    name: Optional[str] = Field(default=None, description="신청인 성명")
+    birth_date: Optional[str] = Field(default=None, description="신청인 생년월일 또는 주민등록번호")
+    address: Optional[str] = Field(default=None, description="신청인 주소")
+    phone: Optional[str] = Field(default=None, description="신청인 연락처")
+
+class RespondentSlots(BaseModel):
+    name: Optional[str] = Field(default=None, description="피진정인 성명 또는 닉네임/아이디")
+    account: Optional[str] = Field(default=None, description="피진정인 계좌번호 (은행명 포함)")
+    phone: Optional[str] = Field(default=None, description="피진정인 연락처")
+    site: Optional[str] = Field(default=None, description="피진정인이 사용한 사이트/플랫폼 아이디 또는 사이트명")
+
+class DamageSlots(BaseModel):
+    fraud_type: Optional[str] = Field(default=None, description="사기 유형 (예: 중고거래 사기, 보이스피싱)")
+    occurred_at: Optional[str] = Field(default=None, description="피해 발생 일시")
+    amount: Optional[str] = Field(default=None, description="피해 금액")
+    platform: Optional[str] = Field(default=None, description="피해 장소 (플랫폼/사이트)")
+    description: Optional[str] = Field(default=None, description="피해 경위 요약")
+
+class SlotState(BaseModel):
+    """진정서 필수 항목별로 대화에서 확인된 정보"""
+    complainant: ComplainantSlots = Field(default_factory=ComplainantSlots, description="신청인 정보")
+    respondent: RespondentSlots = Field(default_factory=RespondentSlots, description="피진정인 정보")
+    damage: DamageSlots = Field(default_factory=DamageSlots, description="피해 내용")
+    evidence: List[str] = Field(default_factory=list, description="확보한 증거자료 목록 (예: 대화 캡처, 이체내역)")
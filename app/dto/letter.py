@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from typing import Literal, Optional
 
 class LetterRequest(BaseModel):
     chat_content: str = Field(
@@ -14,6 +15,11 @@ class LetterRequest(BaseModel):
             "사용자: 네, 대화 내용 캡처랑 계좌이체 내역 다 있어요."
         )
     )
+    session_id: Optional[str] = Field(default=None, description="세션 ID (template 모드에서 완성도 확인 때 추출한 항목 재사용)")
+    mode: Optional[Literal["llm", "template"]] = Field(
+        default=None,
+        description="생성 방식 (llm: 전체를 LLM 으로 작성, template: 고정 양식에 추출 항목을 채우고 서술 부분만 LLM 으로 작성, 기본값은 LETTER_GENERATION_MODE)"
+    )
 
 class LetterResponse(BaseModel):
     content: str = Field(
@@ -47,4 +53,11 @@ class LetterResponse(BaseModel):
             "2024년 3월 20일\n"
             "신청인: ○○○ (서명 또는 인)"
         )
-    ) 
\ No newline at end of file
+    )
+
+class LetterNarrative(BaseModel):
+    """template 모드에서 LLM 이 작성하는 진정서 서술 부분"""
+    purpose: str = Field(description="진정취지 (수사 및 처벌, 피해 회복 요청 취지를 한두 문장으로)")
+    damage: str = Field(description="피해상황 (피해 경위를 시간 순서대로 2~4문장으로)")
+    route: str = Field(default="", description="피해 발생 경로 (어떤 경로와 수단으로 접촉해 피해를 입었는지 한 문장, 정보가 없으면 빈 문자열)")
+    conclusion: str = Field(description="결론 (진정 의견 정리, 한두 문장)")
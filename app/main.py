@@ -1,14 +1,57 @@
-from fastapi import FastAPI, Response
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Callable
+from fastapi import BackgroundTasks, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
+from starlette.routing import Match
 from app.config.settings import settings
-from app.routers import chat, letter, check
+from app.routers import chat, letter, check, monitor
+from app.services.chat_history import chat_history
+from app.services.chat_service import get_chat_service
+from app.services.check import get_check_service
+from app.services.letter_service import get_letter_service
+from prompt.registry import compile_prompts
+from utils.context_window import load_encoding
+from utils.http_client import aclose_http_clients
+from utils.metrics import REQUEST_LATENCY
+from utils.model_policy import finish_request, start_request
+from utils.usage import finish_request_usage, start_request_usage
+
+
+def warmup():
+    """서비스를 미리 생성하여 첫 요청의 지연을 제거 (WARMUP_ON_STARTUP)"""
+    started = time.perf_counter()
+    get_chat_service()
+    get_check_service()
+    get_letter_service()
+    logging.getLogger("startup").info(f"Warmup completed in {time.perf_counter() - started:.2f}s")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 유휴 세션 정리 스레드 시작
+    chat_history.start_sweeper()
+    # 토큰 인코딩(tiktoken BPE 파일)은 첫 요청이 아닌 시작 시 로드 (문맥 예산 계산에 사용)
+    # 사용할 수 없으면 근사치로 계산하며 경고는 이때 한 번만 기록
+    await asyncio.to_thread(load_encoding)
+    # 프롬프트 템플릿은 워밍업 여부와 관계없이 시작 시 한 번 생성 (버전 로그)
+    await asyncio.to_thread(compile_prompts)
+    if settings.WARMUP_ON_STARTUP:
+        # 이벤트 루프를 막지 않도록 별도 스레드에서 생성
+        await asyncio.to_thread(warmup)
+    yield
+    chat_history.stop_sweeper()
+    await aclose_http_clients()
 
 
 app = FastAPI(
     title=settings.APP_TITLE,
     description=settings.APP_DESCRIPTION,
     version=settings.APP_VERSION,
+    lifespan=lifespan,
     docs_url="/api/docs",  # 스웨거 UI URL
     redoc_url="/api/redoc",  # ReDoc URL
     openapi_url="/api/openapi.json"  # OpenAPI 스키마
@@ -23,6 +66,104 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """라우터(tags)별 요청 처리 시간 기록 (스트리밍 응답은 헤더 전송 시점까지)"""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        tags = getattr(request.scope.get("route"), "tags", None)
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - started,
+            router=tags[0] if tags else "other",
+            method=request.method,
+            status=status,
+        )
+
+def _endpoint_path(request: Request) -> str:
+    """요청이 매칭될 라우트의 경로 템플릿 (예: /api/v1/chat) - 라우팅 전에 엔드포인트 라벨을 정하기 위해 사용"""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", "other")
+    return "other"
+
+def _finish_after_response(response: Response, finish: Callable[[], None]) -> Response:
+    """
+    응답 본문 전송이 끝나면 finish 를 정확히 한 번 호출
+
+    본문 반복이 끝나거나 취소될 때 호출하고, 본문을 보내기 전에 연결이 끊겨 반복이 시작되지 않은 경우에도
+    응답의 백그라운드 작업으로 호출되도록 합니다.
+    """
+    finished = False
+
+    async def finish_once():
+        nonlocal finished
+        if not finished:
+            finished = True
+            finish()
+
+    body_iterator = response.body_iterator
+
+    async def finish_after_body():
+        try:
+            async for chunk in body_iterator:
+                yield chunk
+        finally:
+            await finish_once()
+
+    response.body_iterator = finish_after_body()
+    tasks = BackgroundTasks()
+    if response.background is not None:
+        tasks.add_task(response.background)
+    tasks.add_task(finish_once)
+    response.background = tasks
+    return response
+
+@app.middleware("http")
+async def track_llm_usage(request: Request, call_next):
+    """
+    요청 처리 중 발생한 LLM 호출의 토큰/비용을 집계
+
+    엔드포인트(경로 템플릿)와 세션별로 누적합니다. 세션은 X-Session-Id 헤더로 시작하고,
+    요청 본문의 session_id 를 받는 서비스(채팅 등)는 bind_session 으로 다시 지정합니다.
+    USAGE_RESPONSE_HEADER 가 켜져 있으면 X-LLM-Usage 헤더로 반환합니다.
+    스트리밍 응답은 본문 전송이 끝난 뒤 집계합니다 (헤더에는 헤더 전송 시점까지의 사용량만 포함).
+    """
+    usage = start_request_usage(_endpoint_path(request), request.headers.get("x-session-id"))
+    try:
+        response = await call_next(request)
+    except BaseException:
+        finish_request_usage(usage)
+        raise
+    if settings.USAGE_RESPONSE_HEADER:
+        response.headers["X-LLM-Usage"] = usage.header_value()
+    return _finish_after_response(response, lambda: finish_request_usage(usage))
+
+@app.middleware("http")
+async def bind_model_policy(request: Request, call_next):
+    """
+    모델 등급 선택에 쓰이는 요청 상태(동시 처리 요청 수, 지연 예산)를 바인딩
+
+    지연 예산은 X-Latency-Budget-Ms 헤더, 없으면 MODEL_LATENCY_BUDGET_MS (0 이면 제한 없음).
+    스트리밍 응답은 본문 전송이 끝날 때까지 처리 중으로 셉니다.
+    """
+    try:
+        budget_ms = float(request.headers.get("x-latency-budget-ms") or settings.MODEL_LATENCY_BUDGET_MS)
+    except ValueError:
+        budget_ms = settings.MODEL_LATENCY_BUDGET_MS
+    start_request(budget_ms)
+    try:
+        response = await call_next(request)
+    except BaseException:
+        finish_request()
+        raise
+    return _finish_after_response(response, finish_request)
+
 @app.get("/", include_in_schema=False)
 async def root():
     return RedirectResponse(url="/api/docs")
@@ -35,3 +176,5 @@ async def docs_redirect():
 app.include_router(chat.router)
 app.include_router(letter.router)
 app.include_router(check.router)
+app.include_router(monitor.router)
+app.include_router(monitor.metrics_router)
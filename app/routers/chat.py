@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from app.dto.chat import ChatRequest, ChatResponse
-from app.services.chat_service import chat_service
+from app.services.chat_service import get_chat_service
+from utils.sse import sse_stream, SSE_HEADERS
 from typing import Dict
 
 router = APIRouter(
@@ -56,13 +58,52 @@ async def chat_endpoint(request: ChatRequest):
     - **request**: 사용자의 채팅 메시지 목록과 세션 ID
     """
     try:
-        return await chat_service.process_chat(
+        return await get_chat_service().process_chat(
             messages=request.messages,
             session_id=request.session_id
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post(
+    "/chat/stream",
+    summary="채팅 메시지 스트리밍 처리 (SSE)",
+    description="""
+    채팅 메시지를 처리하고 진행 상황과 답변 토큰을 Server-Sent Events로 스트리밍합니다.
+    
+    - session: 세션 ID
+    - route: 슈퍼바이저의 라우팅 결정
+    - tool_start / tool_end: 도구 호출 시작/종료
+    - token: 답변 토큰
+    - done: 최종 메시지와 첫 토큰까지의 시간(ttft_ms)
+    - error: 처리 중 오류
+    """,
+    responses={
+        200: {
+            "description": "SSE 이벤트 스트림",
+            "content": {
+                "text/event-stream": {
+                    "example": "event: route\ndata: {\"next\": \"POLIAGENT\", \"elapsed_ms\": 812.4}\n\n"
+                }
+            }
+        }
+    }
+)
+async def chat_stream_endpoint(request: ChatRequest):
+    """
+    채팅 메시지를 처리하고 결과를 SSE로 스트리밍합니다.
+
+    - **request**: 사용자의 채팅 메시지 목록과 세션 ID
+    """
+    return StreamingResponse(
+        sse_stream(get_chat_service().stream_chat(
+            messages=request.messages,
+            session_id=request.session_id
+        )),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
 @router.get(
     "/health",
     summary="헬스 체크",
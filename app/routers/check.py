@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from app.dto.check import CompletionCheckRequest, CompletionAnalysis
-from app.services.check import check_service
+from app.services.check import get_check_service
 from typing import Dict
 
 router = APIRouter(
@@ -21,6 +21,9 @@ router = APIRouter(
     - 증거자료 (15%)
     
     총 80% 이상일 경우 진정서 작성이 가능합니다.
+    
+    session_id 를 함께 보내면 세션별 항목 상태를 이어서 사용하므로, 이전 확인 이후 추가된 대화만 분석합니다.
+    대화가 추가되지 않았다면 LLM 호출 없이 저장된 상태로 즉시 계산합니다.
     """,
     responses={
         200: {
@@ -29,7 +32,8 @@ router = APIRouter(
                 "application/json": {
                     "example": {
                         "fulfilled": True,
-                        "percentage": 85.0
+                        "percentage": 85.0,
+                        "missing": ["신청인 주소"]
                     }
                 }
             }
@@ -63,7 +67,7 @@ async def check_completion(request: CompletionCheckRequest) -> CompletionAnalysi
         CompletionAnalysis: 진정서 작성 가능 여부와 완성도 정보
     """
     try:
-        return await check_service.check_completion(request)
+        return await get_check_service().check_completion(request)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
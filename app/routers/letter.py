@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from app.dto.letter import LetterRequest, LetterResponse
-from app.services.letter_service import letter_service
+from app.services.letter_service import get_letter_service
+from utils.sse import sse_stream, SSE_HEADERS
 
 router = APIRouter(
     prefix="/api/v1",
@@ -10,7 +12,13 @@ router = APIRouter(
     "/letter/generate",
     response_model=LetterResponse,
     summary="진정서 생성",
-    description="대화 내용을 바탕으로 진정서를 생성합니다.",
+    description="""
+    대화 내용을 바탕으로 진정서를 생성합니다.
+    
+    - llm: 진정서 전체를 LLM 으로 작성
+    - template: 고정 양식은 대화에서 추출한 항목으로 채우고 진정취지/피해상황/결론만 LLM 으로 작성
+      (항목 상태가 같으면 서술 부분도 재사용, session_id 를 주면 완성도 확인 때 추출한 항목 재사용)
+    """,
     responses={
         200: {
             "description": "성공적으로 생성된 진정서",
@@ -37,9 +45,42 @@ async def generate_letter(request: LetterRequest):
     - **request**: 대화 내용과 세션 ID
     """
     try:
-        return await letter_service.generate_letter(request.chat_content)
+        return await get_letter_service().generate_letter(request.chat_content, request.session_id, request.mode)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"진정서 생성 중 오류가 발생했습니다: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+@router.post(
+    "/letter/generate/stream",
+    summary="진정서 스트리밍 생성 (SSE)",
+    description="""
+    대화 내용을 바탕으로 진정서를 생성하며, 섹션이 완성될 때마다 Server-Sent Events로 전송합니다.
+    
+    - section: 머리말, 신청인, 피진정인, 진정 내용, 상세 피해 상황, 결론 순서로 전송
+    - done: 진정서 전체 내용
+    - error: 생성 중 오류
+    """,
+    responses={
+        200: {
+            "description": "SSE 이벤트 스트림",
+            "content": {
+                "text/event-stream": {
+                    "example": "event: section\ndata: {\"index\": 1, \"name\": \"신청인\", \"content\": \"신청인(피해자)\\n    성명: 미상...\", \"elapsed_ms\": 2310.5}\n\n"
+                }
+            }
+        }
+    }
+)
+async def generate_letter_stream(request: LetterRequest):
+    """
+    대화 내용을 바탕으로 진정서를 섹션 단위로 스트리밍 생성합니다.
+
+    - **request**: 대화 내용
+    """
+    return StreamingResponse(
+        sse_stream(get_letter_service().stream_letter(request.chat_content, request.session_id, request.mode)),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
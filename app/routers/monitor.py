@@ -0,0 +1,297 @@
+import asyncio
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.services.chat_history import chat_history
+from prompt.registry import get_prompt_registry
+from tools.cache import get_tool_cache
+from utils.http_client import pool_stats
+from utils.llm_gateway import gateway_stats
+from utils.metrics import registry
+from utils.usage import get_usage_tracker
+from typing import Dict, Any
+
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["monitor"]
+)
+
+# Prometheus 스크레이프용 (경로 접두사 없음)
+metrics_router = APIRouter(tags=["monitor"])
+
+
+async def _update_chat_history_gauges() -> None:
+    """스크레이프마다 저장소 상태를 한 번만 조회 (SQLite/Redis 조회는 스레드에서 실행)"""
+    try:
+        stats = await chat_history.astats()
+    except Exception:
+        return  # 조회에 실패하면 이전 값 유지 (콜백 게이지와 같은 처리)
+    for key in ("sessions", "messages", "memory_bytes", "memory_bytes_per_session_avg", "memory_bytes_per_session_max"):
+        if key in stats:
+            CHAT_HISTORY_STATS.set(stats[key], backend=stats["backend"], stat=key)
+    for reason, count in stats.get("evictions", {}).items():
+        CHAT_HISTORY_EVICTIONS.set(count, backend=stats["backend"], reason=reason)
+
+
+def _http_pool_gauges():
+    for client, stats in pool_stats().items():
+        if client == "limits" or not stats.get("initialized"):
+            continue
+        for key in ("connections", "idle_connections", "active_connections", "in_flight", "requests_total", "errors_total"):
+            yield {"client": client, "stat": key}, stats[key]
+
+
+CHAT_HISTORY_STATS = registry.gauge(
+    "poli_chat_history", "대화 기록 저장소 상태 (세션/메시지 수, 메모리 사용량)", ("backend", "stat"))
+CHAT_HISTORY_EVICTIONS = registry.gauge(
+    "poli_chat_history_evictions", "대화 기록 제거 누적 횟수", ("backend", "reason"))
+def _tool_cache_gauges():
+    stats = get_tool_cache().stats()
+    for key in ("memory_entries", "disk_entries"):
+        if key in stats:
+            yield {"stat": key}, stats[key]
+
+
+registry.gauge("poli_http_pool", "공유 HTTP 커넥션 풀 상태", ("client", "stat"),
+               callback=_http_pool_gauges)
+registry.gauge("poli_tool_cache", "도구 결과 캐시 항목 수", ("stat",),
+               callback=_tool_cache_gauges)
+
+
+def _llm_gateway_gauges():
+    for host, stats in gateway_stats()["hosts"].items():
+        yield {"host": host}, stats["queue_depth"]
+
+
+registry.gauge("poli_llm_gateway_queue_depth", "LLM 게이트웨이 호스트별 대기 중인 호출 수", ("host",),
+               callback=_llm_gateway_gauges)
+
+@router.get(
+    "/stats/chat-history",
+    summary="대화 기록 저장소 상태",
+    description="""
+    대화 기록 저장소의 세션 수, 메시지 수, 세션당 메모리 사용량, 제거(eviction) 횟수를 반환합니다.
+    
+    - lru: 세션 수 상한 초과로 제거된 세션 수
+    - ttl: 유휴 시간 초과로 제거된 세션 수
+    - trimmed_messages: 세션당 메시지 수 상한 초과로 제거된 메시지 수
+    """,
+    response_model=Dict[str, Any],
+    responses={
+        200: {
+            "description": "저장소 상태",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "backend": "memory",
+                        "sessions": 120,
+                        "messages": 2400,
+                        "memory_bytes": 1843200,
+                        "memory_bytes_per_session_avg": 15360.0,
+                        "memory_bytes_per_session_max": 40960,
+                        "evictions": {"lru": 0, "ttl": 35, "trimmed_messages": 12}
+                    }
+                }
+            }
+        }
+    }
+)
+async def chat_history_stats():
+    """대화 기록 저장소 상태를 반환합니다."""
+    return await chat_history.astats()
+
+
+@router.get(
+    "/stats/http-pool",
+    summary="공유 HTTP 커넥션 풀 상태",
+    description="""
+    LLM/검색 API 호출에 공유되는 HTTP 커넥션 풀의 상태를 반환합니다.
+    
+    - connections: 현재 열려 있는 커넥션 수 (idle/active)
+    - requests_total / errors_total: 누적 요청/오류 수
+    - in_flight: 진행 중인 요청 수
+    """,
+    response_model=Dict[str, Any],
+    responses={
+        200: {
+            "description": "커넥션 풀 상태",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "limits": {"max_connections": 100, "max_keepalive_connections": 20, "keepalive_expiry_seconds": 30.0, "http2": False},
+                        "async": {"initialized": True, "connections": 3, "idle_connections": 2, "active_connections": 1, "http2_connections": 0, "requests_total": 152, "errors_total": 0, "in_flight": 1},
+                        "sync": {"initialized": False}
+                    }
+                }
+            }
+        }
+    }
+)
+async def http_pool_stats():
+    """공유 HTTP 커넥션 풀 상태를 반환합니다."""
+    return pool_stats()
+
+
+@router.get(
+    "/stats/tool-cache",
+    summary="도구 결과 캐시 상태",
+    description="""
+    Tavily/Perplexity 검색 결과 캐시의 항목 수와 설정을 반환합니다.
+    
+    적중/미적중 수는 /metrics 의 poli_tool_cache_requests_total 에서 확인할 수 있습니다.
+    """,
+    response_model=Dict[str, Any],
+    responses={
+        200: {
+            "description": "캐시 상태",
+            "content": {
+                "application/json": {
+                    "example": {"memory_entries": 42, "max_entries": 1000, "ttl_seconds": 21600, "disk_enabled": True, "disk_entries": 310}
+                }
+            }
+        }
+    }
+)
+async def tool_cache_stats():
+    """도구 결과 캐시 상태를 반환합니다."""
+    # 디스크 계층 항목 수 조회(SQLite)는 스레드에서 실행
+    return await asyncio.to_thread(get_tool_cache().stats)
+
+
+@router.get(
+    "/stats/llm-gateway",
+    summary="LLM 게이트웨이 상태",
+    description="""
+    LLM API 호스트별 속도 제한 한도와 대기열 상태를 반환합니다.
+    
+    - queue_depth: 버킷이 비어 대기 중인 호출 수
+    - paused_seconds: 429 응답(Retry-After)으로 호출을 멈춘 남은 시간
+    - acquired_total / rejected_total / wait_seconds_total: 누적 통과/거절 수와 대기 시간
+    
+    재시도 횟수와 대기 시간 분포는 /metrics 의 poli_llm_gateway_* 에서 확인할 수 있습니다.
+    """,
+    response_model=Dict[str, Any],
+    responses={
+        200: {
+            "description": "게이트웨이 상태",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "enabled": True,
+                        "hosts": {
+                            "api.openai.com": {"limits": {"rpm": 500, "tpm": 200000}, "queue_depth": 3, "paused_seconds": 0.0,
+                                               "acquired_total": 1280, "rejected_total": 0, "wait_seconds_total": 41.2}
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
+async def llm_gateway_stats():
+    """LLM 게이트웨이 상태를 반환합니다."""
+    return gateway_stats()
+
+
+@router.get(
+    "/stats/prompts",
+    summary="프롬프트 버전",
+    description="""
+    시작 시 생성된 프롬프트 템플릿별 버전(내용 해시)과 고정 접두사 토큰 수를 반환합니다.
+    
+    고정 접두사가 1024 토큰 이상이면 제공자의 프롬프트 접두사 캐시가 적용될 수 있습니다.
+    """,
+    response_model=Dict[str, Any],
+    responses={
+        200: {
+            "description": "프롬프트별 버전",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "letter.full": {"version": "3b9e0c41d2aa", "static_prefix_tokens": 412},
+                        "poliagent.system": {"version": "a07f5e9c1b3d", "static_prefix_tokens": 1290}
+                    }
+                }
+            }
+        }
+    }
+)
+async def prompt_stats():
+    """프롬프트 버전과 고정 접두사 크기를 반환합니다."""
+    return get_prompt_registry().stats()
+
+
+@router.get(
+    "/stats/usage",
+    summary="LLM 토큰/비용 사용량",
+    description="""
+    엔드포인트별 LLM 호출 수, 토큰 사용량, 추정 비용(USD) 누적값과 비용이 큰 세션 목록을 반환합니다.
+    
+    비용은 LLM_PRICES 단가로 추정한 값입니다. 그래프 노드/도구별 사용량은 /metrics 의
+    poli_llm_request_tokens_total, poli_llm_cost_usd_total 에서 확인할 수 있습니다.
+    """,
+    response_model=Dict[str, Any],
+    responses={
+        200: {
+            "description": "사용량 누적값",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "endpoints": {
+                            "/api/v1/chat": {"requests": 120, "calls": 310, "prompt_tokens": 412000, "completion_tokens": 38000, "cost_usd": 0.08460}
+                        },
+                        "sessions": 85,
+                        "top_sessions": {
+                            "3f1c...": {"requests": 14, "calls": 40, "prompt_tokens": 61000, "completion_tokens": 5200, "cost_usd": 0.01227}
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
+async def usage_stats():
+    """엔드포인트/세션별 LLM 사용량을 반환합니다."""
+    return get_usage_tracker().stats()
+
+
+@router.get(
+    "/stats/usage/{session_id}",
+    summary="세션 LLM 토큰/비용 사용량",
+    description="세션 하나의 LLM 호출 수, 토큰 사용량, 추정 비용(USD) 누적값을 반환합니다.",
+    response_model=Dict[str, Any],
+    responses={
+        404: {
+            "description": "사용량 기록이 없는 세션",
+            "content": {"application/json": {"example": {"detail": "사용량 기록이 없는 세션입니다."}}}
+        }
+    }
+)
+async def session_usage_stats(session_id: str):
+    """세션 하나의 LLM 사용량을 반환합니다."""
+    usage = get_usage_tracker().session(session_id)
+    if usage is None:
+        raise HTTPException(status_code=404, detail="사용량 기록이 없는 세션입니다.")
+    return usage
+
+
+@metrics_router.get(
+    "/metrics",
+    summary="Prometheus 메트릭",
+    description="""
+    Prometheus 텍스트 포맷 메트릭을 반환합니다.
+    
+    - poli_http_request_duration_seconds: 라우터별 요청 처리 시간
+    - poli_graph_node_duration_seconds: 그래프 노드 실행 시간
+    - poli_tool_call_duration_seconds / poli_tool_call_errors_total: 도구 호출 시간/오류 수
+    - poli_tool_cache_requests_total: 도구 결과 캐시 적중/미적중 수
+    - poli_routing_decisions_total: 라우팅 결정 수
+    - poli_llm_tokens_total / poli_llm_calls_total: LLM 토큰 사용량/호출 수
+    - poli_llm_request_tokens_total / poli_llm_cost_usd_total: 엔드포인트/구성 요소(그래프 노드, 도구)별 토큰 사용량/추정 비용
+    - poli_llm_request_cost_usd: 요청당 추정 비용
+    """,
+    response_class=PlainTextResponse
+)
+async def metrics():
+    """Prometheus 텍스트 포맷 메트릭을 반환합니다."""
+    await _update_chat_history_gauges()
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
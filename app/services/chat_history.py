@@ -1,20 +1,481 @@
-from typing import Dict, List
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+from app.config.settings import settings
 from app.dto.chat import ChatMessage
 
+logger = logging.getLogger("chat_history")
+
+
+def _dump_message(message: ChatMessage) -> str:
+    return json.dumps({"role": message.role, "content": message.content}, ensure_ascii=False)
+
+
+def _load_message(raw) -> ChatMessage:
+    data = json.loads(raw)
+    return ChatMessage(role=data["role"], content=data["content"])
+
+
+class ChatHistoryBackend(ABC):
+    """세션별 대화 기록 저장소 인터페이스"""
+
+    # 네트워크/디스크 I/O 가 있는 저장소는 비동기 메서드(ChatHistory.a*)에서 스레드로 실행
+    blocking: bool = True
+
+    @abstractmethod
+    def append(self, session_id: str, messages: List[ChatMessage]) -> None:
+        """메시지 묶음을 한 번에 추가 (한 턴의 메시지는 한 번의 왕복으로 저장)"""
+
+    @abstractmethod
+    def read(self, session_id: str) -> List[ChatMessage]:
+        """세션의 전체 메시지를 순서대로 반환"""
+
+    @abstractmethod
+    def clear(self, session_id: str) -> None:
+        """세션 기록(상태 포함) 삭제"""
+
+    @abstractmethod
+    def get_state(self, session_id: str) -> Dict[str, Any]:
+        """세션 상태(활성 에이전트 등 대화 외 정보) 반환, 없으면 빈 dict"""
+
+    @abstractmethod
+    def set_state(self, session_id: str, state: Dict[str, Any]) -> None:
+        """세션 상태 전체를 교체 (JSON 직렬화 가능한 값만)"""
+
+    def update_state(self, session_id: str, updates: Dict[str, Any]) -> None:
+        """최신 상태에 일부 항목만 병합 - 기본 구현은 읽기/쓰기가 분리되어 단일 워커에서만 안전"""
+        self.set_state(session_id, {**self.get_state(session_id), **updates})
+
+    def sweep(self) -> int:
+        """유휴 세션 정리, 삭제된 세션 수 반환 (TTL을 자체 지원하는 저장소는 불필요)"""
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+class _StoredMessage:
+    """메모리 저장용 압축 메시지 (pydantic 객체 대비 인스턴스당 메모리 절감)"""
+    __slots__ = ("role", "content")
+
+    def __init__(self, role: str, content: str):
+        self.role = sys.intern(role)  # user/assistant 등 역할 문자열은 전역 공유
+        self.content = content
+
+
+def _message_bytes(message: _StoredMessage) -> int:
+    return sys.getsizeof(message) + sys.getsizeof(message.content)
+
+
+class _Session:
+    __slots__ = ("messages", "state", "last_access", "size")
+
+    def __init__(self, max_messages: int):
+        self.messages: Deque[_StoredMessage] = deque(maxlen=max_messages)
+        self.state: Optional[Dict[str, Any]] = None
+        self.last_access = time.monotonic()
+        self.size = sys.getsizeof(self) + sys.getsizeof(self.messages)  # 메시지 포함 메모리 사용량 (추가/제거 시 갱신)
+
+
+class InMemoryChatHistoryBackend(ChatHistoryBackend):
+    """프로세스 로컬 저장소 (단일 워커 전용) - 세션 수/세션당 메시지 수/유휴 TTL 제한"""
+
+    blocking = False
+
+    def __init__(self, max_sessions: int = None, max_messages: int = None, ttl_seconds: int = None):
+        self.max_sessions = max_sessions or settings.CHAT_HISTORY_MAX_SESSIONS
+        self.max_messages = max_messages or settings.CHAT_HISTORY_MAX_MESSAGES
+        self.ttl_seconds = ttl_seconds or settings.CHAT_HISTORY_TTL_SECONDS
+        # 접근 순서대로 정렬 (가장 오래 사용되지 않은 세션이 앞쪽)
+        self.histories: "OrderedDict[str, _Session]" = OrderedDict()
+        self.evictions: Dict[str, int] = {"lru": 0, "ttl": 0, "trimmed_messages": 0}
+        # stats() 가 전체 메시지를 순회하지 않도록 추가/제거 시점에 갱신하는 합계
+        self._message_count = 0
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def _drop(self, session: _Session) -> None:
+        """제거된 세션을 합계에서 제외 (호출자가 잠금 보유)"""
+        self._message_count -= len(session.messages)
+        self._memory_bytes -= session.size
+
+    def _touch(self, session_id: str) -> _Session:
+        """세션을 가져오거나 생성하고 최근 사용으로 표시 (호출자가 잠금 보유)"""
+        session = self.histories.get(session_id)
+        if session is None:
+            session = self.histories[session_id] = _Session(self.max_messages)
+            self._memory_bytes += session.size
+            while len(self.histories) > self.max_sessions:
+                self._drop(self.histories.popitem(last=False)[1])
+                self.evictions["lru"] += 1
+        else:
+            self.histories.move_to_end(session_id)
+        session.last_access = time.monotonic()
+        return session
+
+    def append(self, session_id: str, messages: List[ChatMessage]) -> None:
+        stored = [_StoredMessage(m.role, m.content) for m in messages]
+        added = sum(_message_bytes(m) for m in stored)
+        with self._lock:
+            session = self._touch(session_id)
+            for message in stored:
+                if len(session.messages) == self.max_messages:
+                    # 가장 오래된 메시지가 밀려남
+                    trimmed = session.messages.popleft()
+                    added -= _message_bytes(trimmed)
+                    self._message_count -= 1
+                    self.evictions["trimmed_messages"] += 1
+                session.messages.append(message)
+            session.size += added
+            self._message_count += len(stored)
+            self._memory_bytes += added
+
+    def read(self, session_id: str) -> List[ChatMessage]:
+        with self._lock:
+            session = self.histories.get(session_id)
+            if session is None:
+                return []
+            self.histories.move_to_end(session_id)
+            session.last_access = time.monotonic()
+            stored = list(session.messages)
+        return [ChatMessage(role=m.role, content=m.content) for m in stored]
+
+    def clear(self, session_id: str) -> None:
+        with self._lock:
+            session = self.histories.pop(session_id, None)
+            if session is not None:
+                self._drop(session)
+
+    def get_state(self, session_id: str) -> Dict[str, Any]:
+        with self._lock:
+            session = self.histories.get(session_id)
+            return dict(session.state) if session is not None and session.state else {}
+
+    def set_state(self, session_id: str, state: Dict[str, Any]) -> None:
+        with self._lock:
+            self._touch(session_id).state = dict(state) if state else None
+
+    def update_state(self, session_id: str, updates: Dict[str, Any]) -> None:
+        with self._lock:
+            session = self._touch(session_id)
+            session.state = {**(session.state or {}), **updates} or None
+
+    def sweep(self) -> int:
+        deadline = time.monotonic() - self.ttl_seconds
+        removed = 0
+        with self._lock:
+            # 접근 순서로 정렬되어 있으므로 만료되지 않은 세션을 만나면 중단
+            while self.histories:
+                session_id, session = next(iter(self.histories.items()))
+                if session.last_access > deadline:
+                    break
+                del self.histories[session_id]
+                self._drop(session)
+                removed += 1
+            self.evictions["ttl"] += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sessions = len(self.histories)
+            largest = max((s.size for s in self.histories.values()), default=0)
+            messages, total = self._message_count, self._memory_bytes
+            evictions = dict(self.evictions)
+        return {
+            "backend": "memory",
+            "sessions": sessions,
+            "messages": messages,
+            "memory_bytes": total,
+            "memory_bytes_per_session_avg": round(total / sessions, 1) if sessions else 0.0,
+            "memory_bytes_per_session_max": largest,
+            "evictions": evictions,
+        }
+
+
+class SQLiteChatHistoryBackend(ChatHistoryBackend):
+    """SQLite(WAL) 저장소 - 같은 호스트의 여러 워커가 하나의 DB 파일을 공유"""
+
+    def __init__(self, path: str, max_messages: int = None, ttl_seconds: int = None):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_messages = max_messages or settings.CHAT_HISTORY_MAX_MESSAGES
+        self.ttl_seconds = ttl_seconds or settings.CHAT_HISTORY_TTL_SECONDS
+        self.evictions: Dict[str, int] = {"ttl": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chat_messages ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " session_id TEXT NOT NULL,"
+            " message TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_messages_session ON chat_messages (session_id, id)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chat_session_state ("
+            " session_id TEXT PRIMARY KEY,"
+            " state TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+
+    def append(self, session_id: str, messages: List[ChatMessage]) -> None:
+        now = time.time()
+        rows = [(session_id, _dump_message(m), now) for m in messages]
+        with self._lock:
+            # 한 트랜잭션으로 묶어서 fsync 횟수를 턴당 1회로 제한
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO chat_messages (session_id, message, created_at) VALUES (?, ?, ?)", rows
+                )
+                self._conn.execute(
+                    "DELETE FROM chat_messages WHERE session_id = ? AND id <= ("
+                    " SELECT id FROM chat_messages WHERE session_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (session_id, session_id, self.max_messages),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def read(self, session_id: str) -> List[ChatMessage]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT message FROM chat_messages WHERE session_id = ? ORDER BY id", (session_id,)
+            ).fetchall()
+        return [_load_message(row[0]) for row in rows]
+
+    def clear(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM chat_messages WHERE session_id = ?", (session_id,))
+            self._conn.execute("DELETE FROM chat_session_state WHERE session_id = ?", (session_id,))
+
+    def get_state(self, session_id: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM chat_session_state WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def set_state(self, session_id: str, state: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO chat_session_state (session_id, state, updated_at) VALUES (?, ?, ?)",
+                (session_id, json.dumps(state, ensure_ascii=False), time.time()),
+            )
+
+    def update_state(self, session_id: str, updates: Dict[str, Any]) -> None:
+        with self._lock:
+            # BEGIN IMMEDIATE 로 쓰기 잠금을 먼저 잡아 다른 워커의 병합과 직렬화
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT state FROM chat_session_state WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                state = {**(json.loads(row[0]) if row else {}), **updates}
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO chat_session_state (session_id, state, updated_at) VALUES (?, ?, ?)",
+                    (session_id, json.dumps(state, ensure_ascii=False), time.time()),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def sweep(self) -> int:
+        deadline = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [row[0] for row in self._conn.execute(
+                "SELECT session_id FROM chat_messages GROUP BY session_id HAVING MAX(created_at) < ?", (deadline,)
+            ).fetchall()]
+            if expired:
+                self._conn.executemany("DELETE FROM chat_messages WHERE session_id = ?", [(s,) for s in expired])
+            # 상태는 오래 변경되지 않았더라도 대화가 이어지는 동안 유지
+            self._conn.execute(
+                "DELETE FROM chat_session_state WHERE updated_at < ? AND session_id NOT IN ("
+                " SELECT session_id FROM chat_messages WHERE created_at >= ?)",
+                (deadline, deadline),
+            )
+            self.evictions["ttl"] += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sessions, messages = self._conn.execute(
+                "SELECT COUNT(DISTINCT session_id), COUNT(*) FROM chat_messages"
+            ).fetchone()
+        return {"backend": "sqlite", "sessions": sessions, "messages": messages, "evictions": dict(self.evictions)}
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class RedisChatHistoryBackend(ChatHistoryBackend):
+    """Redis 프로토콜 저장소 - 여러 호스트/워커가 공유 (세션당 하나의 LIST, 만료는 Redis TTL 사용)"""
+
+    def __init__(self, url: str, key_prefix: str = "poli:chat", max_messages: int = None, ttl_seconds: int = None):
+        import redis  # 선택 의존성: redis 백엔드를 사용할 때만 필요
+
+        self._client = redis.Redis.from_url(url)
+        self._watch_error = redis.WatchError
+        self._key_prefix = key_prefix
+        self.max_messages = max_messages or settings.CHAT_HISTORY_MAX_MESSAGES
+        self.ttl_seconds = ttl_seconds or settings.CHAT_HISTORY_TTL_SECONDS
+
+    def _key(self, session_id: str) -> str:
+        return f"{self._key_prefix}:{session_id}"
+
+    def append(self, session_id: str, messages: List[ChatMessage]) -> None:
+        if not messages:
+            return
+        key = self._key(session_id)
+        # RPUSH + LTRIM + EXPIRE 를 파이프라인으로 묶어 한 번의 왕복으로 처리
+        pipe = self._client.pipeline(transaction=False)
+        pipe.rpush(key, *[_dump_message(m) for m in messages])
+        pipe.ltrim(key, -self.max_messages, -1)
+        pipe.expire(key, self.ttl_seconds)
+        pipe.expire(self._state_key(session_id), self.ttl_seconds)  # 상태도 대화와 함께 유지
+        pipe.execute()
+
+    def read(self, session_id: str) -> List[ChatMessage]:
+        return [_load_message(raw) for raw in self._client.lrange(self._key(session_id), 0, -1)]
+
+    def clear(self, session_id: str) -> None:
+        self._client.delete(self._key(session_id), self._state_key(session_id))
+
+    def _state_key(self, session_id: str) -> str:
+        return f"{self._key_prefix}:{session_id}:state"
+
+    def get_state(self, session_id: str) -> Dict[str, Any]:
+        raw = self._client.get(self._state_key(session_id))
+        return json.loads(raw) if raw else {}
+
+    def set_state(self, session_id: str, state: Dict[str, Any]) -> None:
+        self._client.set(self._state_key(session_id), json.dumps(state, ensure_ascii=False), ex=self.ttl_seconds)
+
+    def update_state(self, session_id: str, updates: Dict[str, Any]) -> None:
+        key = self._state_key(session_id)
+        # WATCH/MULTI/EXEC 낙관적 잠금 - 읽은 뒤 다른 워커가 값을 바꾸면 EXEC 가 실패하므로 다시 병합
+        with self._client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    raw = pipe.get(key)
+                    state = {**(json.loads(raw) if raw else {}), **updates}
+                    pipe.multi()
+                    pipe.set(key, json.dumps(state, ensure_ascii=False), ex=self.ttl_seconds)
+                    pipe.execute()
+                    return
+                except self._watch_error:
+                    continue
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis"}
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def create_chat_history_backend(backend: str = None) -> ChatHistoryBackend:
+    """설정값(CHAT_HISTORY_BACKEND)에 따라 저장소 생성"""
+    backend = (backend or settings.CHAT_HISTORY_BACKEND).lower()
+    if backend == "memory":
+        return InMemoryChatHistoryBackend()
+    if backend == "sqlite":
+        return SQLiteChatHistoryBackend(settings.CHAT_HISTORY_SQLITE_PATH)
+    if backend == "redis":
+        return RedisChatHistoryBackend(settings.REDIS_URL, settings.CHAT_HISTORY_KEY_PREFIX)
+    raise ValueError(f"지원하지 않는 대화 기록 저장소입니다: {backend}")
+
+
 class ChatHistory:
-    def __init__(self):
-        self.histories: Dict[str, List[ChatMessage]] = {}
-    
+    def __init__(self, backend: ChatHistoryBackend = None):
+        self.backend = backend or InMemoryChatHistoryBackend()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_sweeper = threading.Event()
+
     def add_message(self, session_id: str, message: ChatMessage):
-        if session_id not in self.histories:
-            self.histories[session_id] = []
-        self.histories[session_id].append(message)
-    
+        self.backend.append(session_id, [message])
+
+    def add_messages(self, session_id: str, messages: List[ChatMessage]):
+        self.backend.append(session_id, list(messages))
+
     def get_history(self, session_id: str) -> List[ChatMessage]:
-        return self.histories.get(session_id, [])
-    
+        return self.backend.read(session_id)
+
     def clear_history(self, session_id: str):
-        if session_id in self.histories:
-            del self.histories[session_id]
+        self.backend.clear(session_id)
+
+    def get_session_state(self, session_id: str) -> Dict[str, Any]:
+        return self.backend.get_state(session_id)
+
+    def set_session_state(self, session_id: str, state: Dict[str, Any]):
+        self.backend.set_state(session_id, state)
+
+    def update_session_state(self, session_id: str, updates: Dict[str, Any]):
+        """최신 세션 상태에 일부 항목만 병합 (다른 요청/워커가 저장한 항목은 유지)"""
+        self.backend.update_state(session_id, updates)
+
+    # 비동기 핸들러용 - SQLite/Redis 왕복이 이벤트 루프를 막지 않도록 스레드에서 실행
+    async def _run(self, func, *args):
+        if not self.backend.blocking:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    async def aadd_messages(self, session_id: str, messages: List[ChatMessage]):
+        await self._run(self.add_messages, session_id, messages)
+
+    async def aget_history(self, session_id: str) -> List[ChatMessage]:
+        return await self._run(self.get_history, session_id)
+
+    async def aget_session_state(self, session_id: str) -> Dict[str, Any]:
+        return await self._run(self.get_session_state, session_id)
+
+    async def aupdate_session_state(self, session_id: str, updates: Dict[str, Any]):
+        await self._run(self.update_session_state, session_id, updates)
+
+    async def astats(self) -> Dict[str, Any]:
+        return await self._run(self.stats)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.backend.stats()
+
+    def start_sweeper(self, interval_seconds: float = None):
+        """백그라운드 스레드에서 주기적으로 유휴 세션을 정리"""
+        if self._sweeper and self._sweeper.is_alive():
+            return
+        interval = interval_seconds or settings.CHAT_HISTORY_SWEEP_INTERVAL_SECONDS
+        self._stop_sweeper.clear()
+
+        def _run():
+            while not self._stop_sweeper.wait(interval):
+                try:
+                    removed = self.backend.sweep()
+                    if removed:
+                        logger.info(f"Chat history sweep - evicted sessions: {removed}")
+                except Exception as e:
+                    logger.warning(f"Chat history sweep failed: {e}")
+
+        self._sweeper = threading.Thread(target=_run, name="chat-history-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        self._stop_sweeper.set()
+        if self._sweeper:
+            self._sweeper.join(timeout=1.0)
+            self._sweeper = None
 
-chat_history = ChatHistory() 
\ No newline at end of file
+chat_history = ChatHistory(create_chat_history_backend())
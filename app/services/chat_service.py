@@ -1,48 +1,164 @@
-from langchain_core.messages import HumanMessage, SystemMessage
-from typing import List, Dict
+from typing import List, Dict, Any, AsyncIterator
 from app.dto.chat import ChatMessage, ChatResponse
-from agents.supervisior import create_supervisor_agent
 from app.services.chat_history import chat_history
+from app.config.settings import settings
+from state.transcript import to_langchain_messages
+from utils.usage import bind_session, current_usage
+from functools import lru_cache
 from uuid import uuid4
+import asyncio
+import time
+
+# 답변 토큰을 만드는 그래프 노드 (에이전트 모델, 슈퍼바이저 CHAT 답변) - tools 노드 안의 모델 출력은 답변이 아님
+ANSWER_NODES = frozenset({"agent", "supervisor"})
 
 class ChatService:
     def __init__(self):
+        # 그래프/모델/도구 라이브러리는 서비스 생성 시점에 로드 (앱 import 시간 단축)
+        from agents.supervisior import create_supervisor_agent
+
         self.supervisor = create_supervisor_agent()
-    
+
+    def _build_input(self, history: List[ChatMessage], messages: List[ChatMessage],
+                     session_state: Dict[str, Any] = None) -> Dict[str, Any]:
+        """이전 기록과 새 메시지(및 세션의 활성 에이전트)를 슈퍼바이저 입력 상태로 변환"""
+        # 이전 턴은 chat_history, 이번 턴의 새 메시지는 messages 로만 전달 (중복 전송 방지)
+        return {
+            "messages": to_langchain_messages(messages),
+            "chat_history": to_langchain_messages(history),
+            "next": "supervisor",
+            "active_agent": (session_state or {}).get("active_agent"),
+            "sticky_turns": (session_state or {}).get("sticky_turns", 0)
+        }
+
+    async def _save_routing_state(self, session_id: str, session_state: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """다음 턴을 위해 활성 에이전트 저장 (변경된 경우에만 기록)"""
+        if not result:
+            return
+        routing = {"active_agent": result.get("active_agent"), "sticky_turns": result.get("sticky_turns") or 0}
+        updated = {**session_state, **routing}
+        if updated != session_state and (session_state or updated["active_agent"]):
+            # 턴 처리 중 다른 요청(완성도 확인 등)이 저장한 항목을 덮어쓰지 않도록 최신 상태에 병합
+            await chat_history.aupdate_session_state(session_id, routing)
+
     async def process_chat(self, messages: List[ChatMessage], session_id: str = None) -> ChatResponse:
         if session_id is None:
             session_id = str(uuid4())
-            
+        bind_session(session_id)
+
         # 이전 채팅 기록 가져오기
-        history = chat_history.get_history(session_id)
-        
-        # 새 메시지 추가
-        for message in messages:
-            chat_history.add_message(session_id, message)
-        
-        # 모든 메시지를 LangChain 형식으로 직접 변환
-        langchain_messages = []
-        for msg in history + messages:
-            message_type = HumanMessage if msg.role.lower() == "user" else SystemMessage
-            langchain_messages.append(message_type(content=msg.content))
-        
+        history, session_state = await asyncio.gather(
+            chat_history.aget_history(session_id), chat_history.aget_session_state(session_id)
+        )
+        # 그래프가 실패하거나 스트림이 취소되어도 사용자 발화는 남도록 실행 전에 저장
+        await chat_history.aadd_messages(session_id, messages)
+
         # 슈퍼바이저 에이전트 실행
-        result = self.supervisor.invoke({
-            "messages": langchain_messages,
-            "chat_history": langchain_messages,  # 동일한 형식 사용
-            "next": "supervisor"
-        })
-        
+        result = await self.supervisor.ainvoke(self._build_input(history, messages, session_state))
+        await self._save_routing_state(session_id, session_state, result)
+
         # 응답 변환 및 히스토리에 추가
         response_message = ChatMessage(
             role="assistant",
             content=result["messages"][-1].content  # 마지막 메시지만 사용
         )
-        chat_history.add_message(session_id, response_message)
-            
+        await chat_history.aadd_messages(session_id, [response_message])
+
         return ChatResponse(
             messages=[response_message],  # 단일 응답 메시지만 반환
             session_id=session_id
         )
 
-chat_service = ChatService()
\ No newline at end of file
+    async def stream_chat(self, messages: List[ChatMessage], session_id: str = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        슈퍼바이저 그래프 실행 과정을 이벤트 단위로 스트리밍합니다.
+
+        이벤트 종류: session, route, tool_start, tool_end, token, done, error
+        모든 이벤트의 data에는 요청 시작 이후 경과시간(elapsed_ms)이 포함되며,
+        done 이벤트의 ttft_ms로 첫 토큰까지의 시간을 확인할 수 있습니다.
+        """
+        if session_id is None:
+            session_id = str(uuid4())
+        bind_session(session_id)
+
+        started = time.perf_counter()
+        elapsed_ms = lambda: round((time.perf_counter() - started) * 1000, 1)
+
+        history, session_state = await asyncio.gather(
+            chat_history.aget_history(session_id), chat_history.aget_session_state(session_id)
+        )
+        # 그래프가 실패하거나 스트림이 취소되어도 사용자 발화는 남도록 실행 전에 저장
+        await chat_history.aadd_messages(session_id, messages)
+
+        yield {"event": "session", "data": {"session_id": session_id, "elapsed_ms": elapsed_ms()}}
+
+        ttft_ms = None
+        streamed_tokens: List[str] = []
+        final_state = None
+
+        try:
+            async for event in self.supervisor.astream_events(
+                self._build_input(history, messages, session_state), version="v2"
+            ):
+                kind = event["event"]
+
+                if kind == "on_custom_event" and event["name"] == "route":
+                    yield {"event": "route", "data": {**event["data"], "elapsed_ms": elapsed_ms()}}
+
+                elif kind == "on_tool_start":
+                    yield {"event": "tool_start", "data": {"tool": event["name"], "elapsed_ms": elapsed_ms()}}
+
+                elif kind == "on_tool_end":
+                    yield {"event": "tool_end", "data": {"tool": event["name"], "elapsed_ms": elapsed_ms()}}
+
+                elif kind == "on_chat_model_stream":
+                    chunk = event["data"]["chunk"]
+                    # 도구 안의 모델(분석/검색) 출력, 도구 호출 인자/라우팅용 structured output 청크는 답변 토큰이 아님
+                    if event.get("metadata", {}).get("langgraph_node") not in ANSWER_NODES:
+                        continue
+                    if not chunk.content or getattr(chunk, "tool_call_chunks", None):
+                        continue
+                    if ttft_ms is None:
+                        ttft_ms = elapsed_ms()
+                    streamed_tokens.append(chunk.content)
+                    yield {"event": "token", "data": {"content": chunk.content, "elapsed_ms": elapsed_ms()}}
+
+                elif kind == "on_chain_end" and not event.get("parent_ids"):
+                    final_state = event["data"].get("output")
+
+        except Exception as e:
+            yield {"event": "error", "data": {"detail": str(e), "elapsed_ms": elapsed_ms()}}
+            return
+
+        if final_state and final_state.get("messages"):
+            content = final_state["messages"][-1].content
+        else:
+            content = "".join(streamed_tokens)
+
+        if not streamed_tokens and content:
+            # 스트리밍되지 않은 답변(라우터가 함께 생성한 CHAT 답변 등)은 한 번에 전달
+            ttft_ms = elapsed_ms()
+            yield {"event": "token", "data": {"content": content, "elapsed_ms": ttft_ms}}
+
+        await self._save_routing_state(session_id, session_state, final_state)
+
+        # 최종 응답을 히스토리에 추가
+        response_message = ChatMessage(role="assistant", content=content)
+        await chat_history.aadd_messages(session_id, [response_message])
+
+        done = {
+            "session_id": session_id,
+            "message": response_message.model_dump(),
+            "ttft_ms": ttft_ms,
+            "elapsed_ms": elapsed_ms(),
+        }
+        usage = current_usage()
+        if settings.USAGE_RESPONSE_HEADER and usage is not None:
+            # 응답 헤더는 이미 전송됨 - 이번 턴의 LLM 사용량은 done 이벤트로 전달
+            done["usage"] = usage.summary()
+        yield {"event": "done", "data": done}
+
+@lru_cache(maxsize=None)
+def get_chat_service() -> ChatService:
+    """첫 요청(또는 워밍업) 시점에 ChatService를 생성"""
+    return ChatService()
@@ -1,88 +1,144 @@
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from app.dto.check import CompletionCheckRequest, CompletionAnalysis
-from typing import Dict
+from app.dto.check import CompletionCheckRequest, CompletionAnalysis, SlotState
+from app.services.chat_history import chat_history as chat_history_store
+from app.config.settings import settings
+from app.services.entity_extractor import extract_entities
+from app.services.slot_state import (
+    SESSION_STATE_KEY, is_filled, make_record, merge_slots, repair_slots, resume, score_slots,
+)
+from utils.metrics import registry
+from utils.usage import usage_component
+from functools import lru_cache
+from typing import List, Optional, Tuple
 import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHECK_SLOT_UPDATES = registry.counter(
+    "poli_check_slot_updates_total",
+    "완성도 확인 처리 방식 (cached: 추가된 대화 없음, local: 규칙 기반 추출만 사용, incremental: 새 대화만 LLM 분석, full: 전체 대화 LLM 분석)",
+    ("mode",))
+CHECK_ESCALATIONS = registry.counter(
+    "poli_check_escalations_total", "규칙 기반 추출 결과가 애매해 LLM 으로 넘긴 이유", ("reason",))
+CHECK_PARSE_RESULTS = registry.counter(
+    "poli_check_parse_total",
+    "LLM 슬롯 추출 응답 파싱 결과 (structured: 구조화 출력 그대로, repaired: 로컬 복구, failed: 복구 실패)",
+    ("result",))
 
 
 class CheckService:
     def __init__(self):
-        # JSON 출력 파서 설정
-        self.parser = JsonOutputParser(pydantic_object=CompletionAnalysis)
-        
-        # 프롬프트 템플릿 정의
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """
-            당신은 사기 피해 진정서 작성에 필요한 정보를 분석하는 전문가입니다.
-            제공된 대화 내용에서 다음 필수 항목들의 존재 여부를 확인하고 완성도를 평가해주세요:
-
-            필수 항목:
-            1. 신청인 정보 (성명, 생년월일, 주소, 연락처) - 25%
-            2. 피진정인 정보 (상대방 정보, 계좌번호 등) - 25%
-            3. 피해 내용 (사기 유형, 날짜, 금액, 경위) - 35%
-            4. 증거자료 존재 여부 - 15%
-
-            각 항목의 존재 여부와 구체성을 검토하여 백분율로 평가하세요.
-            총점이 80% 이상이면 fulfilled를 true로 설정하세요.
-
-            대화 내용을 분석하여 각 항목의 존재 여부와 완성도를 평가한 후,
-            다음 형식의 JSON으로 응답해주세요:
-            {{
-                "fulfilled": boolean,
-                "percentage": float (0-100)
-            }}
-
-            {format_instructions}
-            """),
-            ("human", "다음 대화 내용을 분석해주세요:\n\n{chat_history}")
-        ])
-        
+        from utils.llm import get_site_model
+        from prompt.registry import get_prompt
+
+        # 프롬프트 템플릿 (레지스트리에서 한 번만 생성)
+        self.prompt = get_prompt("check.extract").template
+
         # LLM 모델 설정
-        self.model = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0
+        self.model = get_site_model("check", temperature=0)
+
+        # 체인 구성 - 구조화 출력(스키마 강제)으로 받고, 파싱 실패 시 원본 응답으로 로컬 복구
+        self.chain = self.prompt | self.model.with_structured_output(
+            SlotState, method=settings.CHECK_STRUCTURED_OUTPUT_METHOD, include_raw=True
         )
-        
-        # 체인 구성
-        self.chain = self.prompt | self.model | self.parser
+
+    async def extract_slots(self, slots: SlotState, chat_history: str) -> SlotState:
+        """
+        새 대화 내용에서 슬롯을 추출해 기존 슬롯 상태에 병합
+
+        구조화 출력 파싱에 실패하면 같은 응답을 로컬에서 복구하며, LLM 을 다시 호출하지 않습니다.
+        복구할 수 없으면 ValueError 를 발생시킵니다.
+        """
+        with usage_component("check"):
+            result = await self.chain.ainvoke({
+                "slots": json.dumps(slots.model_dump(exclude_none=True), ensure_ascii=False),
+                "chat_history": chat_history,
+            })
+        update = result.get("parsed")
+        if update is not None:
+            CHECK_PARSE_RESULTS.inc(result="structured")
+            return merge_slots(slots, update)
+        try:
+            update = repair_slots(result.get("raw"))
+        except ValueError:
+            CHECK_PARSE_RESULTS.inc(result="failed")
+            raise
+        CHECK_PARSE_RESULTS.inc(result="repaired")
+        return merge_slots(slots, update)
+
+    def _needs_llm(self, slots: SlotState, new_history: str) -> Tuple[SlotState, List[str]]:
+        """규칙 기반 추출 결과를 병합하고, LLM 추출이 필요한 이유 목록 반환 (이미 채워진 항목의 모호함은 무시)"""
+        if not settings.CHECK_ENTITY_EXTRACTOR:
+            return slots, ["disabled"]
+        local = extract_entities(new_history)
+        slots = merge_slots(slots, local.slots)
+        reasons = []
+        for reason in local.ambiguous:
+            if reason == "phone_owner":
+                filled = is_filled(slots, "complainant.phone") and is_filled(slots, "respondent.phone")
+            else:
+                filled = "." in reason and is_filled(slots, reason)
+            if not filled:
+                reasons.append(reason)
+        return slots, reasons
+
+    async def get_slots(self, chat_history: str, session_id: Optional[str] = None, persist: bool = True) -> SlotState:
+        """
+        대화 내용의 슬롯 상태를 반환합니다.
+
+        session_id 가 있으면 세션의 슬롯 상태를 이어서 사용하므로 이전 분석 이후 추가된 대화만 분석하고,
+        추가된 대화가 없으면 LLM 을 호출하지 않습니다. 추가된 대화는 규칙 기반 추출기로 먼저 처리하고
+        결과가 애매할 때만 LLM 으로 추출합니다.
+        persist=False 이면 세션의 슬롯 기록을 읽기만 하고 갱신하지 않습니다 (진정서 생성 등 다른 엔드포인트용).
+        """
+        session_state = await chat_history_store.aget_session_state(session_id) if session_id else {}
+        slots, new_history, resumed = resume(session_state.get(SESSION_STATE_KEY), chat_history)
+
+        if not new_history.strip():
+            CHECK_SLOT_UPDATES.inc(mode="cached")
+        else:
+            slots, reasons = self._needs_llm(slots, new_history)
+            if reasons:
+                for reason in reasons:
+                    CHECK_ESCALATIONS.inc(reason=reason)
+                CHECK_SLOT_UPDATES.inc(mode="incremental" if resumed else "full")
+                try:
+                    slots = await self.extract_slots(slots, new_history)
+                except ValueError as e:
+                    # 재시도 없이 규칙 기반 추출 결과로 응답하고, 다음 확인 때 이 구간을 다시 분석
+                    logger.warning(f"Slot extraction parse failed, using local slots: {e}")
+                    return slots
+            else:
+                CHECK_SLOT_UPDATES.inc(mode="local")
+
+        if session_id and persist:
+            record = make_record(slots, chat_history)
+            if record != session_state.get(SESSION_STATE_KEY):
+                # 분석 중 저장된 다른 항목(활성 에이전트 등)을 덮어쓰지 않도록 최신 상태에 병합
+                await chat_history_store.aupdate_session_state(session_id, {SESSION_STATE_KEY: record})
+        return slots
 
     async def check_completion(self, request: CompletionCheckRequest) -> CompletionAnalysis:
         """
         대화 내용을 분석하여 진정서 작성 가능 여부와 완성도를 반환합니다.
-        
+
+        완성도는 슬롯 상태(get_slots)에서 가중치로 계산합니다.
+
         Args:
             request (CompletionCheckRequest): 분석할 대화 내용을 포함한 요청 객체
-            
+
         Returns:
-            CompletionAnalysis: fulfilled(bool)와 percentage(float) 포함
+            CompletionAnalysis: fulfilled(bool), percentage(float), missing(누락 항목) 포함
         """
+        if not request.chat_history.strip():
+            raise ValueError("대화 내용이 비어있습니다.")
+
         try:
-            # 프롬프트에 파서 지침 추가
-            format_instructions = self.parser.get_format_instructions()
-            
-            # 프롬프트 실행
-            response = await self.model.ainvoke(
-                self.prompt.format_messages(
-                    chat_history=request.chat_history,
-                    format_instructions=format_instructions
-                )
-            )
-            
-            # JSON 응답 파싱
-            try:
-                result = json.loads(response.content)
-                
-                # CompletionAnalysis 객체 생성 및 반환
-                return CompletionAnalysis(
-                    fulfilled=bool(result.get("fulfilled", False)),
-                    percentage=float(result.get("percentage", 0.0))
-                )
-                
-            except json.JSONDecodeError as e:
-                raise ValueError(f"JSON 파싱 실패: {str(e)}")
-            
+            return score_slots(await self.get_slots(request.chat_history, request.session_id))
         except Exception as e:
             raise ValueError(f"대화 내용 분석 중 오류 발생: {str(e)}")
 
-check_service = CheckService()
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_check_service() -> CheckService:
+    """첫 요청(또는 워밍업) 시점에 CheckService를 생성"""
+    return CheckService()
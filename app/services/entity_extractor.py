@@ -0,0 +1,246 @@
+"""
+규칙 기반 진정서 항목 추출기 (완성도 확인의 사전 점수용)
+
+전화번호, 은행 계좌, 날짜, 금액, 거래 플랫폼, 사기 유형, 증거자료 키워드처럼 형식이 정해진 항목을
+미리 컴파일한 정규식과 사전으로 추출합니다. 외부 의존성 없이 대화 하나를 1ms 미만(보통 수백 마이크로초)에 처리합니다.
+
+추출 결과가 애매한 경우(누구의 번호인지 알 수 없는 전화번호, 서로 다른 금액/계좌, 이름/주소가 언급되었지만
+형식으로는 추출하지 못한 경우 등)에는 ambiguous 에 이유를 남기며, CheckService 는 이때만 LLM 으로 추출합니다.
+"""
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.dto.check import SlotState
+
+BANKS = (
+    "국민", "KB국민", "신한", "우리", "하나", "KEB하나", "농협", "NH농협", "기업", "IBK기업", "카카오뱅크", "카카오",
+    "토스뱅크", "토스", "케이뱅크", "새마을금고", "신협", "우체국", "SC제일", "제일", "씨티", "수협", "대구", "부산",
+    "경남", "광주", "전북", "제주", "산업",
+)
+PLATFORMS = (
+    "당근마켓", "당근", "중고나라", "번개장터", "헬로마켓", "쿠팡", "네이버 카페", "네이버카페", "네이버 밴드", "카카오톡",
+    "오픈채팅", "인스타그램", "인스타", "텔레그램", "페이스북", "11번가", "G마켓", "지마켓", "옥션", "티몬", "위메프",
+    "스마트스토어", "유튜브", "틱톡", "라인",
+)
+# (사기 유형, 패턴) - 앞에 있을수록 구체적인 유형
+FRAUD_TYPES: List[Tuple[str, str]] = [
+    ("보이스피싱", r"보이스\s?피싱|검찰.{0,6}사칭|금감원.{0,6}사칭|대출.{0,6}(빙자|사칭)"),
+    ("메신저피싱", r"메신저\s?피싱|(엄마|아빠|딸|아들).{0,10}(폰|핸드폰).{0,6}(고장|깨)"),
+    ("스미싱", r"스미싱|문자.{0,10}링크.{0,10}(눌|클릭)"),
+    ("로맨스스캠", r"로맨스\s?스캠"),
+    ("투자 사기", r"투자\s?사기|리딩방|코인.{0,10}(투자|사기)|주식.{0,6}리딩"),
+    ("몸캠피싱", r"몸캠"),
+    ("쇼핑몰 사기", r"쇼핑몰.{0,15}(사기|배송.{0,4}안|연락.{0,4}(두절|안))"),
+    ("중고거래 사기", r"중고\s?거래|중고나라|번개장터|헬로마켓|당근|직거래|택배\s?거래"),
+]
+_FRAUD_TYPES = [(name, re.compile(pattern)) for name, pattern in FRAUD_TYPES]
+
+_BANK = "|".join(sorted((re.escape(b) for b in BANKS), key=len, reverse=True))
+# 두 글자 이하 이름은 다른 단어의 일부일 수 있으므로 앞 글자가 한글이면 제외 (예: "온라인" 의 "라인")
+_PLATFORM = "|".join(
+    re.escape(p) if len(p) > 2 else rf"(?<![가-힣]){re.escape(p)}"
+    for p in sorted(PLATFORMS, key=len, reverse=True)
+)
+
+SPEAKER = re.compile(r"^\s*(사용자|user|챗봇|상담원|assistant|AI)\s*:\s*", re.IGNORECASE)
+PHONE = re.compile(r"(?<!\d)(01[016789])[-.\s]?(\d{3,4})[-.\s]?(\d{4})(?!\d)")
+ACCOUNT = re.compile(rf"({_BANK})\s*(?:은행)?\s*(?:계좌(?:번호)?)?\s*(?:는|은|:)?\s*(\d{{2,6}}(?:-\d{{2,7}}){{1,4}}|\d{{10,14}})")
+# 계좌/전화번호 등 긴 숫자의 일부가 날짜로 잡히지 않도록 숫자 경계와 연도 범위를 확인
+DATE = re.compile(r"(?<!\d)((?:19|20)\d{2})\s*[년.\-/]\s*(\d{1,2})\s*[월.\-/]\s*(\d{1,2})(?!\d)\s*일?"
+                  r"(?:\s*(오전|오후)?\s*(\d{1,2})\s*시(?:\s*(\d{1,2})\s*분)?)?")
+RELATIVE_DATE = re.compile(r"(어제|그저께|지난\s?주|지난\s?달|오늘)")
+_NUMBER = r"\d[\d,]*(?:\.\d+)?"
+_AMOUNT_UNIT = r"천만|백만|억|만|천|백"
+# "3만5천원", "1억 2천만원" 처럼 단위가 여러 개인 금액은 전체를 하나로 잡음
+AMOUNT = re.compile(rf"((?:{_NUMBER}\s*(?:{_AMOUNT_UNIT})\s*)*{_NUMBER}\s*(?:{_AMOUNT_UNIT})?)\s*원")
+AMOUNT_PART = re.compile(rf"({_NUMBER})\s*({_AMOUNT_UNIT})?")
+PLATFORM = re.compile(rf"({_PLATFORM})")
+EVIDENCE = re.compile(r"(대화\s?(?:내용\s?)?캡[처쳐]|캡[처쳐]|스크린\s?샷|이체\s?(?:내역|확인증)|거래\s?내역|입금\s?내역|"
+                      r"계좌\s?내역|송장(?:\s?번호)?|녹음(?:\s?파일)?|통화\s?(?:기록|내역)|문자\s?(?:메시지|내역)|영수증|카톡\s?대화)")
+EVIDENCE_NEGATION = re.compile(r"^.{0,8}(없|안\s?(?:했|남)|못\s?(?:했|찍)|지웠|삭제)")
+RRN = re.compile(r"(?<!\d)(\d{6})-?([1-4])\d{6}(?!\d)")
+BIRTH = re.compile(r"(?:생년월일|생일|태어났)\D{0,6}(\d{2,4}\s*[년.\-/]\s*\d{1,2}\s*[월.\-/]\s*\d{1,2}\s*일?)|(\d{2,4})\s*년생")
+NAME = re.compile(r"(?:제\s?이름은|이름은|성명은|이름\s?:|성명\s?:)\s*['\"]?([가-힣]{2,4})['\"]?\s*(?:이에요|예요|입니다|이고|이며|라고|,|\.|$)")
+ADDRESS = re.compile(r"(?:주소는|주소\s?:|사는\s?곳은)?\s*((?:서울|부산|대구|인천|광주|대전|울산|세종|경기|강원|충북|충남|전북|전남|경북|경남|제주)"
+                     r"[가-힣]*\s+[가-힣]+(?:시|군|구)(?:\s+[가-힣0-9]+(?:구|동|읍|면|로|길))+(?:\s*\d+(?:-\d+)?(?:번지)?)?)")
+# 아이디 모양(영문/숫자)이거나 따옴표로 감싼 값만 추출 ("아이디가 뭐였는지" 같은 한글은 LLM 으로 넘김)
+RESPONDENT_ID = re.compile(r"(?:아이디|닉네임|ID|id)\s*(?:는|은|가|이|:|\s)\s*"
+                           r"(?:['\"‘“]([^'\"‘’“”\n]{2,30})['\"’”]|([A-Za-z0-9_.\-]{3,30})(?![A-Za-z0-9_.\-]))")
+OWNER_SELF = re.compile(r"(제|저의|내|나의|본인)\s?(?:휴대폰|핸드폰|전화|연락처|번호)|연락처는|제\s?번호")
+OWN_ACCOUNT = re.compile(r"(제|내|본인)\s?계좌")
+OWNER_OTHER = re.compile(r"(판매자|상대방?|사기꾼|그\s?사람|가해자|구매자|업체|피의자)")
+TRANSFER = re.compile(r"(보냈|송금|입금|이체|결제|계좌로|돈을?\s?줬)")
+RESPONDENT_MENTION = re.compile(r"판매자|상대방?|아이디|닉네임")
+# 형식으로 추출하기 어려운 항목의 언급 (사용자가 말했거나 상담원이 물었는데 추출하지 못하면 LLM 으로 넘김)
+HINTS: Dict[Tuple[str, str], "re.Pattern[str]"] = {
+    ("complainant", "name"): re.compile(r"이름|성명|성함"),
+    ("complainant", "address"): re.compile(r"주소|살고\s?있|거주"),
+    ("complainant", "birth_date"): re.compile(r"생년월일|생일|년생|주민"),
+    ("respondent", "name"): re.compile(r"아이디|닉네임|(상대방?|판매자)의?\s?(이름|성명)"),
+}
+
+# 만/억 아래 자리 단위 (천만, 백만은 만 단위 앞의 자리값으로 처리)
+_SMALL_UNITS = {"천": 1_000, "백": 100, None: 1}
+_LARGE_UNITS = {"억": 100_000_000, "만": 10_000}
+
+
+class ExtractionResult(NamedTuple):
+    slots: SlotState
+    ambiguous: List[str]  # LLM 추출이 필요한 이유 (비어 있으면 규칙 추출만으로 충분)
+
+
+def _split_speakers(chat_history: str) -> Tuple[str, str]:
+    """(사용자 발화, 상담원 발화) 분리 (화자 표시가 없는 줄은 직전 화자를 따르고, 화자 표시가 전혀 없으면 모두 사용자 발화)"""
+    user: List[str] = []
+    bot: List[str] = []
+    speaker: Optional[str] = None
+    for line in chat_history.splitlines():
+        match = SPEAKER.match(line)
+        if match:
+            speaker = match.group(1).lower()
+            line = line[match.end():]
+        (user if speaker in (None, "사용자", "user") else bot).append(line.strip())
+    return "\n".join(user), "\n".join(bot)
+
+
+def _won(amount: str) -> int:
+    """한국어 금액 표현을 원 단위 정수로 변환 (예: "1억 2천5백만" -> 125000000, "3만5천" -> 35000)"""
+    total = 0.0
+    section = 0.0  # 아직 만/억 단위가 붙지 않은 자리값
+    for number, unit in AMOUNT_PART.findall(amount):
+        value = float(number.replace(",", ""))
+        if unit in _LARGE_UNITS:
+            total += (section + value) * _LARGE_UNITS[unit]
+            section = 0.0
+        elif unit in ("천만", "백만"):
+            total += (section + value * _SMALL_UNITS[unit[0]]) * _LARGE_UNITS["만"]
+            section = 0.0
+        else:
+            section += value * _SMALL_UNITS[unit or None]
+    return int(total + section)
+
+
+def find_amounts(text: str) -> List[int]:
+    """텍스트에 나오는 금액(원) 목록"""
+    return [_won(m.group(1)) for m in AMOUNT.finditer(text)]
+
+
+def parse_amount(text: str) -> Optional[int]:
+    """금액 표현 하나를 원 단위로 변환 (예: "1억 2,000만원" -> 120000000), 금액이 아니면 None"""
+    amounts = find_amounts(text if text.rstrip().endswith("원") else text + "원")
+    return amounts[0] if len(amounts) == 1 else None
+
+
+def _format_won(value: int) -> str:
+    if value % 10_000:
+        return f"{value:,}원"
+    eok, man = divmod(value // 10_000, 10_000)
+    if not eok:
+        return f"{man:,}만원"
+    return f"{eok:,}억 {man:,}만원" if man else f"{eok:,}억원"
+
+
+def _sentence_around(text: str, start: int, end: int) -> str:
+    left = max(text.rfind(c, 0, start) for c in ".!?\n")
+    right = min((i for i in (text.find(c, end) for c in ".!?\n") if i >= 0), default=len(text))
+    return text[left + 1:right].strip()
+
+
+def extract_entities(chat_history: str) -> ExtractionResult:
+    """대화 내용(사용자 발화)에서 형식이 정해진 항목을 추출"""
+    text, bot_text = _split_speakers(chat_history)
+    data: Dict[str, Dict[str, str]] = {"complainant": {}, "respondent": {}, "damage": {}}
+    evidence: List[str] = []
+    ambiguous: List[str] = []
+
+    # 주민등록번호/생년월일 (피해 일시로 잘못 잡히지 않도록 먼저 처리)
+    birth_spans = []
+    for match in BIRTH.finditer(text):
+        data["complainant"]["birth_date"] = (match.group(1) or f"{match.group(2)}년생").strip()
+        birth_spans.append(match.span())
+    rrn = RRN.search(text)
+    if rrn:
+        data["complainant"]["birth_date"] = rrn.group(1)
+
+    name = NAME.search(text)
+    if name:
+        data["complainant"]["name"] = name.group(1)
+    address = ADDRESS.search(text)
+    if address:
+        data["complainant"]["address"] = address.group(1).strip()
+
+    # 전화번호: 앞쪽 문맥으로 소유자 판단
+    for match in PHONE.finditer(text):
+        number = "-".join(match.groups())
+        context = _sentence_around(text, match.start(), match.end())
+        if OWNER_OTHER.search(context) and not OWNER_SELF.search(context):
+            data["respondent"].setdefault("phone", number)
+        elif OWNER_SELF.search(context):
+            data["complainant"].setdefault("phone", number)
+        else:
+            ambiguous.append("phone_owner")
+
+    # 계좌: 본인 계좌가 아니면 돈을 보낸 상대방 계좌로 간주
+    accounts = []
+    for match in ACCOUNT.finditer(text):
+        context = _sentence_around(text, match.start(), match.end())
+        if OWN_ACCOUNT.search(context) and not TRANSFER.search(context):
+            continue
+        bank = match.group(1)
+        accounts.append(f"{bank if bank.endswith(('은행', '뱅크', '금고', '신협', '우체국')) else bank + '은행'} {match.group(2)}")
+    if accounts:
+        data["respondent"]["account"] = accounts[0]
+        if len(set(accounts)) > 1:
+            ambiguous.append("multiple_accounts")
+
+    respondent_id = RESPONDENT_ID.search(text)
+    if respondent_id:
+        data["respondent"]["name"] = respondent_id.group(1) or respondent_id.group(2)
+
+    # 피해 내용
+    for fraud_type, pattern in _FRAUD_TYPES:
+        if pattern.search(text):
+            data["damage"]["fraud_type"] = fraud_type
+            break
+
+    dates = [m for m in DATE.finditer(text) if not any(s <= m.start() < e for s, e in birth_spans)]
+    if dates:
+        year, month, day, ampm, hour, minute = dates[0].groups()
+        occurred = f"{int(year)}년 {int(month)}월 {int(day)}일"
+        if hour:
+            occurred += f" {ampm + ' ' if ampm else ''}{int(hour)}시" + (f" {int(minute)}분" if minute else "")
+        data["damage"]["occurred_at"] = occurred
+    elif RELATIVE_DATE.search(text):
+        # 상대 날짜는 기준일을 알 수 없음
+        ambiguous.append("relative_date")
+
+    amounts = find_amounts(text)
+    if amounts:
+        data["damage"]["amount"] = _format_won(max(amounts))
+        if len(set(amounts)) > 1:
+            ambiguous.append("multiple_amounts")
+
+    platform = PLATFORM.search(text)
+    if platform:
+        data["damage"]["platform"] = platform.group(1)
+        if RESPONDENT_MENTION.search(text):
+            data["respondent"]["site"] = platform.group(1)
+
+    transfer = TRANSFER.search(text)
+    if transfer:
+        data["damage"]["description"] = _sentence_around(text, transfer.start(), transfer.end())[:200]
+
+    for match in EVIDENCE.finditer(text):
+        if EVIDENCE_NEGATION.search(text[match.end():match.end() + 12]):
+            continue
+        item = re.sub(r"\s+", " ", match.group(1))
+        if item not in evidence:
+            evidence.append(item)
+
+    # 언급되었지만 형식으로 추출하지 못한 항목 (예: "성함이 어떻게 되세요?" - "홍길동이요")
+    for (section, field), hint in HINTS.items():
+        if not data[section].get(field) and (hint.search(text) or hint.search(bot_text)):
+            ambiguous.append(f"{section}.{field}")
+
+    slots = SlotState.model_validate({**data, "evidence": evidence})
+    return ExtractionResult(slots, ambiguous)
@@ -1,70 +1,261 @@
-from langchain_openai import ChatOpenAI
-from langchain.schema import SystemMessage, HumanMessage
-from typing import Dict
+from langchain_core.messages import BaseMessage
+from typing import Awaitable, Callable, Dict, List, Any, AsyncIterator, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+
+from app.config.settings import settings
+from app.dto.check import SlotState
+from app.dto.letter import LetterNarrative
+from app.services.letter_template import render_letter, verify_slots
+from utils.metrics import registry
+from utils.usage import current_usage, usage_component
+
+logger = logging.getLogger(__name__)
+
+LETTER_NARRATIVE_CACHE = registry.counter(
+    "poli_letter_narrative_cache_total", "진정서 서술 부분 캐시 조회 수 (result: hit/coalesced/miss)", ("result",))
+
+# 진정서 섹션 (이름, 섹션 시작 줄 패턴) - 진정서 양식의 등장 순서와 동일
+LETTER_SECTIONS: List[Tuple[str, "re.Pattern[str]"]] = [
+    ("신청인", re.compile(r"^\s*신청인\s*(\(|$)")),
+    ("피진정인", re.compile(r"^\s*피진정인")),
+    ("진정 내용", re.compile(r"^\s*진정\s*내용")),
+    ("상세 피해 상황", re.compile(r"^\s*상세\s*피해\s*상황")),
+    ("결론", re.compile(r"^\s*결론")),
+]
+
+class LetterSectionSplitter:
+    """스트리밍되는 진정서 텍스트를 섹션 단위로 잘라내는 파서"""
+
+    def __init__(self):
+        self.current = "머리말"  # [진 정 서] 제목과 접수기관
+        self.next_index = 0
+        self.lines: List[str] = []
+        self.pending = ""
+
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        """텍스트 조각을 추가하고, 완성된 섹션 목록을 반환"""
+        self.pending += text
+        completed = []
+        while "\n" in self.pending:
+            line, self.pending = self.pending.split("\n", 1)
+            section = self._on_line(line)
+            if section:
+                completed.append(section)
+        return completed
+
+    def flush(self) -> List[Tuple[str, str]]:
+        """스트림 종료 시 남은 섹션을 반환"""
+        completed = []
+        if self.pending:
+            section = self._on_line(self.pending)
+            if section:
+                completed.append(section)
+            self.pending = ""
+        content = "\n".join(self.lines).strip()
+        if content:
+            completed.append((self.current, content))
+        self.lines = []
+        return completed
+
+    def _on_line(self, line: str) -> Optional[Tuple[str, str]]:
+        completed = None
+        if self.next_index < len(LETTER_SECTIONS):
+            name, pattern = LETTER_SECTIONS[self.next_index]
+            if pattern.match(line):
+                content = "\n".join(self.lines).strip()
+                if content:
+                    completed = (self.current, content)
+                self.current = name
+                self.next_index += 1
+                self.lines = []
+        self.lines.append(line)
+        return completed
+
+class NarrativeCache:
+    """진정서 서술 부분 캐시 (메모리 LRU + TTL, 같은 키의 동시 생성은 한 번만 실행)"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # key -> (만료 시각, 결과)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def make_key(value: Any) -> str:
+        canonical = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_or_call(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._get(key)
+        if entry is not None:
+            LETTER_NARRATIVE_CACHE.inc(result="hit")
+            return entry[1]
+        pending = self._inflight.get(key)
+        if pending is not None:
+            LETTER_NARRATIVE_CACHE.inc(result="coalesced")
+            return await asyncio.shield(pending)
+
+        LETTER_NARRATIVE_CACHE.inc(result="miss")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await call()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                e = RuntimeError("동일한 서술 생성이 취소되었습니다")
+            future.set_exception(e)
+            future.exception()  # 대기자가 없을 때 경고 방지
+            raise
+        else:
+            self._set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
 
 class LetterService:
     def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4", temperature=0.2)
-        
-    async def generate_letter(self, chat_content: str) -> Dict[str, str]:
-        """진정서를 생성하는 서비스 메소드"""
-        
-        # 현재 날짜 생성
-        current_date = datetime.now().strftime("%Y년 %m월 %d일")
-        
-        system_prompt = SystemMessage(content=f"""
-        당신은 진정서 작성 전문가입니다. 제공된 대화 내용을 분석하여 아래 형식의 진정서를 작성해주세요.
-        현재 날짜는 {current_date} 입니다. 이 날짜를 진정서 말미에 사용하세요.
-
-
-        '''
-        [진 정 서]
-        접수기관: ○○경찰서(또는 ○○지방경찰청 사이버수사대)
-
-        신청인(피해자)
-            성명: (대화에서 추출)
-            주민등록번호(또는 생년월일): (대화에서 추출)
-            주소: (대화에서 추출)
-            연락처: (대화에서 추출)
-
-        피진정인(피의자)
-            성명(또는 닉네임/아이디): (대화에서 추출 또는 '불상')
-            아이디/사이트명: (대화에서 추출)
-            기타 가능한 신원정보 및 특이사항: (대화에서 추출)
-
-        진정 내용
-            사건 유형 정보
-            범죄 유형: (대화 내용 기반 판단)
-            세부 유형: (구체적인 사기 유형)
-
-        상세 피해 상황
-            피해장소: (플랫폼/사이트 정보)
-            진정취지: (대화 내용 기반 작성)
-            피해상황: (구체적인 피해 내용)
-            피해 발생 일시: (대화에서 추출)
-            피해 발생 경로: (구체적인 사건 경위)
-            해당 행위로 인한 피해: (금전/정신적 피해 등)
-            확보 증거 자료: (대화에서 언급된 증거)
-
-        결론: (진정 의견 정리)
-
-        {current_date}
-        신청인: ○○○ (서명 또는 인)
-        '''
-        
-        주의사항:
-        1. 대화 내용에서 언급된 모든 구체적인 정보를 최대한 활용하세요.
-        2. 언급되지 않은 정보는 "불상" 또는 "미상"으로 처리하세요.
-        3. 시간, 금액, 계좌번호 등 구체적인 정보는 정확히 기재하세요.
-        4. 진정서 어투는 공식적이고 격식있게 작성하세요.
-        5. 진정서 날짜는 반드시 오늘 날짜({current_date})를 사용하세요.
-        """)
-        
-        human_prompt = HumanMessage(content=f"다음 대화 내용을 바탕으로 진정서를 작성해주세요:\n\n{chat_content}")
-        
-        response = await self.llm.ainvoke([system_prompt, human_prompt])
+        from utils.llm import get_site_model
+        from langchain_core.output_parsers import JsonOutputParser
+        from prompt.registry import get_prompt
+
+        self.llm = get_site_model("letter", temperature=0.2)
+        # llm 모드: 고정 시스템 프롬프트 + (작성일, 대화 내용)
+        self.prompt = get_prompt("letter.full").template
+
+        # template 모드: 고정 양식은 추출 항목으로 채우고 서술 부분만 생성
+        narrative_prompt = get_prompt("letter.narrative")
+        self.narrative_parser = JsonOutputParser(pydantic_object=LetterNarrative)
+        self.narrative_chain = narrative_prompt.template | self.llm | self.narrative_parser
+        # 프롬프트가 바뀌면 이전 캐시를 쓰지 않도록 캐시 키에 포함
+        self.narrative_version = narrative_prompt.version
+        self.narrative_cache = NarrativeCache(
+            settings.LETTER_NARRATIVE_CACHE_TTL_SECONDS, settings.LETTER_NARRATIVE_CACHE_MAX_ENTRIES
+        )
         
+    def _build_messages(self, chat_content: str) -> List[BaseMessage]:
+        """진정서 생성용 프롬프트 메시지 구성 (날짜는 시스템 프롬프트가 아닌 사용자 메시지에 포함)"""
+        return self.prompt.format_messages(
+            date=datetime.now().strftime("%Y년 %m월 %d일"),
+            chat_content=chat_content,
+        )
+
+    async def _narrative(self, slots: SlotState) -> LetterNarrative:
+        """서술 부분 생성 (같은 항목 상태면 캐시된 결과 재사용)"""
+        slots_json = slots.model_dump(exclude_none=True)
+
+        async def call() -> Dict[str, Any]:
+            with usage_component("letter.narrative"):
+                return await self.narrative_chain.ainvoke({
+                    "slots": json.dumps(slots_json, ensure_ascii=False),
+                })
+
+        result = await self.narrative_cache.get_or_call(
+            NarrativeCache.make_key({"slots": slots_json, "version": self.narrative_version}), call
+        )
+        return LetterNarrative.model_validate(result)
+
+    async def _render_template(self, chat_content: str, session_id: Optional[str] = None) -> str:
+        """대화에서 항목을 추출(세션이 있으면 완성도 확인 때의 상태 재사용)해 고정 양식 진정서 생성"""
+        from app.services.check import get_check_service
+
+        # 진정서 요청의 대화 형식이 완성도 확인 때와 다를 수 있으므로 세션의 슬롯 기록은 읽기만 함
+        slots = await get_check_service().get_slots(chat_content, session_id, persist=False)
+        # 원문과 맞지 않는 금액/일시/계좌는 양식과 서술 부분 모두에서 제외
+        slots, rejected = verify_slots(slots, chat_content)
+        if rejected:
+            logger.info("진정서 양식에서 확인되지 않은 항목 제외: %s", ", ".join(rejected))
+        narrative = await self._narrative(slots)
+        return render_letter(slots, narrative, datetime.now().strftime("%Y년 %m월 %d일"))
+
+    @staticmethod
+    def _is_template(mode: Optional[str]) -> bool:
+        return (mode or settings.LETTER_GENERATION_MODE) == "template"
+
+    async def generate_letter(self, chat_content: str, session_id: Optional[str] = None,
+                              mode: Optional[str] = None) -> Dict[str, str]:
+        """진정서를 생성하는 서비스 메소드 (mode: llm | template, 기본값은 LETTER_GENERATION_MODE)"""
+        if self._is_template(mode):
+            return {"content": await self._render_template(chat_content, session_id)}
+
+        with usage_component("letter"):
+            response = await self.llm.ainvoke(self._build_messages(chat_content))
+
         return {"content": response.content}
 
-letter_service = LetterService() 
\ No newline at end of file
+    async def _letter_chunks(self, chat_content: str, session_id: Optional[str], mode: Optional[str]) -> AsyncIterator[str]:
+        if self._is_template(mode):
+            # 서술 부분만 생성하므로 완성된 본문을 한 번에 전달
+            yield await self._render_template(chat_content, session_id)
+            return
+        with usage_component("letter"):
+            async for chunk in self.llm.astream(self._build_messages(chat_content)):
+                if chunk.content:
+                    yield chunk.content
+
+    async def stream_letter(self, chat_content: str, session_id: Optional[str] = None,
+                            mode: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        진정서를 섹션 단위로 스트리밍합니다.
+
+        이벤트 종류: section(머리말, 신청인, 피진정인, 진정 내용, 상세 피해 상황, 결론), done, error
+        """
+        started = time.perf_counter()
+        elapsed_ms = lambda: round((time.perf_counter() - started) * 1000, 1)
+
+        splitter = LetterSectionSplitter()
+        parts: List[str] = []
+        index = 0
+
+        try:
+            async for text in self._letter_chunks(chat_content, session_id, mode):
+                parts.append(text)
+                for name, content in splitter.feed(text):
+                    yield {"event": "section", "data": {"index": index, "name": name, "content": content, "elapsed_ms": elapsed_ms()}}
+                    index += 1
+            for name, content in splitter.flush():
+                yield {"event": "section", "data": {"index": index, "name": name, "content": content, "elapsed_ms": elapsed_ms()}}
+                index += 1
+        except Exception as e:
+            yield {"event": "error", "data": {"detail": f"진정서 생성 중 오류가 발생했습니다: {str(e)}", "elapsed_ms": elapsed_ms()}}
+            return
+
+        done = {"content": "".join(parts), "elapsed_ms": elapsed_ms()}
+        usage = current_usage()
+        if settings.USAGE_RESPONSE_HEADER and usage is not None:
+            # 스트리밍 응답은 헤더가 먼저 전송되므로 사용량은 done 이벤트로 전달
+            done["usage"] = usage.summary()
+        yield {"event": "done", "data": done}
+
+@lru_cache(maxsize=None)
+def get_letter_service() -> LetterService:
+    """첫 요청(또는 워밍업) 시점에 LetterService를 생성"""
+    return LetterService() 
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+진정서 고정 양식 (template 모드)
+
+양식의 고정 부분은 추출한 항목(SlotState)으로 채우고, 서술 부분(진정취지, 피해상황, 피해 발생 경로, 결론)만 LLM 결과를 사용합니다.
+금액/일시/계좌처럼 그대로 옮겨 적는 값은 verify_slots 로 대화 원문과 대조한 뒤 사용합니다.
+양식은 LetterService 의 LLM 모드 프롬프트에 있는 양식과 같으며, LetterSectionSplitter 로 섹션을 나눌 수 있습니다.
+"""
+import re
+from datetime import date
+from string import Template
+from typing import Dict, List, Optional, Tuple
+
+from app.dto.check import SlotState
+from app.dto.letter import LetterNarrative
+from app.services.entity_extractor import find_amounts, parse_amount
+
+LETTER_TEMPLATE = Template("""[진 정 서]
+접수기관: ○○경찰서(또는 ○○지방경찰청 사이버수사대)
+
+신청인(피해자)
+    성명: $complainant_name
+    주민등록번호(또는 생년월일): $complainant_birth_date
+    주소: $complainant_address
+    연락처: $complainant_phone
+
+피진정인(피의자)
+    성명(또는 닉네임/아이디): $respondent_name
+    아이디/사이트명: $respondent_site
+    기타 가능한 신원정보 및 특이사항: $respondent_other
+
+진정 내용
+    사건 유형 정보
+    범죄 유형: $crime_type
+    세부 유형: $fraud_type
+
+상세 피해 상황
+    피해장소: $platform
+    진정취지: $purpose
+    피해상황: $damage
+    피해 발생 일시: $occurred_at
+    피해 발생 경로: $description
+    해당 행위로 인한 피해: $loss
+    확보 증거 자료: $evidence
+
+결론: $conclusion
+
+$date
+신청인: $signer (서명 또는 인)""")
+
+# 세부 유형 -> 범죄 유형
+CRIME_TYPES: Dict[str, str] = {
+    "보이스피싱": "전기통신금융사기",
+    "메신저피싱": "전기통신금융사기",
+    "스미싱": "전기통신금융사기",
+    "몸캠피싱": "사이버 성범죄 연계 사기",
+}
+
+
+SLOT_DATE = re.compile(r"(\d{4})\s*년\s*(\d{1,2})\s*월\s*(\d{1,2})\s*일")
+ACCOUNT_NUMBER = re.compile(r"\d[\d\- ]{6,}\d")
+
+
+def _account_digits(text: str) -> List[str]:
+    return [re.sub(r"\D", "", match) for match in ACCOUNT_NUMBER.findall(text)]
+
+
+def verify_slots(slots: SlotState, chat_content: str, today: Optional[date] = None) -> Tuple[SlotState, List[str]]:
+    """
+    양식에 그대로 들어가는 금액, 피해 일시, 계좌번호를 대화 원문과 대조
+
+    - 금액: 대화에 나온 금액(또는 그 합계)과 같아야 함
+    - 피해 일시: 실제 날짜이고 오늘 이후가 아니어야 함 ("어제" 같은 상대 날짜는 확인 불가)
+    - 계좌번호: 9~16자리이고 대화에 같은 번호가 있어야 함
+    확인되지 않은 값은 비우고(양식에는 "미상") 비운 항목 이름을 함께 반환합니다.
+    """
+    damage, respondent = slots.damage.model_copy(), slots.respondent.model_copy()
+    rejected: List[str] = []
+
+    if damage.amount:
+        value, found = parse_amount(damage.amount), find_amounts(chat_content)
+        if value is None or (value not in found and value != sum(found)):
+            damage.amount = None
+            rejected.append("damage.amount")
+
+    if damage.occurred_at:
+        match = SLOT_DATE.search(damage.occurred_at)
+        try:
+            valid = match is not None and date(*map(int, match.groups())) <= (today or date.today())
+        except ValueError:
+            valid = False
+        if not valid:
+            damage.occurred_at = None
+            rejected.append("damage.occurred_at")
+
+    if respondent.account:
+        digits = re.sub(r"\D", "", respondent.account)
+        if not 9 <= len(digits) <= 16 or digits not in _account_digits(chat_content):
+            respondent.account = None
+            rejected.append("respondent.account")
+
+    return slots.model_copy(update={"damage": damage, "respondent": respondent}), rejected
+
+
+def _or(value: Optional[str], default: str = "미상") -> str:
+    return value.strip() if value and value.strip() else default
+
+
+def render_letter(slots: SlotState, narrative: LetterNarrative, date: str) -> str:
+    """추출 항목(verify_slots 로 확인한 값)과 서술 부분으로 진정서 본문 생성 (언급되지 않은 항목은 미상/불상)"""
+    complainant, respondent, damage = slots.complainant, slots.respondent, slots.damage
+    other: List[str] = []
+    if respondent.account:
+        other.append(f"계좌번호 {respondent.account}")
+    if respondent.phone:
+        other.append(f"연락처 {respondent.phone}")
+    return LETTER_TEMPLATE.substitute(
+        complainant_name=_or(complainant.name),
+        complainant_birth_date=_or(complainant.birth_date),
+        complainant_address=_or(complainant.address),
+        complainant_phone=_or(complainant.phone),
+        respondent_name=_or(respondent.name, "불상"),
+        respondent_site=_or(respondent.site or damage.platform, "불상"),
+        respondent_other=", ".join(other) or "불상",
+        crime_type=CRIME_TYPES.get(damage.fraud_type or "", "사이버사기"),
+        fraud_type=_or(damage.fraud_type),
+        platform=_or(damage.platform),
+        purpose=narrative.purpose.strip(),
+        damage=narrative.damage.strip(),
+        occurred_at=_or(damage.occurred_at),
+        description=_or(narrative.route),  # 사용자 발화 원문 대신 서술 부분으로 작성
+        loss=f"금전적 피해 {damage.amount} 및 정신적 피해" if damage.amount else "미상",
+        evidence=", ".join(slots.evidence) or "없음",
+        conclusion=narrative.conclusion.strip(),
+        date=date,
+        signer=_or(complainant.name, "○○○"),
+    )
@@ -0,0 +1,158 @@
+"""
+진정서 항목(슬롯) 상태 관리
+
+- 완성도는 슬롯 상태에서 가중치(CHECK_SLOT_WEIGHTS, 기본 25/25/35/15)로 결정적으로 계산합니다 (LLM 호출 없음).
+- 세션별로 마지막으로 분석한 대화 위치를 기억해, 다음 확인 요청에서는 새로 추가된 대화만 분석합니다.
+- 구조화 출력 파싱에 실패한 LLM 응답은 다시 호출하지 않고 repair_slots 로 복구합니다.
+"""
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.dto.check import CompletionAnalysis, SlotState
+
+# 섹션: (채워야 하는 항목 수, [(필드, 표시 이름)])
+SLOT_SECTIONS: Dict[str, Tuple[int, List[Tuple[str, str]]]] = {
+    "complainant": (4, [("name", "신청인 성명"), ("birth_date", "신청인 생년월일"),
+                        ("address", "신청인 주소"), ("phone", "신청인 연락처")]),
+    # 피진정인은 '불상' 처리가 가능하므로 식별 정보 두 가지면 충분
+    "respondent": (2, [("name", "피진정인 성명/닉네임"), ("account", "피진정인 계좌번호"),
+                       ("phone", "피진정인 연락처"), ("site", "피진정인 사이트/아이디")]),
+    "damage": (4, [("fraud_type", "사기 유형"), ("occurred_at", "피해 발생 일시"), ("amount", "피해 금액"),
+                   ("platform", "피해 장소"), ("description", "피해 경위")]),
+    "evidence": (1, [("evidence", "증거자료")]),
+}
+
+# 세션 상태(chat_history.get_session_state)에 슬롯 상태를 저장하는 키
+SESSION_STATE_KEY = "check_slots"
+
+
+def _filled(value: Any) -> bool:
+    if isinstance(value, str):
+        return bool(value.strip()) and value.strip() not in ("불상", "미상", "null", "None")
+    return bool(value)
+
+
+def _section_values(slots: SlotState, section: str) -> Dict[str, Any]:
+    if section == "evidence":
+        return {"evidence": slots.evidence}
+    return getattr(slots, section).model_dump()
+
+
+def is_filled(slots: SlotState, path: str) -> bool:
+    """"section.field" 경로의 항목이 채워져 있는지 여부 (예: complainant.name)"""
+    section, _, field = path.partition(".")
+    return _filled(_section_values(slots, section).get(field or section))
+
+
+def score_slots(slots: SlotState) -> CompletionAnalysis:
+    """슬롯 상태에서 완성도(가중치 합)와 누락 항목 계산"""
+    percentage = 0.0
+    missing: List[str] = []
+    for section, (needed, fields) in SLOT_SECTIONS.items():
+        values = _section_values(slots, section)
+        empty = [label for field, label in fields if not _filled(values.get(field))]
+        filled = len(fields) - len(empty)
+        percentage += settings.CHECK_SLOT_WEIGHTS[section] * min(filled, needed) / needed
+        if filled < needed:
+            missing += empty
+    percentage = round(percentage, 1)
+    return CompletionAnalysis(
+        fulfilled=percentage >= settings.CHECK_FULFILLED_PERCENTAGE,
+        percentage=percentage,
+        missing=missing,
+    )
+
+
+def merge_slots(slots: SlotState, update: SlotState) -> SlotState:
+    """새 대화에서 추출한 값으로 갱신 (값이 있는 항목만 덮어쓰고, 증거자료는 합침)"""
+    merged = slots.model_dump()
+    for section in ("complainant", "respondent", "damage"):
+        for field, value in getattr(update, section).model_dump().items():
+            if _filled(value):
+                merged[section][field] = value.strip() if isinstance(value, str) else value
+    for item in update.evidence:
+        if _filled(item) and item not in merged["evidence"]:
+            merged["evidence"].append(item)
+    return SlotState.model_validate(merged)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def resume(record: Optional[Dict[str, Any]], chat_history: str) -> Tuple[SlotState, str, bool]:
+    """
+    저장된 슬롯 기록과 현재 대화로 (슬롯 상태, 새로 분석할 대화, 이어서 분석하는지 여부) 반환
+
+    저장 시점의 대화가 현재 대화의 앞부분과 같으면 그 뒤에 추가된 대화만 돌려주고,
+    대화가 수정되었거나 기록이 없으면 빈 상태에서 전체 대화를 다시 분석합니다.
+    """
+    if record:
+        processed = record.get("chars", 0)
+        if len(chat_history) >= processed and _digest(chat_history[:processed]) == record.get("digest"):
+            return SlotState.model_validate(record.get("slots") or {}), chat_history[processed:], True
+    return SlotState(), chat_history, False
+
+
+def make_record(slots: SlotState, chat_history: str) -> Dict[str, Any]:
+    """세션 상태에 저장할 슬롯 기록 (분석한 대화 길이와 해시 포함)"""
+    return {"slots": slots.model_dump(), "chars": len(chat_history), "digest": _digest(chat_history)}
+
+
+_CODE_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+def _loads_tolerant(text: str) -> Any:
+    """코드 블록, 앞뒤 설명 문장, 끝 쉼표가 섞인 JSON 텍스트 파싱 (실패 시 ValueError)"""
+    fenced = _CODE_FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        raise ValueError("JSON 객체를 찾을 수 없습니다")
+    text = _TRAILING_COMMA.sub(r"\1", text[start:end + 1])
+    return json.loads(text)
+
+
+def _coerce(data: Dict[str, Any]) -> Dict[str, Any]:
+    """스키마와 조금 다른 값(숫자 금액, 문자열 증거자료 등)을 슬롯 타입에 맞게 정리"""
+    coerced: Dict[str, Any] = {}
+    for section in ("complainant", "respondent", "damage"):
+        values = data.get(section)
+        if isinstance(values, dict):
+            coerced[section] = {
+                field: value if value is None or isinstance(value, str) else str(value)
+                for field, value in values.items()
+                if field in SlotState.model_fields[section].annotation.model_fields
+            }
+    evidence = data.get("evidence")
+    if isinstance(evidence, str):
+        evidence = [evidence]
+    if isinstance(evidence, list):
+        coerced["evidence"] = [str(item) for item in evidence if item]
+    return coerced
+
+
+def repair_slots(raw: Any) -> SlotState:
+    """
+    구조화 출력 파싱에 실패한 모델 응답(AIMessage)에서 슬롯 상태 복구
+
+    함수 호출 인자(tool_calls / invalid_tool_calls)와 본문 텍스트를 차례로 시도하며,
+    모두 실패하면 ValueError 를 발생시킵니다.
+    """
+    candidates: List[Any] = [call.get("args") for call in getattr(raw, "tool_calls", None) or []]
+    candidates += [call.get("args") for call in getattr(raw, "invalid_tool_calls", None) or []]
+    content = getattr(raw, "content", raw)
+    candidates.append(content if isinstance(content, str) else "")
+    for candidate in candidates:
+        try:
+            data = candidate if isinstance(candidate, dict) else _loads_tolerant(candidate or "")
+            if isinstance(data, dict):
+                return SlotState.model_validate(_coerce(data))
+        except ValueError:
+            continue
+    raise ValueError("모델 응답에서 슬롯 상태를 복구할 수 없습니다")
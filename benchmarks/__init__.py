@@ -0,0 +1,9 @@
+"""
+벤치마크/검증 스크립트 (python -m benchmarks.<이름>)
+
+벤치마크 실행 로그(라우팅 로그의 사용자 발화 포함)가 저장소의 log/ 에 쌓이지 않도록
+앱 모듈을 불러오기 전에 파일 로그를 끄고 콘솔(stderr)로만 기록합니다.
+"""
+import os
+
+os.environ.setdefault("LOG_DIR", "")
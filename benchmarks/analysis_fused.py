@@ -0,0 +1,140 @@
+"""
+통합 분석 도구 비교: Detail/Emotion/Solution 순차 호출 vs 동시 호출 vs 한 번의 통합 호출
+
+가짜 모델은 (기본 지연 + 출력 토큰당 지연) 만큼 기다린 뒤, 프롬프트에 맞는 JSON 을 응답합니다.
+- sequential: 기존처럼 세 도구를 차례로 호출 (LLM 3회)
+- parallel  : analysis_tool(fused=False) - 세 도구를 동시에 호출 (LLM 3회)
+- fused     : analysis_tool(fused=True) - 세 스키마를 한 번에 생성 (LLM 1회)
+- cached    : 같은 메시지로 다시 호출 (LLM 0회)
+
+실행: python -m benchmarks.analysis_fused --base-delay 0.5 --ms-per-token 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, ClassVar, Dict, List
+from unittest.mock import patch
+
+from benchmarks.fake_model import FakeChatModel
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+MESSAGE = "어제 중고나라에서 아이폰 15를 사려고 판매자 계좌로 85만원을 보냈는데, 그 뒤로 연락이 안 되고 게시글도 지워졌어요. 너무 화나고 불안해요."
+
+DETAIL = {
+    "incident_time": "어제", "evidence_list": ["중고나라 게시글", "송금 내역"], "previous_actions": [],
+    "involved_parties": ["피해자", "판매자"], "financial_impact": {"송금액": 850000.0},
+    "additional_notes": ["게시글 삭제됨"], "fraud_type": "중고거래 사기", "damage_scale": "85만원",
+    "victim_status": "판매자와 연락 두절", "urgent_actions": ["지급정지 요청", "증거 보존"],
+    "legal_issues": ["사기죄"], "additional_risk": "동일 계좌로 추가 피해 가능",
+}
+EMOTION = {
+    "emotional_state": "분노, 불안", "speech_style": "격앙된", "recommended_tone": "차분하고 공감적인",
+    "communication_strategy": {"어휘": "쉬운 표현", "어조": "안정감 있게"},
+    "empathy_points": ["피해 금액에 대한 걱정", "연락 두절로 인한 불안"],
+    "response_guidelines": {"추천": ["구체적인 다음 단계 안내"], "피해야 할 표현": ["자책 유도"]},
+    "support_approach": "즉시 할 수 있는 조치를 안내해 통제감을 회복하도록 지원",
+}
+SOLUTION = {
+    "immediate_actions": ["은행에 지급정지 요청", "게시글/대화 캡처 보존"],
+    "legal_actions": ["경찰서 사이버수사대 진정서 제출"], "prevention_steps": ["안전결제 이용"],
+    "required_documents": ["송금 내역", "대화 캡처"], "support_resources": ["경찰청 사이버범죄 신고시스템(ECRM)"],
+    "timeline": {"오늘": "지급정지 및 신고", "1주 이내": "진정서 제출"},
+}
+
+# 시스템 프롬프트 표현 -> 응답 (통합 프롬프트를 먼저 확인)
+REPLIES = [
+    ("세 가지 분석", {"detail": DETAIL, "emotion": EMOTION, "solution": SOLUTION}),
+    ("상세 정보와 상황", DETAIL),
+    ("감정 상태를 분석", EMOTION),
+    ("해결방안을 제시", SOLUTION),
+]
+
+
+class TimedChatModel(FakeChatModel):
+    """출력 토큰 수에 비례해 지연되는 가짜 모델"""
+
+    ms_per_token: float = 10.0
+    calls: ClassVar[List[int]] = []
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        from utils.context_window import count_tokens
+
+        system = str(messages[0].content)
+        reply = next(reply for marker, reply in REPLIES if marker in system)
+        self.reply = json.dumps(reply, ensure_ascii=False)
+        TimedChatModel.calls.append(count_tokens(self.reply))
+        await asyncio.sleep(self.ms_per_token * count_tokens(self.reply) / 1000)
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+async def measure(run) -> Dict[str, Any]:
+    from utils.usage import start_request_usage
+
+    TimedChatModel.calls = []
+    usage = start_request_usage("bench")
+    started = time.perf_counter()
+    result = await run()
+    return {
+        "ms": (time.perf_counter() - started) * 1000,
+        "calls": len(TimedChatModel.calls),
+        "prompt": usage.total["prompt_tokens"],
+        "completion": usage.total["completion_tokens"],
+        "ok": all(section in result and "error" not in result[section] for section in ("detail", "emotion", "solution")),
+    }
+
+
+async def run_all() -> List[tuple]:
+    from tools.analysis import Analysis
+    from tools.cache import get_tool_cache
+    from tools.detail import Detail
+    from tools.emotion import Emotion
+    from tools.solution import Solution
+
+    detail, emotion, solution = Detail(), Emotion(), Solution()
+
+    async def sequential() -> Dict[str, Any]:
+        return {
+            "detail": (await detail._arun(MESSAGE)).model_dump(),
+            "emotion": (await emotion._arun(MESSAGE)).model_dump(),
+            "solution": (await solution._arun(MESSAGE)).model_dump(),
+        }
+
+    parallel, fused = Analysis(fused=False), Analysis(fused=True)
+    get_tool_cache().clear()
+    return [
+        ("sequential", await measure(sequential)),
+        ("parallel", await measure(lambda: parallel._arun(MESSAGE))),
+        ("fused", await measure(lambda: fused._arun(MESSAGE))),
+        ("fused (cached)", await measure(lambda: fused._arun(MESSAGE))),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-delay", type=float, default=0.5)
+    parser.add_argument("--ms-per-token", type=float, default=10.0)
+    args = parser.parse_args()
+
+    # 도구의 llm 필드 타입으로도 쓰이므로 partial 이 아닌 하위 클래스로 기본값 지정
+    class Model(TimedChatModel):
+        delay: float = args.base_delay
+        ms_per_token: float = args.ms_per_token
+
+    with patch("langchain_openai.ChatOpenAI", Model):
+        results = asyncio.run(run_all())
+
+    print(f"{'mode':16s} {'latency':>9s} {'LLM calls':>9s} {'prompt':>7s} {'completion':>10s}  ok")
+    for name, result in results:
+        print(f"{name:16s} {result['ms']:7.0f}ms {result['calls']:9d} {result['prompt']:7d} {result['completion']:10d}  {result['ok']}")
+    base, parallel, fused = results[0][1], results[1][1], results[2][1]
+    print(f"parallel vs sequential: {base['ms'] / parallel['ms']:.1f}x faster, same tokens")
+    print(f"fused vs sequential   : {base['ms'] / fused['ms']:.1f}x faster, "
+          f"{1 - fused['prompt'] / base['prompt']:.0%} fewer prompt tokens, 1 LLM call")
+
+
+if __name__ == "__main__":
+    main()
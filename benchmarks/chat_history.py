@@ -0,0 +1,81 @@
+"""
+대화 기록 저장소 백엔드별 처리량 벤치마크
+
+memory / sqlite(WAL) / redis(로컬 RESP 대역 서버 또는 --redis-url) 백엔드에 대해
+한 턴(사용자 메시지 + 응답 = 1회 append)과 기록 조회(read)의 평균 소요시간과 처리량을 측정합니다.
+
+실행: python -m benchmarks.chat_history --sessions 200 --turns 20
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.dto.chat import ChatMessage
+from app.services.chat_history import (
+    ChatHistoryBackend,
+    InMemoryChatHistoryBackend,
+    SQLiteChatHistoryBackend,
+    RedisChatHistoryBackend,
+)
+from benchmarks.resp_server import RespServer
+
+
+def bench(name: str, backend: ChatHistoryBackend, sessions: int, turns: int) -> None:
+    user = ChatMessage(role="user", content="중고나라에서 70만원을 송금했는데 물건이 오지 않아요." * 2)
+    assistant = ChatMessage(role="assistant", content="피해 사실을 확인하기 위해 몇 가지 질문을 드리겠습니다." * 4)
+
+    appends = reads = 0
+    append_time = read_time = 0.0
+    for turn in range(turns):
+        for s in range(sessions):
+            session_id = f"bench-{s}"
+            start = time.perf_counter()
+            backend.read(session_id)
+            read_time += time.perf_counter() - start
+            reads += 1
+
+            start = time.perf_counter()
+            backend.append(session_id, [user, assistant])
+            append_time += time.perf_counter() - start
+            appends += 1
+
+    assert len(backend.read("bench-0")) == turns * 2
+    for s in range(sessions):
+        backend.clear(f"bench-{s}")
+
+    print(
+        f"{name:<8} append/turn {append_time / appends * 1e6:8.1f} us ({appends / append_time:9.0f} turns/s)   "
+        f"read {read_time / reads * 1e6:8.1f} us ({reads / read_time:9.0f} reads/s)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대화 기록 저장소 벤치마크")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--redis-url", default=None, help="실제 Redis 주소 (미지정 시 로컬 RESP 대역 서버 사용)")
+    args = parser.parse_args()
+
+    print(f"sessions={args.sessions} turns={args.turns} (read history + append 2 messages per turn)")
+    bench("memory", InMemoryChatHistoryBackend(), args.sessions, args.turns)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteChatHistoryBackend(os.path.join(tmp, "chat_history.db"))
+        bench("sqlite", backend, args.sessions, args.turns)
+        backend.close()
+
+    server = None
+    redis_url = args.redis_url
+    if redis_url is None:
+        server = RespServer().start()
+        redis_url = server.url
+    backend = RedisChatHistoryBackend(redis_url, key_prefix="bench:chat")
+    bench("redis", backend, args.sessions, args.turns)
+    backend.close()
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
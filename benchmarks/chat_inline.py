@@ -0,0 +1,60 @@
+"""
+CHAT 턴 지연시간 비교: 라우팅 후 답변 별도 생성 vs 라우팅 응답에 답변 포함
+
+가짜 모델(호출당 --delay 초)로 CHAT 으로 라우팅되는 일반 대화를 처리합니다.
+별도 생성 모드는 LLM 왕복 2회, 통합 모드는 1회가 걸려야 합니다.
+로컬 라우터는 끄고 LLM 라우터 경로만 비교합니다.
+
+실행: python -m benchmarks.chat_inline --delay 0.5 --turns 5
+"""
+import argparse
+import asyncio
+import os
+import time
+from functools import partial
+from statistics import mean
+from unittest.mock import patch
+
+from benchmarks.fake_model import FakeChatModel
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+
+async def run(delay: float, turns: int) -> None:
+    from app.config.settings import settings
+    from app.dto.chat import ChatMessage
+    from app.services.chat_service import ChatService
+
+    settings.LOCAL_ROUTER_ENABLED = False
+    results = {}
+    for inline in (False, True):
+        settings.SUPERVISOR_INLINE_CHAT_REPLY = inline
+        service = ChatService()
+        latencies = []
+        for i in range(turns):
+            start = time.perf_counter()
+            response = await service.process_chat(
+                messages=[ChatMessage(role="user", content="오늘 날씨 어때요?")],
+                session_id=f"bench-inline-{inline}-{i}",
+            )
+            latencies.append(time.perf_counter() - start)
+        results[inline] = latencies
+        print(f"{'inline' if inline else 'separate':8s}: avg={mean(latencies) * 1000:7.1f} ms  "
+              f"reply={response.messages[0].content[:30]!r}")
+
+    print(f"speedup : {mean(results[False]) / mean(results[True]):.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.5)
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+
+    with patch("langchain_openai.ChatOpenAI", partial(FakeChatModel, delay=args.delay, route="CHAT")):
+        asyncio.run(run(args.delay, args.turns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+완성도 확인 비용 비교: 매번 전체 대화 분석 vs 세션 슬롯 상태로 새 대화만 분석
+
+대화가 한 턴씩 늘어날 때마다 /check-completion 을 호출하는 프론트엔드 폴링을 흉내 냅니다.
+가짜 모델이 받은 프롬프트 토큰 수를 기록해 대화 길이에 따른 누적 비용을 비교하고,
+대화가 추가되지 않은 재확인 요청은 LLM 을 호출하지 않는지 확인합니다 (호출되면 종료 코드 1).
+
+실행: python -m benchmarks.check_incremental --turns 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from functools import partial
+from typing import Any, List
+from unittest.mock import patch
+
+from benchmarks.fake_model import FakeChatModel
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+SLOT_REPLY = json.dumps({
+    "respondent": {"name": "seller123", "account": "국민은행 123-456-789"},
+    "damage": {"fraud_type": "중고거래 사기", "amount": "70만원", "platform": "당근마켓"},
+    "evidence": ["대화 캡처"],
+}, ensure_ascii=False)
+
+
+class RecordingChatModel(FakeChatModel):
+    """받은 프롬프트의 토큰 수를 기록하는 가짜 모델"""
+
+    prompt_tokens: List[int] = []
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        from utils.context_window import messages_tokens
+
+        RecordingChatModel.prompt_tokens.append(messages_tokens(messages))
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+def _transcript(turns: int) -> List[str]:
+    lines = []
+    for i in range(turns):
+        lines.append(f"사용자: {i + 1}번째 정보입니다. 2024년 3월 {i % 28 + 1}일에 당근마켓 판매자에게 {10 * (i + 1)}만원을 보냈어요.")
+        lines.append("챗봇: 네, 확인했습니다. 판매자의 아이디나 계좌번호, 대화 캡처 같은 증거도 있으신가요?")
+    return lines
+
+
+async def run(turns: int, incremental: bool) -> dict:
+    from app.dto.check import CompletionCheckRequest
+    from app.services.chat_history import chat_history
+    from app.services.check import CheckService
+
+    service = CheckService()
+    session_id = "bench-check" if incremental else None
+    chat_history.clear_history("bench-check")
+    RecordingChatModel.prompt_tokens = []
+
+    lines = _transcript(turns)
+    repeat_calls = 0
+    for turn in range(1, turns + 1):
+        history = "\n".join(lines[:turn * 2])
+        result = await service.check_completion(CompletionCheckRequest(chat_history=history, session_id=session_id))
+        # 대화가 늘지 않은 상태에서 다시 확인 (프론트엔드 중복 폴링)
+        calls = len(RecordingChatModel.prompt_tokens)
+        await service.check_completion(CompletionCheckRequest(chat_history=history, session_id=session_id))
+        repeat_calls += len(RecordingChatModel.prompt_tokens) - calls
+    return {
+        "calls": len(RecordingChatModel.prompt_tokens),
+        "tokens": sum(RecordingChatModel.prompt_tokens),
+        "last_prompt": RecordingChatModel.prompt_tokens[-1],
+        "repeat_calls": repeat_calls,
+        "percentage": result.percentage,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=30)
+    args = parser.parse_args()
+
+    from app.config.settings import settings
+
+    # LLM 추출 경로의 비용 비교가 목적이므로 규칙 기반 사전 추출은 끔 (benchmarks.check_prescore 참고)
+    settings.CHECK_ENTITY_EXTRACTOR = False
+    with patch("langchain_openai.ChatOpenAI", partial(RecordingChatModel, delay=0, reply=SLOT_REPLY)):
+        full = asyncio.run(run(args.turns, incremental=False))
+        incremental = asyncio.run(run(args.turns, incremental=True))
+
+    print(f"{args.turns} turns, check after every turn + one repeated check")
+    print(f"{'mode':12s} {'LLM calls':>9s} {'prompt tokens':>13s} {'last prompt':>11s} {'repeat calls':>12s} {'score':>6s}")
+    for name, result in (("full", full), ("incremental", incremental)):
+        print(f"{name:12s} {result['calls']:9d} {result['tokens']:13d} {result['last_prompt']:11d} "
+              f"{result['repeat_calls']:12d} {result['percentage']:6.1f}")
+    print(f"prompt tokens saved: {1 - incremental['tokens'] / full['tokens']:.1%}")
+    if incremental["repeat_calls"]:
+        print("FAIL: unchanged session triggered an LLM call")
+        sys.exit(1)
+    print("OK: unchanged sessions are scored without an LLM call")
+
+
+if __name__ == "__main__":
+    main()
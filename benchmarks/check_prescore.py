@@ -0,0 +1,150 @@
+"""
+규칙 기반 항목 추출기(app.services.entity_extractor) 처리량과 LLM 추출 결과와의 일치도
+
+- 처리량: 대화 말뭉치 전체를 반복 추출해 대화당 처리 시간 측정
+- 일치도: 항목(17개)별 채움 여부 일치율, 완성도 점수 차이(MAE), 작성 가능 여부(fulfilled) 일치율
+- 승격률: CheckService 가 애매하다고 판단해 LLM 으로 넘기는 대화 비율과, 승격 후(LLM 결과 사용) 일치율
+- 추출 사례: 복합 단위 금액, 다른 단어에 포함된 짧은 플랫폼 이름 등 (틀리면 종료 코드 1)
+
+기준값은 말뭉치의 reference(LLM 추출 결과 레이블)를 사용하며, --live 를 주면 실제 gpt-4o-mini 로
+CheckService 의 LLM 추출 경로를 실행해 기준값을 새로 만듭니다 (OPENAI_API_KEY 필요).
+
+실행: python -m benchmarks.check_prescore [--data benchmarks/data/check_transcripts.jsonl] [--live]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+from statistics import mean
+from typing import Any, Dict, List
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+DEFAULT_DATA = os.path.join(os.path.dirname(__file__), "data", "check_transcripts.jsonl")
+
+# (사용자 발화, 항목, 기대값 - None 이면 추출되지 않아야 함)
+EXTRACTOR_CASES = [
+    ("3만5천원 보냈는데 물건이 안 와요", "damage.amount", "35,000원"),
+    ("1억 2천만원을 송금했어요", "damage.amount", "1억 2,000만원"),
+    ("2천5백만원 이체했습니다", "damage.amount", "2,500만원"),
+    ("700,000원 입금했어요", "damage.amount", "70만원"),
+    ("온라인 쇼핑몰에서 결제했는데 배송이 안 와요", "damage.platform", None),
+    ("라인으로 연락이 와서 송금했어요", "damage.platform", "라인"),
+    ("당근마켓에서 거래했어요", "damage.platform", "당근마켓"),
+    ("아이디가 뭐였는지 기억이 안나요", "respondent.name", None),
+    ("판매자 아이디는 happy_cat99 이에요", "respondent.name", "happy_cat99"),
+    ("닉네임은 '행복한곰'이었어요", "respondent.name", "행복한곰"),
+    ("국민은행 123456-01-123456 으로 보냈어요", "damage.occurred_at", None),
+    ("2024년 3월 15일에 송금했어요", "damage.occurred_at", "2024년 3월 15일"),
+]
+
+
+def _check_extractor_cases() -> List[str]:
+    from app.services.entity_extractor import extract_entities
+
+    failures = []
+    for text, field, expected in EXTRACTOR_CASES:
+        section, name = field.split(".")
+        value = getattr(getattr(extract_entities(f"사용자: {text}").slots, section) or object(), name, None)
+        if value != expected:
+            failures.append(f"{text!r}: {field}={value!r} (expected {expected!r})")
+    return failures
+
+
+def _fields() -> List[str]:
+    from app.services.slot_state import SLOT_SECTIONS
+
+    return [f"{section}.{field}" if section != "evidence" else "evidence"
+            for section, (_, fields) in SLOT_SECTIONS.items() for field, _ in fields]
+
+
+async def _live_references(records: List[Dict[str, Any]]) -> None:
+    from app.config.settings import settings
+    from app.dto.check import SlotState
+    from app.services.check import CheckService
+
+    settings.CHECK_ENTITY_EXTRACTOR = False
+    service = CheckService()
+    for record in records:
+        slots = await service.extract_slots(SlotState(), record["chat_history"])
+        record["reference"] = slots.model_dump(exclude_none=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default=DEFAULT_DATA)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--live", action="store_true", help="gpt-4o-mini 로 기준값 생성")
+    args = parser.parse_args()
+
+    from app.dto.check import SlotState
+    from app.services.check import CheckService
+    from app.services.entity_extractor import extract_entities
+    from app.services.slot_state import is_filled, score_slots
+
+    with open(args.data, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if args.live:
+        asyncio.run(_live_references(records))
+
+    # 처리량
+    texts = [r["chat_history"] for r in records]
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for text in texts:
+            extract_entities(text)
+    per_call = (time.perf_counter() - started) / (args.repeat * len(texts))
+
+    service = CheckService()
+    fields = _fields()
+    field_agree = Counter()
+    local_mae: List[float] = []
+    local_fulfilled: List[bool] = []
+    combined_fulfilled: List[bool] = []
+    combined_mae: List[float] = []
+    reasons = Counter()
+    escalated = 0
+    for record in records:
+        reference = SlotState.model_validate(record["reference"])
+        local = extract_entities(record["chat_history"]).slots
+        _, why = service._needs_llm(SlotState(), record["chat_history"])
+        expected, predicted = score_slots(reference), score_slots(local)
+        for field in fields:
+            field_agree[field] += is_filled(local, field) == is_filled(reference, field)
+        local_mae.append(abs(predicted.percentage - expected.percentage))
+        local_fulfilled.append(predicted.fulfilled == expected.fulfilled)
+        if why:
+            escalated += 1
+            reasons.update(why)
+            # 승격된 대화는 LLM 결과(기준값)를 사용
+            combined_mae.append(0.0)
+            combined_fulfilled.append(True)
+        else:
+            combined_mae.append(local_mae[-1])
+            combined_fulfilled.append(local_fulfilled[-1])
+
+    n = len(records)
+    print(f"{n} transcripts, {args.repeat} passes")
+    print(f"throughput: {per_call * 1e6:.1f} us/transcript ({1 / per_call:,.0f} transcripts/s)")
+    print(f"field agreement (filled vs empty): {sum(field_agree.values()) / (n * len(fields)):.1%}")
+    worst = sorted(fields, key=lambda f: field_agree[f])[:4]
+    print("  lowest: " + ", ".join(f"{f}={field_agree[f] / n:.0%}" for f in worst))
+    print(f"local only   : score MAE={mean(local_mae):5.1f} pts  fulfilled agreement={mean(local_fulfilled):.1%}")
+    print(f"with escalate: score MAE={mean(combined_mae):5.1f} pts  fulfilled agreement={mean(combined_fulfilled):.1%}  "
+          f"escalated={escalated}/{n} ({escalated / n:.0%})")
+    if reasons:
+        print("escalation reasons: " + ", ".join(f"{k}={v}" for k, v in reasons.most_common()))
+
+    failures = _check_extractor_cases()
+    print(f"extractor cases: {len(EXTRACTOR_CASES) - len(failures)}/{len(EXTRACTOR_CASES)} ok")
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+완성도 확인 LLM 추출 응답 파싱 검증
+
+모델이 흔히 내놓는 형식 이탈(코드 블록, 앞뒤 설명, 끝 쉼표, 숫자 금액 등)을 가짜 모델 응답으로 주고,
+- before: 응답 본문을 그대로 json.loads (실패하면 422 -> 클라이언트 재시도로 LLM 호출 2배)
+- after : 구조화 출력 + 로컬 복구 (어떤 경우에도 요청당 LLM 호출 1회, 실패해도 오류 응답 없음)
+을 비교하고, poli_check_parse_total 로 파싱 결과를 집계합니다.
+
+실행: python -m benchmarks.check_structured
+"""
+import asyncio
+import json
+import os
+import sys
+from functools import partial
+from typing import Any, ClassVar, List
+from unittest.mock import patch
+
+from benchmarks.fake_model import FakeChatModel
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+SLOTS = {
+    "respondent": {"name": "seller123", "account": "국민은행 123-456-789"},
+    "damage": {"fraud_type": "중고거래 사기", "amount": "70만원", "platform": "당근마켓"},
+    "evidence": ["대화 캡처"],
+}
+CLEAN = json.dumps(SLOTS, ensure_ascii=False)
+CASES = [
+    ("clean", CLEAN),
+    ("code fence", f"```json\n{CLEAN}\n```"),
+    ("prose + fence", f"대화에서 확인된 정보는 다음과 같습니다.\n```\n{CLEAN}\n```\n추가 정보가 필요하면 알려주세요."),
+    ("trailing comma", CLEAN[:-1] + ",}"),
+    ("numeric amount", CLEAN.replace('"70만원"', "700000")),
+    ("evidence string", CLEAN.replace('["대화 캡처"]', '"대화 캡처"')),
+    ("not json", "죄송합니다. 대화 내용에서 정보를 찾을 수 없습니다."),
+]
+HISTORY = "사용자: 당근마켓에서 seller123 에게 70만원을 보냈는데 연락이 안 돼요. 국민은행 123-456-789 이고 대화 캡처 있어요."
+
+
+class CountingChatModel(FakeChatModel):
+    calls: ClassVar[List[int]] = []
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        CountingChatModel.calls.append(1)
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+def _before(reply: str) -> bool:
+    try:
+        json.loads(reply)
+        return True
+    except ValueError:
+        return False
+
+
+async def run(reply: str) -> dict:
+    from app.dto.check import CompletionCheckRequest
+    from app.services.check import CHECK_PARSE_RESULTS, CheckService
+
+    before = {result: CHECK_PARSE_RESULTS.value(result=result) for result in ("structured", "repaired", "failed")}
+    CountingChatModel.calls = []
+    with patch("langchain_openai.ChatOpenAI", partial(CountingChatModel, delay=0, reply=reply)):
+        service = CheckService()
+    try:
+        analysis = await service.check_completion(CompletionCheckRequest(chat_history=HISTORY))
+        percentage, error = analysis.percentage, None
+    except ValueError as e:
+        percentage, error = None, str(e)
+    parsed = next(result for result, count in before.items() if CHECK_PARSE_RESULTS.value(result=result) > count)
+    return {"parse": parsed, "calls": len(CountingChatModel.calls), "percentage": percentage, "error": error}
+
+
+def main() -> None:
+    from app.config.settings import settings
+
+    # LLM 추출 경로만 확인
+    settings.CHECK_ENTITY_EXTRACTOR = False
+
+    failures = []
+    print(f"{'reply':16s} {'json.loads':>10s} {'after':>10s} {'calls':>5s} {'score':>6s}")
+    for name, reply in CASES:
+        result = asyncio.run(run(reply))
+        score = "-" if result["percentage"] is None else f"{result['percentage']:.1f}"
+        print(f"{name:16s} {'ok' if _before(reply) else 'FAIL':>10s} {result['parse']:>10s} {result['calls']:5d} {score:>6s}")
+        if result["error"] or result["calls"] != 1:
+            failures.append(f"{name}: calls={result['calls']} error={result['error']}")
+
+    from app.services.check import CHECK_PARSE_RESULTS
+
+    counts = {result: CHECK_PARSE_RESULTS.value(result=result) for result in ("structured", "repaired", "failed")}
+    print(f"poli_check_parse_total: {counts}  failure rate: {counts['failed'] / sum(counts.values()):.0%}")
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK: every request answered with a single LLM call and no error response")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+동시 채팅 세션 벤치마크
+
+가짜 모델(지연시간 고정)로 슈퍼바이저 파이프라인을 구성한 뒤 N개의 채팅 세션을 동시에 실행합니다.
+비동기 경로가 정상이라면 전체 소요시간은 "가장 느린 요청 하나"에 가깝고, 이벤트 루프 지연(lag)도 작게 유지됩니다.
+
+실행: python -m benchmarks.concurrency --sessions 20 --delay 0.5
+"""
+import argparse
+import asyncio
+import os
+import time
+from functools import partial
+from unittest.mock import patch
+
+from benchmarks.fake_model import FakeChatModel
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+
+async def _monitor_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """이벤트 루프가 막힌 최대 시간을 측정"""
+    max_lag = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - start - interval)
+    return max_lag
+
+
+async def run(sessions: int, delay: float) -> None:
+    from app.dto.chat import ChatMessage
+    from app.services.chat_service import ChatService
+
+    service = ChatService()
+
+    async def one(i: int) -> float:
+        start = time.perf_counter()
+        await service.process_chat(
+            messages=[ChatMessage(role="user", content=f"중고거래 사기를 당했어요 #{i}")],
+            session_id=f"bench-{i}",
+        )
+        return time.perf_counter() - start
+
+    # 단일 요청 지연시간
+    single = await one(-1)
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_monitor_loop_lag(stop))
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one(i) for i in range(sessions)))
+    wall = time.perf_counter() - start
+    stop.set()
+    max_lag = await lag_task
+
+    print(f"sessions            : {sessions}")
+    print(f"model delay         : {delay * 1000:.0f} ms / call")
+    print(f"single request      : {single * 1000:.0f} ms")
+    print(f"max request latency : {max(latencies) * 1000:.0f} ms")
+    print(f"sum of latencies    : {sum(latencies) * 1000:.0f} ms")
+    print(f"wall time (parallel): {wall * 1000:.0f} ms")
+    print(f"wall / max latency  : {wall / max(latencies):.2f}x")
+    print(f"max event-loop lag  : {max_lag * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 채팅 세션 벤치마크")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.5, help="가짜 모델 호출당 지연시간(초)")
+    args = parser.parse_args()
+
+    fake = partial(FakeChatModel, delay=args.delay)
+    with patch("langchain_openai.ChatOpenAI", fake):
+        asyncio.run(run(args.sessions, args.delay))
+
+
+if __name__ == "__main__":
+    main()
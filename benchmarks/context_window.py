@@ -0,0 +1,91 @@
+"""
+대화 길이에 따른 프롬프트 크기 확인 (문맥 관리자 적용 전/후)
+
+가짜 모델이 받은 프롬프트의 토큰 수를 기록하면서 한 세션에서 --turns 턴 대화를 진행합니다.
+문맥 관리자를 적용하면 프롬프트 크기가 에이전트 예산(CONTEXT_BUDGETS) 안에서 더 이상 증가하지 않아야 합니다.
+예산을 넘으면 종료 코드 1로 끝납니다.
+
+실행: python -m benchmarks.context_window --turns 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+from functools import partial
+from typing import Any, List
+from unittest.mock import patch
+
+from benchmarks.fake_model import FakeChatModel
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+REPLY = ("말씀해 주신 내용 잘 확인했습니다. 진정서 작성을 위해 피해 일시, 송금 금액, 상대방 계좌번호와 "
+         "거래 플랫폼 정보가 필요합니다. 대화 캡처나 이체 확인증 같은 증거자료도 함께 준비해 주시면 좋습니다")
+
+
+class RecordingChatModel(FakeChatModel):
+    """받은 프롬프트의 토큰 수를 기록하는 가짜 모델"""
+
+    prompt_tokens: List[int] = []
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        from utils.context_window import messages_tokens
+
+        RecordingChatModel.prompt_tokens.append(messages_tokens(messages))
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+async def run_session(turns: int, bounded: bool) -> List[int]:
+    from app.config.settings import settings
+    from app.dto.chat import ChatMessage
+    from app.services.chat_service import ChatService
+    from utils.context_window import get_context_manager
+
+    if not bounded:
+        settings.CONTEXT_BUDGETS = {agent: 10 ** 9 for agent in settings.CONTEXT_BUDGETS}
+    get_context_manager.cache_clear()
+
+    RecordingChatModel.prompt_tokens = []
+    service = ChatService()
+    session_id = f"bench-context-{bounded}"
+    sizes = []
+    for i in range(turns):
+        await service.process_chat(
+            messages=[ChatMessage(role="user", content=f"{i + 1}번째 정보입니다. 2024년 5월 {i % 28 + 1}일에 {10 * (i + 1)}만원을 보냈어요")],
+            session_id=session_id,
+        )
+        sizes.append(RecordingChatModel.prompt_tokens[-1])
+    return sizes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+
+    from app.config.settings import settings
+
+    # 문맥 관리자 비교에 집중하기 위해 항상 정보 수집 에이전트로 라우팅
+    settings.STICKY_ROUTING_ENABLED = False
+    settings.CHAT_HISTORY_MAX_MESSAGES = args.turns * 2
+    budget = settings.CONTEXT_BUDGETS["collectionagent"]
+    model = partial(RecordingChatModel, delay=0, route="COLLECTIONAGENT", reply=REPLY)
+    with patch("langchain_openai.ChatOpenAI", model):
+        bounded = asyncio.run(run_session(args.turns, bounded=True))
+        unbounded = asyncio.run(run_session(args.turns, bounded=False))
+
+    print(f"collectionagent budget: {budget} tokens")
+    print(f"{'turn':>5s} {'unbounded':>10s} {'bounded':>8s}")
+    for turn in sorted({1, 10, 25, 50, 100, 150, args.turns}):
+        if turn <= args.turns:
+            print(f"{turn:5d} {unbounded[turn - 1]:10d} {bounded[turn - 1]:8d}")
+    print(f"max bounded prompt: {max(bounded)} tokens")
+    if max(bounded) > budget:
+        print("FAIL: prompt exceeded budget")
+        sys.exit(1)
+    print("OK: prompt size stays within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import ConfigDict
+
+
+class FakeChatModel(BaseChatModel):
+    """벤치마크용 로컬 가짜 모델 (지연시간 설정 가능, 네트워크 호출 없음)"""
+
+    model_config = ConfigDict(extra="allow")
+
+    model: str = "fake-model"
+    temperature: float = 0.0
+    delay: float = 0.5
+    reply: str = "안녕하세요. 사기 피해 상담을 도와드리겠습니다."
+    route: str = "POLIAGENT"
+    token_delay: float = 0.02
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        # 실제 모델처럼 토큰 사용량을 llm_output 에 기록 (사용량 집계 확인용 근사치)
+        from utils.context_window import count_tokens, messages_tokens
+
+        usage = {"prompt_tokens": messages_tokens(messages), "completion_tokens": count_tokens(self.reply)}
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=self.reply))],
+            llm_output={"model_name": self.model, "token_usage": usage},
+        )
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.delay)
+        return self._result(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.delay)
+        return self._result(messages)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        # 첫 토큰까지 delay, 이후 토큰마다 token_delay
+        await asyncio.sleep(self.delay)
+        from utils.context_window import count_tokens, messages_tokens
+
+        pieces = self.reply.split(" ")
+        for i, piece in enumerate(pieces):
+            if i:
+                await asyncio.sleep(self.token_delay)
+            message = AIMessageChunk(content=piece if i == 0 else " " + piece)
+            if i == len(pieces) - 1:
+                # stream_usage 처럼 마지막 청크에 사용량 포함
+                prompt, completion = messages_tokens(messages), count_tokens(self.reply)
+                message.usage_metadata = {"input_tokens": prompt, "output_tokens": completion,
+                                          "total_tokens": prompt + completion}
+                message.response_metadata = {"model_name": self.model}
+            chunk = ChatGenerationChunk(message=message)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "FakeChatModel":
+        return self
+
+    def with_structured_output(self, schema: Any, *, include_raw: bool = False, **kwargs: Any):
+        if "next" not in getattr(schema, "model_fields", {}):
+            return self._json_structured_output(schema, include_raw)
+
+        def _build() -> Any:
+            # 답변 필드가 있는 스키마라면 CHAT 일 때 답변도 함께 채움
+            if "reply" in getattr(schema, "model_fields", {}) and self.route == "CHAT":
+                return schema(next=self.route, reply=self.reply)
+            return schema(next=self.route)
+
+        def _route(_input: Any) -> Any:
+            time.sleep(self.delay)
+            return _build()
+
+        async def _aroute(_input: Any) -> Any:
+            await asyncio.sleep(self.delay)
+            return _build()
+
+        return RunnableLambda(_route, afunc=_aroute)
+
+    def _json_structured_output(self, schema: Any, include_raw: bool):
+        """json_schema 방식 흉내: reply(JSON 본문)를 스키마로 파싱 (include_raw 면 실패도 그대로 전달)"""
+        def _parse(message: AIMessage) -> Any:
+            try:
+                parsed, error = schema.model_validate_json(message.content), None
+            except ValueError as e:
+                if not include_raw:
+                    raise
+                parsed, error = None, e
+            return {"raw": message, "parsed": parsed, "parsing_error": error} if include_raw else parsed
+
+        return self | RunnableLambda(_parse)
@@ -0,0 +1,102 @@
+"""
+진정서 생성 비교: 전체를 LLM 으로 작성(llm) vs 고정 양식 + 서술 부분만 LLM(template)
+
+가짜 모델은 (기본 지연 + 출력 토큰당 지연) 만큼 기다린 뒤 응답하므로, 출력 길이가 지연시간에 반영됩니다.
+- llm 모드: 진정서 전체를 응답
+- template 모드: 서술 부분(JSON)만 응답, 같은 대화로 다시 요청하면 캐시된 서술을 재사용 (LLM 호출 없음)
+
+실행: python -m benchmarks.letter_template --base-delay 0.3 --ms-per-token 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from functools import partial
+from typing import Any, ClassVar, List
+from unittest.mock import patch
+
+from benchmarks.fake_model import FakeChatModel
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+CHAT = (
+    "사용자: 중고거래 사기를 당했어요. 당근마켓에서 맥북을 사려고 70만원을 보냈는데 물건을 안 보내주네요.\n"
+    "챗봇: 거래는 언제 하셨나요?\n"
+    "사용자: 2024년 3월 15일 오후 2시쯤이요. 판매자 계좌는 국민은행 123-456-789이고, 아이디는 'seller123'이에요.\n"
+    "챗봇: 증거자료가 있으신가요?\n"
+    "사용자: 네, 대화 내용 캡처랑 계좌이체 내역 다 있어요.\n"
+    "챗봇: 신청인 정보도 알려주세요.\n"
+    "사용자: 제 이름은 홍길동이고 제 연락처는 010-9876-5432 입니다. 주소는 서울특별시 강남구 테헤란로 123"
+)
+NARRATIVE = json.dumps({
+    "purpose": "피진정인의 중고거래 사기 행위에 대한 철저한 수사와 처벌, 피해금 회복을 요청합니다.",
+    "damage": "신청인은 2024년 3월 15일 당근마켓에서 맥북 구매 대금 70만원을 피진정인 계좌로 송금하였으나 물품을 받지 못하였고 연락이 두절되었습니다.",
+    "route": "당근마켓 중고거래 게시글을 통해 피진정인과 연락한 뒤 계좌이체로 대금을 송금하였습니다.",
+    "conclusion": "위와 같이 중고거래 사기 피해가 발생하였으므로 철저히 조사하여 주시기 바랍니다.",
+}, ensure_ascii=False)
+
+
+class TimedChatModel(FakeChatModel):
+    """출력 토큰 수에 비례해 지연되는 가짜 모델 (서술 부분 요청이면 JSON, 아니면 진정서 전체 응답)"""
+
+    ms_per_token: float = 20.0
+    calls: ClassVar[List[int]] = []
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        from app.dto.letter import LetterResponse
+        from utils.context_window import count_tokens
+
+        narrative = "서술 부분만" in str(messages[0].content)
+        self.reply = NARRATIVE if narrative else LetterResponse.model_fields["content"].json_schema_extra["example"]
+        TimedChatModel.calls.append(count_tokens(self.reply))
+        await asyncio.sleep(self.ms_per_token * count_tokens(self.reply) / 1000)
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+async def run(mode: str, repeat: int) -> List[dict]:
+    from app.services.letter_service import LetterService
+    from utils.usage import start_request_usage
+
+    service = LetterService()
+    results = []
+    for _ in range(repeat):
+        TimedChatModel.calls = []
+        usage = start_request_usage("bench")
+        started = time.perf_counter()
+        letter = await service.generate_letter(CHAT, mode=mode)
+        results.append({
+            "ms": (time.perf_counter() - started) * 1000,
+            "calls": len(TimedChatModel.calls),
+            "prompt": usage.total["prompt_tokens"],
+            "completion": usage.total["completion_tokens"],
+            "content": letter["content"],
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-delay", type=float, default=0.3)
+    parser.add_argument("--ms-per-token", type=float, default=20.0)
+    parser.add_argument("--show", action="store_true", help="template 모드 결과 출력")
+    args = parser.parse_args()
+
+    model = partial(TimedChatModel, delay=args.base_delay, ms_per_token=args.ms_per_token)
+    with patch("langchain_openai.ChatOpenAI", model):
+        llm = asyncio.run(run("llm", 1))
+        template = asyncio.run(run("template", 2))
+
+    print(f"{'mode':18s} {'latency':>9s} {'LLM calls':>9s} {'prompt':>7s} {'completion':>10s}")
+    for name, result in (("llm", llm[0]), ("template", template[0]), ("template (cached)", template[1])):
+        print(f"{name:18s} {result['ms']:7.0f}ms {result['calls']:9d} {result['prompt']:7d} {result['completion']:10d}")
+    before = llm[0]["prompt"] + llm[0]["completion"]
+    after = template[0]["prompt"] + template[0]["completion"]
+    print(f"template vs llm: {llm[0]['ms'] / template[0]['ms']:.1f}x faster, {1 - after / before:.0%} fewer tokens")
+    if args.show:
+        print(template[0]["content"])
+
+
+if __name__ == "__main__":
+    main()
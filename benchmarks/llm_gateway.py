@@ -0,0 +1,112 @@
+"""
+LLM 게이트웨이 확인: 로컬 속도 제한 서버(benchmarks.ratelimit_server)에 동시 호출 폭주
+
+초당 --rps 개만 받는 서버에 --requests 개의 ChatOpenAI 호출을 한꺼번에 보냅니다 (절반은 채팅, 절반은 진정서 엔드포인트).
+- no gateway     : 모델 클라이언트마다 각자 재시도 (ChatOpenAI 기본 max_retries=2)
+- gateway        : 서버 한도에 맞춘 RPM 버킷 + 우선순위 대기 (429 는 창 경계에서 드물게만 발생)
+- gateway (2x)   : 한도를 서버보다 크게 잡아 429 발생 -> Retry-After 동안 호스트 전체 대기 후 재시도
+실패한 호출이 있거나 채팅 호출이 진정서 호출보다 늦게 끝나면 종료 코드 1로 끝납니다 (no gateway 제외).
+
+실행: python -m benchmarks.llm_gateway --requests 40 --rps 10
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.ratelimit_server import RateLimitServer
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+ENDPOINTS = ("/api/v1/chat", "/api/v1/letter/generate")
+
+
+async def _call(model, endpoint: str) -> Dict[str, Any]:
+    from utils.usage import start_request_usage
+
+    start_request_usage(endpoint)
+    started = time.perf_counter()
+    try:
+        await model.ainvoke("안녕하세요")
+        ok = True
+    except Exception:
+        ok = False
+    return {"endpoint": endpoint, "ok": ok, "ms": (time.perf_counter() - started) * 1000}
+
+
+async def _sample_depth(samples: List[int]) -> None:
+    from utils.llm_gateway import gateway_stats
+
+    while True:
+        samples.append(sum(host["queue_depth"] for host in gateway_stats()["hosts"].values()))
+        await asyncio.sleep(0.05)
+
+
+async def burst(base_url: str, requests: int) -> Dict[str, Any]:
+    from utils.http_client import aclose_http_clients
+    from utils.llm import get_chat_model
+
+    model = get_chat_model("gpt-4o-mini", base_url=base_url)
+    depth: List[int] = []
+    sampler = asyncio.create_task(_sample_depth(depth))
+    started = time.perf_counter()
+    results = await asyncio.gather(*(_call(model, ENDPOINTS[i % 2]) for i in range(requests)))
+    elapsed = (time.perf_counter() - started) * 1000
+    sampler.cancel()
+    await aclose_http_clients()
+    by_endpoint = {
+        endpoint: sum(r["ms"] for r in results if r["endpoint"] == endpoint) / max(1, sum(r["endpoint"] == endpoint for r in results))
+        for endpoint in ENDPOINTS
+    }
+    return {"ms": elapsed, "failed": sum(not r["ok"] for r in results), "avg": by_endpoint, "max_depth": max(depth, default=0)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--rps", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    from app.config.settings import settings
+    from utils.llm_gateway import GATEWAY_RETRIES, get_llm_gateway
+
+    settings.LLM_GATEWAY_BURST_SECONDS = 0.1  # 서버의 1초 창과 겹치지 않도록 일정한 간격으로만 통과
+    settings.LLM_GATEWAY_BACKOFF_BASE_SECONDS = 0.2
+    cases = [("no gateway", False, 0), ("gateway", True, args.rps * 60), ("gateway (2x)", True, args.rps * 120)]
+
+    rows = []
+    with RateLimitServer(rps=args.rps, latency=args.latency) as server:
+        for name, enabled, rpm in cases:
+            settings.LLM_GATEWAY_ENABLED = enabled
+            settings.LLM_RATE_LIMITS = {"127.0.0.1": {"rpm": rpm, "tpm": 0}} if enabled else {}
+            get_llm_gateway.cache_clear()
+            server.reset()
+            time.sleep(1.0)  # 이전 경우의 서버 창이 비도록
+            retries = GATEWAY_RETRIES.value(host="127.0.0.1", reason=429)
+            result = asyncio.run(burst(server.base_url, args.requests))
+            result["server"] = server.counts
+            result["retries"] = int(GATEWAY_RETRIES.value(host="127.0.0.1", reason=429) - retries)
+            rows.append((name, enabled, result))
+
+    failures = []
+    print(f"{'case':14s} {'elapsed':>8s} {'failed':>6s} {'200':>4s} {'429':>4s} {'retry':>5s} {'depth':>5s} "
+          f"{'chat avg':>9s} {'letter avg':>10s}")
+    for name, enabled, result in rows:
+        chat, letter = result["avg"][ENDPOINTS[0]], result["avg"][ENDPOINTS[1]]
+        print(f"{name:14s} {result['ms']:6.0f}ms {result['failed']:6d} {result['server'].get(200, 0):4d} "
+              f"{result['server'].get(429, 0):4d} {result['retries']:5d} {result['max_depth']:5d} "
+              f"{chat:7.0f}ms {letter:8.0f}ms")
+        if enabled and (result["failed"] or chat > letter):
+            failures.append(f"{name}: failed={result['failed']} chat={chat:.0f}ms letter={letter:.0f}ms")
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK: no failed calls through the gateway, chat calls served before letter calls")
+
+
+if __name__ == "__main__":
+    main()
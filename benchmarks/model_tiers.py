@@ -0,0 +1,120 @@
+"""
+모델 등급 정책 확인: 기본 등급 vs 지연 예산/부하에 따른 하향
+
+가짜 모델은 모델 이름별 지연시간(gpt-4 느림, gpt-4o-mini 빠름)으로 응답합니다.
+실제 FastAPI 앱에 진정서(llm 모드) 요청을 보내 아래 경우의 지연시간과 선택된 등급을 비교합니다.
+- policy      : 기본 정책 (letter -> quality)
+- budget      : X-Latency-Budget-Ms 가 quality 예상 응답 시간보다 작음 -> fast 로 하향
+- load        : 동시 요청 수가 MODEL_DOWNGRADE_INFLIGHT 이상 -> fast 로 하향
+- all fast    : MODEL_TIER_POLICY 에서 letter 를 fast 로 지정
+선택된 등급이 기대와 다르면 종료 코드 1로 끝납니다.
+
+실행: python -m benchmarks.model_tiers --quality-delay 1.2 --fast-delay 0.3
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict, Optional
+from unittest.mock import patch
+
+from benchmarks.fake_model import FakeChatModel
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+CHAT = (
+    "사용자: 당근마켓에서 맥북을 사려고 70만원을 보냈는데 물건을 안 보내주네요.\n"
+    "챗봇: 거래는 언제 하셨나요?\n"
+    "사용자: 2024년 3월 15일이요. 판매자 계좌는 국민은행 123-456-789 입니다."
+)
+DELAYS: Dict[str, float] = {}
+
+
+class TieredFakeModel(FakeChatModel):
+    """모델 이름에 따라 지연되는 가짜 모델"""
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        self.delay = DELAYS[self.model]
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+def _selections() -> Dict[str, float]:
+    from utils.model_policy import MODEL_SELECTIONS
+
+    return {
+        f"{tier}/{reason}": MODEL_SELECTIONS.value(site="letter", tier=tier, reason=reason)
+        for tier in ("quality", "fast") for reason in ("policy", "load", "budget")
+    }
+
+
+async def measure(concurrency: int = 1, budget_ms: Optional[float] = None) -> Dict[str, Any]:
+    import httpx
+
+    from app.main import app
+
+    headers = {"X-Latency-Budget-Ms": str(budget_ms)} if budget_ms else {}
+    before = _selections()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60) as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.post("/api/v1/letter/generate", json={"chat_content": CHAT, "mode": "llm"}, headers=headers)
+            for _ in range(concurrency)
+        ))
+        elapsed = (time.perf_counter() - started) * 1000
+    after = _selections()
+    return {
+        "ms": elapsed,
+        "ok": all(response.status_code == 200 for response in responses),
+        "tiers": {key: int(after[key] - before[key]) for key in after if after[key] > before[key]},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quality-delay", type=float, default=1.2)
+    parser.add_argument("--fast-delay", type=float, default=0.3)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    from app.config.settings import settings
+    from app.services.letter_service import get_letter_service
+
+    DELAYS.update({settings.MODEL_TIERS["quality"]: args.quality_delay, settings.MODEL_TIERS["fast"]: args.fast_delay})
+    settings.MODEL_TIER_LATENCY_MS = {"fast": args.fast_delay * 1000, "quality": args.quality_delay * 1000}
+    settings.MODEL_DOWNGRADE_INFLIGHT = 0
+    settings.MODEL_LATENCY_BUDGET_MS = 0
+    budget = args.quality_delay * 1000 * 0.75
+
+    results = []
+    with patch("langchain_openai.ChatOpenAI", TieredFakeModel):
+        results.append(("policy", {"quality/policy": 1}, asyncio.run(measure())))
+        results.append(("budget", {"fast/budget": 1}, asyncio.run(measure(budget_ms=budget))))
+        results.append((f"policy x{args.concurrency}", {"quality/policy": args.concurrency},
+                         asyncio.run(measure(args.concurrency))))
+        settings.MODEL_DOWNGRADE_INFLIGHT = 2
+        results.append((f"load x{args.concurrency}", {"fast/load": args.concurrency},
+                        asyncio.run(measure(args.concurrency))))
+        settings.MODEL_DOWNGRADE_INFLIGHT = 0
+        # 정책은 모델 생성 시점에 반영되므로 서비스를 다시 생성 (하향할 등급이 없으면 선택 메트릭도 남지 않음)
+        settings.MODEL_TIER_POLICY = {**settings.MODEL_TIER_POLICY, "letter": "fast"}
+        get_letter_service.cache_clear()
+        results.append(("all fast", {}, asyncio.run(measure())))
+
+    failures = []
+    print(f"{'case':14s} {'latency':>9s}  ok  tiers")
+    for name, expected, result in results:
+        print(f"{name:14s} {result['ms']:7.0f}ms  {'Y' if result['ok'] else 'N':2s}  {result['tiers']}")
+        if not result["ok"] or result["tiers"] != expected:
+            failures.append(f"{name}: expected {expected}, got {result['tiers']}")
+    policy, downgraded = results[0][2]["ms"], results[1][2]["ms"]
+    print(f"budget downgrade vs policy: {policy / downgraded:.1f}x faster")
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK: tiers selected as configured")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+프롬프트 구성 오버헤드 마이크로벤치마크
+
+요청마다 프롬프트/체인을 새로 만들던 방식(이전)과 레지스트리에서 한 번 생성한 템플릿을 쓰는 방식(이후)의
+호출당 비용을 비교합니다. LLM 호출은 포함하지 않고, 모델에 보낼 메시지가 만들어지기까지만 측정합니다.
+
+실행: python -m benchmarks.prompt_overhead --iterations 2000
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+MESSAGE = "중고나라에서 아이폰 사려고 50만원 보냈는데 판매자가 연락이 안 돼요. 사기 맞죠?"
+CHAT = "사용자: " + MESSAGE + "\n챗봇: 거래는 언제 하셨나요?\n사용자: 어제 오후 3시쯤이요."
+
+
+def _per_call_us(func, iterations: int) -> float:
+    func()
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter_ns() - start) / iterations / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프롬프트 구성 오버헤드 벤치마크")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    from langchain_core.messages import HumanMessage, SystemMessage
+    from langchain_core.output_parsers import JsonOutputParser
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+    from langchain_openai import ChatOpenAI
+
+    from agents.supervisior import RouteWithReplyResponse
+    from app.dto.check import SlotState
+    from prompt import system
+    from prompt.registry import get_prompt
+    from tools.output_parser import detail_parser
+
+    model = ChatOpenAI(model="gpt-4o-mini", api_key="bench-dummy-key")
+    history = [HumanMessage(content=MESSAGE)]
+    detail_text = system.detail_tool_prompt.replace(
+        "{format_instructions}", "사용자 메시지: {message}\n\n{format_instructions}"
+    )
+    check_parser = JsonOutputParser(pydantic_object=SlotState)
+    slots = json.dumps(SlotState().model_dump(exclude_none=True), ensure_ascii=False)
+
+    # 이전: 요청마다 템플릿, 형식 지시문, 체인을 새로 생성
+    def detail_before():
+        prompt = ChatPromptTemplate.from_template(detail_text)
+        prompt | model | detail_parser
+        return prompt.format_messages(message=MESSAGE, format_instructions=detail_parser.get_format_instructions())
+
+    def supervisor_before():
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", system.supervisor_system_prompt),
+            MessagesPlaceholder(variable_name="chat_history"),
+            MessagesPlaceholder(variable_name="messages"),
+            ("system", system.supervisor_route_instruction),
+        ]) + ChatPromptTemplate.from_messages([("system", system.supervisor_inline_reply_instruction)])
+        prompt | model.with_structured_output(RouteWithReplyResponse)
+        return prompt.format_messages(chat_history=[], messages=history)
+
+    def check_before():
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", system.check_system_prompt),
+            ("human", "지금까지 파악된 정보:\n{slots}\n\n새로 추가된 대화 내용:\n\n{chat_history}"),
+        ])
+        return prompt.format_messages(slots=slots, chat_history=CHAT,
+                                      format_instructions=check_parser.get_format_instructions())
+
+    def letter_before():
+        date = datetime.now().strftime("%Y년 %m월 %d일")
+        return [SystemMessage(content=f"현재 날짜는 {date} 입니다.\n{system.letter_system_prompt}"),
+                HumanMessage(content=f"다음 대화 내용을 바탕으로 진정서를 작성해주세요:\n\n{CHAT}")]
+
+    # 이후: 레지스트리에서 한 번 생성한 템플릿에 값만 채움
+    detail, route = get_prompt("tool.detail").template, get_prompt("supervisor.route_with_reply").template
+    check, letter = get_prompt("check.extract").template, get_prompt("letter.full").template
+
+    cases = [
+        ("tool.detail", detail_before, lambda: detail.format_messages(message=MESSAGE)),
+        ("supervisor.route", supervisor_before, lambda: route.format_messages(chat_history=[], messages=history)),
+        ("check.extract", check_before, lambda: check.format_messages(slots=slots, chat_history=CHAT)),
+        ("letter.full", letter_before,
+         lambda: letter.format_messages(date=datetime.now().strftime("%Y년 %m월 %d일"), chat_content=CHAT)),
+    ]
+    print(f"{'prompt':18s} {'before':>10s} {'after':>10s} {'speedup':>8s}")
+    for name, before, after in cases:
+        before_us, after_us = _per_call_us(before, args.iterations), _per_call_us(after, args.iterations)
+        print(f"{name:18s} {before_us:8.1f}us {after_us:8.1f}us {before_us / after_us:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+테스트/벤치마크용 OpenAI 호환 속도 제한 서버
+
+실제 API 없이 LLM 게이트웨이를 검증하기 위한 로컬 대역입니다.
+POST /v1/chat/completions 만 지원하며, 최근 1초 동안 받은 요청이 --rps 를 넘으면
+429 와 Retry-After 헤더로 응답합니다. 통과한 요청은 --latency 초 뒤 고정 답변을 돌려줍니다.
+
+실행: python -m benchmarks.ratelimit_server --port 8399 --rps 10
+"""
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict
+
+REPLY = "안녕하세요. 사기 피해 상담을 도와드리겠습니다."
+
+
+class _Window:
+    """최근 1초 요청 시각과 응답 코드별 집계"""
+
+    def __init__(self, rps: int):
+        self.rps = rps
+        self.lock = threading.Lock()
+        self.recent: Deque[float] = deque()
+        self.counts: Dict[int, int] = {}
+
+    def admit(self) -> float:
+        """통과하면 0, 아니면 Retry-After 로 보낼 초"""
+        now = time.monotonic()
+        with self.lock:
+            while self.recent and now - self.recent[0] >= 1.0:
+                self.recent.popleft()
+            if len(self.recent) < self.rps:
+                self.recent.append(now)
+                return 0.0
+            return 1.0 - (now - self.recent[0])
+
+    def count(self, status: int) -> None:
+        with self.lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    window: _Window
+    latency: float
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send(self, status: int, body: dict, headers: Dict[str, str] = None) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.window.count(status)
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        retry_after = self.window.admit()
+        if retry_after:
+            self._send(429, {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                       {"Retry-After": str(max(1, round(retry_after))), "retry-after-ms": str(int(retry_after * 1000))})
+            return
+        time.sleep(self.latency)
+        self._send(200, {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "gpt-4o-mini"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": REPLY}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 20, "completion_tokens": 12, "total_tokens": 32},
+        })
+
+
+class RateLimitServer:
+    """백그라운드 스레드에서 도는 속도 제한 서버 (with 문으로 시작/종료)"""
+
+    def __init__(self, port: int = 0, rps: int = 10, latency: float = 0.1):
+        self.window = _Window(rps)
+        handler = type("Handler", (_Handler,), {"window": self.window, "latency": latency})
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    @property
+    def counts(self) -> Dict[int, int]:
+        return dict(self.window.counts)
+
+    def reset(self) -> None:
+        with self.window.lock:
+            self.window.counts.clear()
+            self.window.recent.clear()
+
+    def __enter__(self) -> "RateLimitServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8399)
+    parser.add_argument("--rps", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+    with RateLimitServer(args.port, args.rps, args.latency) as server:
+        print(f"listening on {server.base_url} (rps={args.rps})")
+        try:
+            server.thread.join()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
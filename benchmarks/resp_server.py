@@ -0,0 +1,207 @@
+"""
+테스트/벤치마크용 최소 Redis 프로토콜(RESP2) 서버
+
+실제 Redis 없이 RedisChatHistoryBackend를 검증하기 위한 로컬 대역입니다.
+LIST/KEY 관련 명령 일부(PING, RPUSH, LRANGE, LTRIM, LLEN, DEL, EXPIRE, GET, SET, EXISTS)와
+WATCH/MULTI/EXEC 트랜잭션만 지원합니다.
+
+실행: python -m benchmarks.resp_server --port 6390
+"""
+import argparse
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+_QUEUED = object()  # MULTI 이후 대기열에 쌓인 명령 응답
+_ABORTED = object()  # WATCH 한 키가 바뀌어 EXEC 가 취소된 경우 (null array)
+
+
+class _Store:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data: Dict[bytes, object] = {}
+        self.expires: Dict[bytes, float] = {}
+        self.versions: Dict[bytes, int] = {}  # WATCH 충돌 감지용 키별 변경 횟수
+
+    def bump(self, *keys: bytes) -> None:
+        for key in keys:
+            self.versions[key] = self.versions.get(key, 0) + 1
+
+    def get(self, key: bytes) -> Optional[object]:
+        expire_at = self.expires.get(key)
+        if expire_at is not None and expire_at <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    store: _Store
+    wbufsize = 64 * 1024  # 응답을 모아서 flush 시점에 한 번에 전송
+    disable_nagle_algorithm = True
+
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _write(self, value) -> None:
+        if value is _ABORTED:
+            self.wfile.write(b"*-1\r\n")
+        elif value is _QUEUED:
+            self.wfile.write(b"+QUEUED\r\n")
+        elif value is None:
+            self.wfile.write(b"$-1\r\n")
+        elif isinstance(value, bool):
+            self.wfile.write(b"+OK\r\n")
+        elif isinstance(value, int):
+            self.wfile.write(b":%d\r\n" % value)
+        elif isinstance(value, bytes):
+            self.wfile.write(b"$%d\r\n%s\r\n" % (len(value), value))
+        elif isinstance(value, list):
+            self.wfile.write(b"*%d\r\n" % len(value))
+            for item in value:
+                self._write(item)
+        elif isinstance(value, Exception):
+            self.wfile.write(b"-ERR %s\r\n" % str(value).encode())
+
+    def handle(self) -> None:
+        self.watched: Dict[bytes, int] = {}
+        self.queued: Optional[List[List[bytes]]] = None
+        while True:
+            args = self._read_command()
+            if not args:
+                return
+            try:
+                self._write(self._dispatch(args[0].upper(), args[1:]))
+            except Exception as e:
+                self._write(e)
+            self.wfile.flush()
+
+    def _dispatch(self, command: bytes, args: List[bytes]):
+        store = self.store
+        if command == b"WATCH":
+            with store.lock:
+                for key in args:
+                    self.watched[key] = store.versions.get(key, 0)
+            return True
+        if command == b"UNWATCH":
+            self.watched.clear()
+            return True
+        if command == b"MULTI":
+            self.queued = []
+            return True
+        if command == b"DISCARD":
+            self.queued = None
+            self.watched.clear()
+            return True
+        if command == b"EXEC":
+            queued, self.queued = self.queued or [], None
+            watched, self.watched = self.watched, {}
+            with store.lock:
+                if any(store.versions.get(key, 0) != version for key, version in watched.items()):
+                    return _ABORTED
+                results = []
+                for cmd in queued:
+                    try:
+                        results.append(self._execute(cmd[0], cmd[1:]))
+                    except Exception as e:
+                        results.append(e)
+                return results
+        if self.queued is not None:
+            self.queued.append([command, *args])
+            return _QUEUED
+        with store.lock:
+            return self._execute(command, args)
+
+    def _execute(self, command: bytes, args: List[bytes]):
+        """store.lock 을 잡은 상태에서 호출"""
+        store = self.store
+        if command == b"PING":
+            return b"PONG"
+        if command in (b"CLIENT", b"SELECT"):
+            return True
+        if command in (b"RPUSH", b"LTRIM", b"DEL", b"EXPIRE", b"SET"):
+            store.bump(*(args if command == b"DEL" else args[:1]))
+        if command == b"RPUSH":
+            items = store.get(args[0]) or []
+            items.extend(args[1:])
+            store.data[args[0]] = items
+            return len(items)
+        if command == b"LRANGE":
+            items = store.get(args[0]) or []
+            start, stop = int(args[1]), int(args[2])
+            stop = len(items) if stop == -1 else stop + 1
+            return items[start:stop]
+        if command == b"LTRIM":
+            items = store.get(args[0]) or []
+            start, stop = int(args[1]), int(args[2])
+            stop = len(items) if stop == -1 else stop + 1
+            store.data[args[0]] = items[start:stop]
+            return True
+        if command == b"LLEN":
+            return len(store.get(args[0]) or [])
+        if command == b"DEL":
+            removed = 0
+            for key in args:
+                if store.get(key) is not None:
+                    removed += 1
+                store.data.pop(key, None)
+                store.expires.pop(key, None)
+            return removed
+        if command == b"EXISTS":
+            return sum(1 for key in args if store.get(key) is not None)
+        if command == b"EXPIRE":
+            if store.get(args[0]) is None:
+                return 0
+            store.expires[args[0]] = time.time() + int(args[1])
+            return 1
+        if command == b"SET":
+            store.data[args[0]] = args[1]
+            store.expires.pop(args[0], None)
+            if len(args) >= 4 and args[2].upper() == b"EX":
+                store.expires[args[0]] = time.time() + int(args[3])
+            return True
+        if command == b"GET":
+            return store.get(args[0])
+        raise ValueError(f"unknown command '{command.decode()}'")
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        handler = type("Handler", (_Handler,), {"store": _Store()})
+        super().__init__((host, port), handler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> "RespServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 RESP 서버")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    server = RespServer(port=args.port)
+    print(f"listening on {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+로컬 의도 라우터 오프라인 평가 (정확도 vs 지연시간)
+
+레이블된 발화(JSONL: {"text", "route"} 또는 라우팅 로그)로 k-fold 교차검증을 수행해
+규칙만 / 분류기만 / 규칙+분류기 조합의 임계값별 결과를 출력합니다.
+
+- coverage: 로컬에서 결정한 비율 (나머지는 LLM 라우터로 위임)
+- accuracy: 로컬에서 결정한 발화 중 정답 비율
+- us/call: 결정 1회당 평균 시간 (마이크로초)
+- saved: LLM 라우팅 호출 1회 지연(--llm-latency) 기준 턴당 평균 절감 시간
+
+실행: python -m benchmarks.router_eval --data benchmarks/data/routing_samples.jsonl
+"""
+import argparse
+import os
+import random
+import time
+from typing import List, Optional, Tuple
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+from agents.router import LocalIntentRouter, NgramClassifier, RuleRouter, load_routing_samples
+
+DEFAULT_DATA = os.path.join(os.path.dirname(__file__), "data", "routing_samples.jsonl")
+
+
+def _evaluate(router, samples: List[Tuple[str, str]]) -> Tuple[int, int, float]:
+    decided = correct = 0
+    start = time.perf_counter()
+    for text, label in samples:
+        decision = router.route(text)
+        if decision is not None:
+            decided += 1
+            correct += decision.route == label
+    return decided, correct, time.perf_counter() - start
+
+
+class _ThresholdRouter:
+    def __init__(self, inner, threshold: float):
+        self.inner = inner
+        self.threshold = threshold
+
+    def route(self, text: str):
+        decision = self.inner.route(text)
+        return decision if decision is not None and decision.confidence >= self.threshold else None
+
+
+def run(paths: List[str], folds: int, thresholds: List[float], llm_latency: float, seed: int) -> None:
+    samples: List[Tuple[str, str]] = []
+    for path in paths:
+        texts, labels = load_routing_samples(path, sources=None)
+        samples += list(zip(texts, labels))
+    random.Random(seed).shuffle(samples)
+    print(f"{len(samples)} samples, {folds}-fold\n")
+    print(f"{'router':12s} {'threshold':>9s} {'coverage':>9s} {'accuracy':>9s} {'us/call':>8s} {'saved':>8s}")
+
+    rules = RuleRouter()
+    for name in ("rules", "classifier", "combined"):
+        for threshold in thresholds:
+            decided = correct = 0
+            elapsed = 0.0
+            for k in range(folds):
+                test = samples[k::folds]
+                train = [s for i, s in enumerate(samples) if i % folds != k]
+                classifier: Optional[NgramClassifier] = None
+                if name != "rules":
+                    classifier = NgramClassifier().fit([t for t, _ in train], [l for _, l in train])
+                if name == "rules":
+                    router = _ThresholdRouter(rules, threshold)
+                elif name == "classifier":
+                    router = _ThresholdRouter(classifier, threshold)
+                else:
+                    router = LocalIntentRouter(rules, classifier, threshold)
+                d, c, e = _evaluate(router, test)
+                decided += d
+                correct += c
+                elapsed += e
+            coverage = decided / len(samples)
+            accuracy = correct / decided if decided else 0.0
+            per_call_us = elapsed / len(samples) * 1e6
+            saved_ms = coverage * llm_latency * 1000
+            print(f"{name:12s} {threshold:9.2f} {coverage:9.1%} {accuracy:9.1%} {per_call_us:8.1f} {saved_ms:6.0f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", nargs="+", default=[DEFAULT_DATA])
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.6, 0.75, 0.85, 0.95])
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="LLM 라우팅 호출 1회 지연 (초)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.data, args.folds, args.thresholds, args.llm_latency, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+앱 import 시간 / 서비스 생성 시간 벤치마크
+
+별도 프로세스에서 `python -X importtime -c "import app.main"` 을 실행해 모듈별 누적 import 시간을 집계하고,
+이어서 각 서비스(chat/check/letter)의 최초 생성 시간을 측정합니다.
+--save 로 결과를 저장한 뒤 --compare 로 이전 결과와 비교하면 회귀를 확인할 수 있습니다.
+
+실행: python -m benchmarks.startup --top 15 --save startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SERVICE_TIMING_CODE = """
+import json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from app.services.chat_service import get_chat_service
+from app.services.check import get_check_service
+from app.services.letter_service import get_letter_service
+result = {"import_app_main_ms": (t1 - t0) * 1000}
+for name, getter in [("chat", get_chat_service), ("check", get_check_service), ("letter", get_letter_service)]:
+    start = time.perf_counter()
+    getter()
+    result[f"build_{name}_service_ms"] = (time.perf_counter() - start) * 1000
+print(json.dumps(result))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+        env.setdefault(key, "bench-dummy-key")
+    return env
+
+
+def import_times():
+    """-X importtime 출력을 {모듈: (self_us, cumulative_us)} 로 파싱"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, env=_env(), check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def service_times():
+    proc = subprocess.run(
+        [sys.executable, "-c", SERVICE_TIMING_CODE],
+        capture_output=True, text=True, env=_env(), check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="import/startup 시간 벤치마크")
+    parser.add_argument("--top", type=int, default=15, help="누적 import 시간 상위 N개 모듈 출력")
+    parser.add_argument("--save", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--compare", help="이전에 저장한 JSON 결과와 비교")
+    args = parser.parse_args()
+
+    modules = import_times()
+    timings = service_times()
+    total_ms = modules["app.main"][1] / 1000
+
+    print(f"import app.main (importtime cumulative): {total_ms:8.1f} ms")
+    for key, value in timings.items():
+        print(f"{key:<40}: {value:8.1f} ms")
+
+    print(f"\ntop {args.top} modules by cumulative import time:")
+    for name, (self_us, cumulative_us) in sorted(modules.items(), key=lambda x: -x[1][1])[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    heavy = [m for m in ("langgraph", "langchain_openai", "langchain_community", "langchain_teddynote") if m in modules]
+    print(f"\nheavy libraries imported by app.main: {', '.join(heavy) or 'none'}")
+
+    result = {"import_app_main_ms": total_ms, **{k: v for k, v in timings.items() if k != "import_app_main_ms"}}
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        print("\ncompared with", args.compare)
+        for key, value in result.items():
+            if key in previous:
+                print(f"  {key:<40}: {previous[key]:8.1f} -> {value:8.1f} ms ({value - previous[key]:+.1f})")
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+스트리밍 채팅의 첫 토큰 시간(TTFT) 벤치마크
+
+가짜 모델로 /api/v1/chat/stream 과 동일한 이벤트 스트림(ChatService.stream_chat)을 실행하고,
+이벤트의 elapsed_ms 값으로 라우팅/첫 토큰/완료 시점을 비교합니다.
+
+실행: python -m benchmarks.stream_ttft --delay 0.5 --token-delay 0.05
+"""
+import argparse
+import asyncio
+import os
+from functools import partial
+from unittest.mock import patch
+
+from benchmarks.fake_model import FakeChatModel
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+
+async def run(turns: int) -> None:
+    from app.dto.chat import ChatMessage
+    from app.services.chat_service import ChatService
+
+    service = ChatService()
+    for i in range(turns):
+        route_ms = None
+        done = {}
+        async for item in service.stream_chat(
+            messages=[ChatMessage(role="user", content="당근마켓에서 사기를 당했어요")],
+            session_id="bench-stream",
+        ):
+            if item["event"] == "route" and route_ms is None:
+                route_ms = item["data"]["elapsed_ms"]
+            elif item["event"] == "done":
+                done = item["data"]
+        print(f"turn {i}: route={route_ms} ms  ttft={done.get('ttft_ms')} ms  total={done.get('elapsed_ms')} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스트리밍 TTFT 벤치마크")
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--delay", type=float, default=0.5, help="가짜 모델 첫 토큰 지연시간(초)")
+    parser.add_argument("--token-delay", type=float, default=0.05, help="토큰 간 지연시간(초)")
+    args = parser.parse_args()
+
+    reply = " ".join(["사기 피해 대응 방법을 단계별로 안내해 드리겠습니다."] * 20)
+    fake = partial(FakeChatModel, delay=args.delay, token_delay=args.token_delay, reply=reply)
+    with patch("langchain_openai.ChatOpenAI", fake):
+        asyncio.run(run(args.turns))
+
+
+if __name__ == "__main__":
+    main()
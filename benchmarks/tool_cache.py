@@ -0,0 +1,72 @@
+"""
+도구 결과 캐시 확인
+
+같은 기관 연락처 검색을 여러 세션이 반복하는 상황을 가짜 도구로 재현합니다.
+- 메모리 계층: 두 번째 호출부터 도구를 실행하지 않음
+- 동시 호출: 같은 인자의 동시 호출은 도구를 한 번만 실행
+- 디스크 계층: 새 캐시 인스턴스(재시작)에서도 결과 재사용
+
+실행: python -m benchmarks.tool_cache --delay 0.3
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+QUERIES = ["경찰청 사이버수사국 182 연락처", "법률구조공단 132 전화번호", "ECMC 118 상담", "  경찰청 사이버수사국   182 연락처 "]
+
+
+async def run(delay: float) -> None:
+    from tools.cache import TOOL_CACHE_REQUESTS, ToolResultCache
+
+    calls = 0
+
+    async def search(query: str) -> dict:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(delay)
+        return {"query": query.strip(), "results": ["..."]}
+
+    path = os.path.join(tempfile.mkdtemp(), "tool_cache.db")
+    cache = ToolResultCache(sqlite_path=path)
+
+    start = time.perf_counter()
+    for query in QUERIES * 3:
+        await cache.get_or_call("tavily_search_results_json", {"query": query}, lambda q=query: search(q))
+    print(f"sequential: {len(QUERIES) * 3} lookups, {calls} tool calls, {time.perf_counter() - start:.2f}s")
+
+    calls = 0
+    cache.clear()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        cache.get_or_call("perplexity_qa_tool", {"query": "진정서 제출 절차"}, lambda: search("진정서 제출 절차"))
+        for _ in range(20)
+    ))
+    print(f"concurrent: 20 lookups, {calls} tool calls, {time.perf_counter() - start:.2f}s")
+
+    cache.set("tavily_search_results_json", {"query": QUERIES[0]}, {"cached": True})
+    cache.close()
+    restarted = ToolResultCache(sqlite_path=path)
+    value = restarted.get("tavily_search_results_json", {"query": QUERIES[0]})
+    print(f"after restart: {value}")
+    print(restarted.stats())
+
+    for result in ("memory_hit", "disk_hit", "coalesced", "miss"):
+        total = sum(TOOL_CACHE_REQUESTS.value(tool=tool, result=result)
+                    for tool in ("tavily_search_results_json", "perplexity_qa_tool"))
+        print(f"{result}: {int(total)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.3)
+    args = parser.parse_args()
+    asyncio.run(run(args.delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+한 턴의 도구 호출 동시 실행 확인
+
+지연시간이 고정된 가짜 도구 두 개(+실패/시간초과 도구)를 run_tool_calls 로 실행합니다.
+동시 실행이라면 소요시간은 지연의 합이 아니라 최댓값(또는 타임아웃)에 가깝고,
+실패한 호출은 턴을 중단시키지 않고 status="error" ToolMessage 로 돌아옵니다.
+
+실행: python -m benchmarks.tool_calls --delay 0.5
+"""
+import argparse
+import asyncio
+import os
+import time
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+
+async def run(delay: float) -> None:
+    from langchain_core.tools import tool
+
+    from agents.tool_executor import run_tool_calls
+    from app.config.settings import settings
+
+    @tool
+    async def search(query: str) -> dict:
+        """가짜 검색 도구"""
+        await asyncio.sleep(delay)
+        return {"query": query}
+
+    @tool
+    async def qa(query: str) -> dict:
+        """가짜 QA 도구"""
+        await asyncio.sleep(delay)
+        return {"content": query}
+
+    @tool
+    async def broken(query: str) -> dict:
+        """항상 실패하는 도구"""
+        raise RuntimeError("boom")
+
+    @tool
+    async def slow(query: str) -> dict:
+        """타임아웃을 넘기는 도구"""
+        await asyncio.sleep(delay * 10)
+        return {}
+
+    settings.TOOL_TIMEOUTS = {**settings.TOOL_TIMEOUTS, "slow": delay * 2}
+    tools_by_name = {t.name: t for t in (search, qa, broken, slow)}
+    calls = [{"name": name, "args": {"query": "q"}, "id": f"call_{i}"} for i, name in enumerate(tools_by_name)]
+
+    start = time.perf_counter()
+    outputs = await run_tool_calls("bench_agent", calls, tools_by_name)
+    elapsed = time.perf_counter() - start
+
+    for message in outputs:
+        print(f"{message.name:8s} status={message.status:7s} {message.content}")
+    print(f"elapsed={elapsed:.2f}s  (sequential would be >= {delay * 4:.2f}s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(run(args.delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+프롬프트 메시지 중복 검사 + 절감 토큰 보고
+
+가짜 모델이 받은 모든 프롬프트(라우팅, CHAT 답변, 하위 에이전트)를 기록하면서 라우트별로 여러 턴 대화를 진행합니다.
+- 검사: 한 프롬프트 안에 같은 대화 메시지가 두 번 이상 들어가면 실패 (종료 코드 1)
+- 보고: 이전 방식(기록과 새 메시지를 messages/chat_history 양쪽에 모두 전달)과의 프롬프트 토큰 합계 비교
+
+문맥 관리자 요약에 가려지지 않도록 토큰 예산은 충분히 크게 설정합니다.
+
+실행: python -m benchmarks.transcript_dedupe --turns 10
+"""
+import argparse
+import asyncio
+import os
+import sys
+from collections import Counter
+from functools import partial
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from langchain_core.runnables import RunnableLambda
+
+from benchmarks.fake_model import FakeChatModel
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+ROUTES = ("COLLECTIONAGENT", "POLIAGENT", "CHAT")
+
+
+class RecordingChatModel(FakeChatModel):
+    """받은 프롬프트(메시지 목록)를 모두 기록하는 가짜 모델"""
+
+    prompts: List[list] = []
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        RecordingChatModel.prompts.append(list(messages))
+        result = await super()._agenerate(messages, stop, run_manager, **kwargs)
+        # 턴마다 다른 답변이 되도록 번호를 붙임 (내용 기준 중복 검사용)
+        result.generations[0].message.content += f" #{len(RecordingChatModel.prompts)}"
+        return result
+
+    def with_structured_output(self, schema: Any, **kwargs: Any):
+        inner = super().with_structured_output(schema, **kwargs)
+
+        async def _record(prompt: Any) -> Any:
+            RecordingChatModel.prompts.append(prompt.to_messages())
+            return await inner.ainvoke(prompt)
+
+        return RunnableLambda(lambda prompt: inner.invoke(prompt), afunc=_record)
+
+
+def _legacy_build_input(self, history, messages, session_state=None) -> Dict[str, Any]:
+    """이전 방식: 전체 대화를 messages 와 chat_history 에 모두 전달"""
+    from state.transcript import to_langchain_messages
+
+    langchain_messages = to_langchain_messages(list(history) + list(messages))
+    return {
+        "messages": langchain_messages,
+        "chat_history": langchain_messages,
+        "next": "supervisor",
+        "active_agent": None,
+        "sticky_turns": 0,
+    }
+
+
+def _duplicates(prompt: list) -> List[str]:
+    # 시스템 프롬프트는 제외하고 대화 메시지(사용자/응답)만 검사 - 각 턴의 내용은 모두 다르게 생성됨
+    counts = Counter((m.type, m.content) for m in prompt if m.type in ("human", "ai"))
+    return [content for (_, content), n in counts.items() if n > 1]
+
+
+async def run_route(route: str, turns: int) -> None:
+    from app.dto.chat import ChatMessage
+    from app.services.chat_service import ChatService
+
+    service = ChatService()
+    for i in range(turns):
+        await service.process_chat(
+            messages=[ChatMessage(role="user", content=f"[{route}] {i + 1}번째 질문입니다")],
+            session_id=f"bench-dedupe-{route}",
+        )
+
+
+def run(turns: int, legacy: bool) -> Dict[str, Any]:
+    from app.config.settings import settings
+    from app.services.chat_history import chat_history
+    from app.services.chat_service import ChatService
+    from utils.context_window import get_context_manager, messages_tokens
+
+    settings.CONTEXT_BUDGETS = {agent: 10 ** 9 for agent in settings.CONTEXT_BUDGETS}
+    get_context_manager.cache_clear()
+
+    tokens: Dict[str, int] = {}
+    duplicated = 0
+    with patch.object(ChatService, "_build_input", _legacy_build_input if legacy else ChatService._build_input):
+        for route in ROUTES:
+            chat_history.clear_history(f"bench-dedupe-{route}")
+            RecordingChatModel.prompts = []
+            with patch("langchain_openai.ChatOpenAI", partial(RecordingChatModel, delay=0, route=route)):
+                asyncio.run(run_route(route, turns))
+            tokens[route] = sum(messages_tokens(p) for p in RecordingChatModel.prompts)
+            for prompt in RecordingChatModel.prompts:
+                if _duplicates(prompt):
+                    duplicated += 1
+    return {"tokens": tokens, "duplicated_prompts": duplicated}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=10)
+    args = parser.parse_args()
+
+    from app.config.settings import settings
+
+    settings.LOCAL_ROUTER_ENABLED = False
+    settings.STICKY_ROUTING_ENABLED = False
+    # CHAT 답변도 별도 호출로 생성해 CHAT 프롬프트까지 검사
+    settings.SUPERVISOR_INLINE_CHAT_REPLY = False
+
+    legacy = run(args.turns, legacy=True)
+    current = run(args.turns, legacy=False)
+
+    print(f"{args.turns} turns per route, prompt tokens summed over all LLM calls")
+    print(f"{'route':16s} {'legacy':>8s} {'current':>8s} {'saved':>7s}")
+    for route in ROUTES:
+        before, after = legacy["tokens"][route], current["tokens"][route]
+        print(f"{route:16s} {before:8d} {after:8d} {1 - after / before:7.1%}")
+    print(f"prompts with duplicated messages: legacy={legacy['duplicated_prompts']} current={current['duplicated_prompts']}")
+    if current["duplicated_prompts"]:
+        print("FAIL: duplicated messages found in outgoing prompts")
+        sys.exit(1)
+    print("OK: no message is sent twice in any prompt")
+
+
+if __name__ == "__main__":
+    main()
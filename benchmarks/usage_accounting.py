@@ -0,0 +1,109 @@
+"""
+요청별 LLM 토큰/비용 집계 확인
+
+가짜 모델(토큰 사용량 근사치 보고)로 실제 FastAPI 앱에 채팅/스트리밍 채팅/완성도 확인/진정서 요청을 보내고,
+X-LLM-Usage 헤더, 스트림 done 이벤트의 usage, /api/v1/stats/usage 누적값, 구성 요소별 메트릭을 출력합니다.
+요청 헤더의 호출 수와 엔드포인트 누적값이 맞지 않으면 종료 코드 1로 끝납니다.
+(가짜 모델의 structured output 라우팅은 모델 콜백을 거치지 않으므로 슈퍼바이저 라우팅 호출은 집계되지 않습니다)
+
+실행: python -m benchmarks.usage_accounting
+"""
+import json
+import os
+import sys
+from functools import partial
+from unittest.mock import patch
+
+from benchmarks.fake_model import FakeChatModel
+
+for key in ("OPENAI_API_KEY", "TAVILY_API_KEY", "PPLX_API_KEY"):
+    os.environ.setdefault(key, "bench-dummy-key")
+
+CHECK_REPLY = '{"fulfilled": false, "percentage": 35.0}'
+
+
+def _parse_header(value: str) -> dict:
+    return {k.strip(): float(v) for k, v in (part.split("=") for part in value.split(";"))}
+
+
+def main() -> None:
+    from fastapi.testclient import TestClient
+
+    from app.config.settings import settings
+
+    settings.USAGE_RESPONSE_HEADER = True
+    settings.LOCAL_ROUTER_ENABLED = False
+    settings.STICKY_ROUTING_ENABLED = False
+    settings.WARMUP_ON_STARTUP = False
+
+    from app.main import app
+    from utils.metrics import registry
+
+    failures = []
+    calls_by_endpoint = {}
+    with patch("langchain_openai.ChatOpenAI", partial(FakeChatModel, delay=0, token_delay=0, route="POLIAGENT")), \
+            TestClient(app) as client:
+        session_id = "bench-usage"
+        for i in range(3):
+            response = client.post("/api/v1/chat", json={
+                "messages": [{"role": "user", "content": f"{i + 1}번째 질문: 중고거래로 50만원을 보냈는데 연락이 끊겼어요"}],
+                "session_id": session_id,
+            })
+            usage = _parse_header(response.headers["X-LLM-Usage"])
+            calls_by_endpoint["/api/v1/chat"] = calls_by_endpoint.get("/api/v1/chat", 0) + usage["calls"]
+            print(f"POST /api/v1/chat turn {i + 1}: {response.headers['X-LLM-Usage']}")
+
+        with client.stream("POST", "/api/v1/chat/stream", json={
+            "messages": [{"role": "user", "content": "추가로 알려드릴게요"}], "session_id": session_id,
+        }) as response:
+            done = None
+            event = None
+            for line in response.iter_lines():
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: ") and event == "done":
+                    done = json.loads(line[len("data: "):])
+        stream_usage = (done or {}).get("usage")
+        print(f"POST /api/v1/chat/stream done.usage: {json.dumps(stream_usage, ensure_ascii=False)}")
+        if not stream_usage:
+            failures.append("stream done event has no usage")
+        else:
+            calls_by_endpoint["/api/v1/chat/stream"] = stream_usage["calls"]
+
+        with patch("langchain_openai.ChatOpenAI", partial(FakeChatModel, delay=0, reply=CHECK_REPLY)):
+            from app.services.check import get_check_service
+            from app.services.letter_service import get_letter_service
+
+            get_check_service.cache_clear()
+            get_letter_service.cache_clear()
+            response = client.post("/api/v1/check-completion", json={"chat_history": "사용자: 중고거래 사기를 당했어요"},
+                                   headers={"X-Session-Id": session_id})
+            calls_by_endpoint["/api/v1/check-completion"] = _parse_header(response.headers["X-LLM-Usage"])["calls"]
+            print(f"POST /api/v1/check-completion: {response.headers['X-LLM-Usage']}")
+            response = client.post("/api/v1/letter/generate", json={"chat_content": "사용자: 중고거래 사기를 당했어요"})
+            calls_by_endpoint["/api/v1/letter/generate"] = _parse_header(response.headers["X-LLM-Usage"])["calls"]
+            print(f"POST /api/v1/letter/generate: {response.headers['X-LLM-Usage']}")
+
+        stats = client.get("/api/v1/stats/usage").json()
+        session = client.get(f"/api/v1/stats/usage/{session_id}").json()
+        metrics = client.get("/metrics").text
+
+    print("\n/api/v1/stats/usage endpoints:")
+    for endpoint, total in stats["endpoints"].items():
+        print(f"  {endpoint:28s} {total}")
+        if total["calls"] != calls_by_endpoint.get(endpoint):
+            failures.append(f"{endpoint}: tracker calls={total['calls']} headers={calls_by_endpoint.get(endpoint)}")
+    print(f"session {session_id}: {session}")
+    print("\nper-component metrics:")
+    for line in metrics.splitlines():
+        if line.startswith(("poli_llm_request_tokens_total{", "poli_llm_cost_usd_total{")):
+            print(f"  {line}")
+
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK: per-request usage matches endpoint totals")
+
+
+if __name__ == "__main__":
+    main()
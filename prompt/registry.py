@@ -0,0 +1,213 @@
+"""
+프롬프트 레지스트리
+
+모든 프롬프트 템플릿을 시작 시 한 번만 생성하고(출력 형식 지시문 포함), 내용 해시로 버전을 매깁니다.
+- 요청마다 ChatPromptTemplate 생성, 형식 지시문 렌더링, 큰 f-string 조합을 하지 않습니다.
+- 고정된 부분(시스템 지시문, 출력 형식)을 앞에 두고 대화/날짜 등 바뀌는 값은 뒤에 두어,
+  제공자의 프롬프트 접두사 캐시(OpenAI 는 1024 토큰 이상 동일 접두사)가 적용될 수 있게 합니다.
+- 버전은 프롬프트가 바뀌었을 때 이전 결과 캐시를 무효화하는 키와 /api/v1/stats/prompts 에 사용합니다.
+"""
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List
+
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.prompts.chat import BaseMessagePromptTemplate
+
+from prompt import system
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    name: str
+    template: ChatPromptTemplate
+    version: str  # 메시지 구성과 고정 변수 값의 sha256 앞 12자리
+    static_prefix_tokens: int  # 첫 변수 이전까지의 고정 접두사 토큰 수 (접두사 캐시 적용 가능 여부 확인용)
+    static_tokens: int  # 변수를 제외한 고정 메시지 전체 토큰 수 (대화 문맥 예산에서 미리 차감)
+
+
+def _message_parts(template: ChatPromptTemplate) -> List[tuple]:
+    """메시지별 (역할, 템플릿 문자열, 입력 변수) 목록 - 대화 자리표시자는 역할 없이 변수만"""
+    parts = []
+    for message in template.messages:
+        if isinstance(message, MessagesPlaceholder):
+            parts.append(("placeholder", "", [message.variable_name]))
+        elif isinstance(message, BaseMessage):
+            parts.append((message.type, str(message.content), []))
+        elif isinstance(message, BaseMessagePromptTemplate):
+            prompt = message.prompt
+            parts.append((type(message).__name__, prompt.template, list(prompt.input_variables)))
+    return parts
+
+
+def _version(template: ChatPromptTemplate) -> str:
+    digest = hashlib.sha256()
+    for role, text, variables in _message_parts(template):
+        digest.update(f"{role}\0{text}\0{','.join(variables)}\0".encode("utf-8"))
+    for key, value in sorted(template.partial_variables.items()):
+        digest.update(f"{key}\0{value}\0".encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def _static_prefix_tokens(template: ChatPromptTemplate) -> int:
+    from utils.context_window import count_tokens
+
+    partials = template.partial_variables
+    text = ""
+    for _, body, variables in _message_parts(template):
+        dynamic = [name for name in variables if name not in partials]
+        if not dynamic:
+            text += body.format(**partials) if variables else body
+            continue
+        # 첫 변수 앞까지만 고정 접두사
+        text += body.split("{" + dynamic[0] + "}", 1)[0] if body else ""
+        break
+    return count_tokens(text)
+
+
+def _static_tokens(template: ChatPromptTemplate) -> int:
+    """대화 자리표시자와 변수 값을 뺀 나머지(시스템 프롬프트, 지시문 등)의 토큰 수"""
+    from utils.context_window import MESSAGE_OVERHEAD_TOKENS, count_tokens
+
+    partials = template.partial_variables
+    tokens = 0
+    for role, body, variables in _message_parts(template):
+        if role == "placeholder":
+            continue
+        values = {name: partials.get(name, "") for name in variables}
+        tokens += MESSAGE_OVERHEAD_TOKENS + count_tokens(body.format(**values) if variables else body)
+    return tokens
+
+
+class PromptRegistry:
+    """이름별 프롬프트 생성 함수를 등록하고, 한 번만 생성해 재사용"""
+
+    def __init__(self):
+        self._builders: Dict[str, Callable[[], ChatPromptTemplate]] = {}
+        self._compiled: Dict[str, CompiledPrompt] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, builder: Callable[[], ChatPromptTemplate]) -> None:
+        self._builders[name] = builder
+
+    def get(self, name: str) -> CompiledPrompt:
+        compiled = self._compiled.get(name)
+        if compiled is None:
+            with self._lock:
+                compiled = self._compiled.get(name)
+                if compiled is None:
+                    template = self._builders[name]()
+                    compiled = CompiledPrompt(name, template, _version(template), _static_prefix_tokens(template),
+                                              _static_tokens(template))
+                    self._compiled[name] = compiled
+        return compiled
+
+    def compile_all(self) -> Dict[str, str]:
+        """등록된 모든 프롬프트를 생성하고 {이름: 버전} 반환"""
+        return {name: self.get(name).version for name in self._builders}
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        return {
+            name: {"version": prompt.version, "static_prefix_tokens": prompt.static_prefix_tokens,
+                   "static_tokens": prompt.static_tokens}
+            for name, prompt in sorted(self._compiled.items())
+        }
+
+
+def _system(text: str) -> ChatPromptTemplate:
+    """변수 없는 시스템 프롬프트 (중괄호가 있어도 그대로 전달)"""
+    return ChatPromptTemplate.from_messages([SystemMessage(content=text)])
+
+
+def _supervisor_route(inline_reply: bool) -> Callable[[], ChatPromptTemplate]:
+    def build() -> ChatPromptTemplate:
+        messages = [
+            ("system", system.supervisor_system_prompt),
+            MessagesPlaceholder(variable_name="chat_history"),
+            MessagesPlaceholder(variable_name="messages"),
+            ("system", system.supervisor_route_instruction),
+        ]
+        if inline_reply:
+            messages.append(("system", system.supervisor_inline_reply_instruction))
+        return ChatPromptTemplate.from_messages(messages)
+    return build
+
+
+def _chat() -> ChatPromptTemplate:
+    return ChatPromptTemplate.from_messages([
+        ("system", system.chat_system_prompt),
+        MessagesPlaceholder(variable_name="chat_history"),
+        MessagesPlaceholder(variable_name="messages"),
+    ])
+
+
+def _check() -> ChatPromptTemplate:
+    # 출력 스키마는 구조화 출력(json_schema/function_calling)으로 전달하므로 형식 지시문 없음
+    return ChatPromptTemplate.from_messages([
+        ("system", system.check_system_prompt),
+        ("human", "지금까지 파악된 정보:\n{slots}\n\n새로 추가된 대화 내용:\n\n{chat_history}"),
+    ])
+
+
+def _letter() -> ChatPromptTemplate:
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=system.letter_system_prompt),
+        ("human", "작성일: {date}\n\n다음 대화 내용을 바탕으로 진정서를 작성해주세요:\n\n{chat_content}"),
+    ])
+
+
+def _letter_narrative() -> ChatPromptTemplate:
+    from langchain_core.output_parsers import JsonOutputParser
+    from app.dto.letter import LetterNarrative
+
+    return ChatPromptTemplate.from_messages([
+        ("system", system.letter_narrative_system_prompt),
+        ("human", "사건 정보:\n{slots}"),
+    ]).partial(format_instructions=JsonOutputParser(pydantic_object=LetterNarrative).get_format_instructions())
+
+
+def _tool(text: str, parser_name: str) -> Callable[[], ChatPromptTemplate]:
+    def build() -> ChatPromptTemplate:
+        from tools import output_parser
+
+        parser = getattr(output_parser, parser_name)
+        return ChatPromptTemplate.from_messages([
+            ("system", text),
+            ("human", "사용자 메시지: {message}"),
+        ]).partial(format_instructions=parser.get_format_instructions())
+    return build
+
+
+@lru_cache(maxsize=None)
+def get_prompt_registry() -> PromptRegistry:
+    registry = PromptRegistry()
+    registry.register("supervisor.route", _supervisor_route(inline_reply=False))
+    registry.register("supervisor.route_with_reply", _supervisor_route(inline_reply=True))
+    registry.register("supervisor.chat", _chat)
+    registry.register("poliagent.system", lambda: _system(system.poli_agent_system_prompt))
+    registry.register("collectionagent.system", lambda: _system(system.collection_agent_system_prompt))
+    registry.register("check.extract", _check)
+    registry.register("letter.full", _letter)
+    registry.register("letter.narrative", _letter_narrative)
+    registry.register("tool.detail", _tool(system.detail_tool_prompt, "detail_parser"))
+    registry.register("tool.emotion", _tool(system.emotion_tool_prompt, "emotion_parser"))
+    registry.register("tool.solution", _tool(system.solution_tool_prompt, "solution_parser"))
+    registry.register("tool.analysis", _tool(system.analysis_tool_prompt, "analysis_parser"))
+    return registry
+
+
+def get_prompt(name: str) -> CompiledPrompt:
+    return get_prompt_registry().get(name)
+
+
+def compile_prompts() -> Dict[str, str]:
+    """시작 시 모든 프롬프트를 생성하고 버전을 로그로 남김"""
+    versions = get_prompt_registry().compile_all()
+    logging.getLogger("startup").info(
+        "Prompts compiled: " + ", ".join(f"{name}={version}" for name, version in versions.items())
+    )
+    return versions
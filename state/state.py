@@ -4,17 +4,14 @@ from typing import TypedDict, Annotated, Union, Sequence
 from langchain_core.agents import AgentAction, AgentFinish
 from langchain.agents.output_parsers.tools import ToolAgentAction
 from langchain_core.messages import BaseMessage
+from state.transcript import TranscriptState
 import operator
 
-class AgentState(TypedDict):
-    # 최종 LLM에 전달할(또는 참조할) 전체 메시지
-    messages: list[BaseMessage]
+class AgentState(TranscriptState):
+    # messages: 현재 턴에서 추가된 메시지만, chat_history: 이전 턴까지의 대화 (TranscriptState 참고)
 
     # 사용자로부터의 입력 문자열
     input: str
-
-    # 과거 대화 기록 (폴리/레터 내부적으로 사용할 수 있음)
-    chat_history: list[BaseMessage]
     
     # 에이전트 실행 결과 (도구 액션, 최종 출력 등)
     agent_outcome: Union[AgentAction, list, ToolAgentAction, AgentFinish, None]
@@ -0,0 +1,29 @@
+from typing import Annotated, Iterable, List, Sequence, TypedDict
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langgraph.graph.message import add_messages
+
+
+class TranscriptState(TypedDict):
+    """
+    모든 에이전트 상태가 공유하는 대화 모델
+
+    - chat_history: 이전 턴까지의 대화 (읽기 전용)
+    - messages: 현재 턴에서 추가된 메시지만 (사용자 입력, 도구 호출/결과, 응답)
+
+    프롬프트는 chat_history + messages 로 구성하므로 같은 메시지가 두 번 전송되지 않습니다.
+    """
+    messages: Annotated[Sequence[BaseMessage], add_messages]
+    chat_history: Sequence[BaseMessage]
+
+
+_MESSAGE_TYPES = {"user": HumanMessage, "assistant": AIMessage, "system": SystemMessage}
+
+
+def to_langchain_message(role: str, content: str) -> BaseMessage:
+    """API 메시지(role/content)를 LangChain 메시지로 변환"""
+    return _MESSAGE_TYPES.get(role.lower(), AIMessage)(content=content)
+
+
+def to_langchain_messages(messages: Iterable) -> List[BaseMessage]:
+    return [to_langchain_message(m.role, m.content) for m in messages]
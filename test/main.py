@@ -1,4 +1,9 @@
 import asyncio
+import os
+
+# 로그는 저장소 안(log/)이 아닌 콘솔로만 출력
+os.environ.setdefault("LOG_DIR", "")
+
 from agents.supervisior import create_supervisor_agent
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from utils.logging_utils import log_agent_routing, log_tool_usage
@@ -0,0 +1,114 @@
+# 설명: 상세 정보, 감정 상태, 해결방안 분석을 하나로 묶은 도구 (Detail/Emotion/Solution 통합)
+from langchain_core.tools import BaseTool
+from typing import Type, Optional, Dict, Any, List
+from pydantic import BaseModel, Field, PrivateAttr
+from langchain_core.runnables import Runnable
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
+from app.config.settings import settings
+from prompt.registry import get_prompt
+from tools.cache import get_tool_cache
+from tools.output_parser import analysis_parser
+from utils.llm import get_site_model
+from utils.usage import usage_component
+import asyncio
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SECTIONS = ("detail", "emotion", "solution")
+
+
+class AnalysisInput(BaseModel):
+    message: str = Field(description="사용자의 입력 메시지")
+
+
+class _PartialResult(Exception):
+    """일부 분석이 실패한 결과 - 캐시에 저장하지 않고 그대로 반환"""
+
+    def __init__(self, result: Dict[str, Any]):
+        super().__init__("일부 분석 실패")
+        self.result = result
+
+
+def _as_dict(value: Any) -> Any:
+    return value.model_dump() if isinstance(value, BaseModel) else value
+
+
+class Analysis(BaseTool):
+    """
+    한 메시지에 대한 상세 정보(detail), 감정 상태(emotion), 해결방안(solution) 분석
+
+    - fused=True (ANALYSIS_FUSED): 세 스키마를 합친 FusedAnalysis 를 한 번의 LLM 호출로 생성
+      (입력 토큰 1회, 왕복 1회)
+    - fused=False: 기존 Detail/Emotion/Solution 도구를 동시에 호출
+    결과는 {"detail": ..., "emotion": ..., "solution": ...} 형태이며, 같은 메시지는 도구 결과 캐시에서 재사용합니다.
+    """
+    name: str = "analysis_tool"
+    description: str = "사용자 메시지에서 사기 피해 상세 정보, 감정 상태, 해결방안을 한 번에 분석하는 도구입니다."
+    args_schema: Type[BaseModel] = AnalysisInput
+    return_direct: bool = False
+    llm: Runnable = Field(
+        default_factory=lambda: get_site_model("tools", temperature=0)
+    )
+    fused: bool = Field(default_factory=lambda: settings.ANALYSIS_FUSED)
+    _chain: Any = PrivateAttr(default=None)
+    _tools: List[BaseTool] = PrivateAttr(default_factory=list)
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        if self.fused:
+            self._chain = get_prompt("tool.analysis").template | self.llm | analysis_parser
+        else:
+            from tools.detail import Detail
+            from tools.emotion import Emotion
+            from tools.solution import Solution
+
+            self._tools = [Detail(), Emotion(), Solution()]
+
+    def _cache_args(self, message: str) -> Dict[str, Any]:
+        # 프롬프트가 바뀌면 이전 결과를 쓰지 않도록 버전 포함
+        names = ["tool.analysis"] if self.fused else [f"tool.{section}" for section in SECTIONS]
+        return {
+            "message": message,
+            "mode": "fused" if self.fused else "parallel",
+            "version": [get_prompt(name).version for name in names],
+        }
+
+    async def _analyze(self, message: str) -> Dict[str, Any]:
+        if self.fused:
+            with usage_component(f"tool.{self.name}"):
+                return _as_dict(await self._chain.ainvoke({"message": message}))
+
+        results = await asyncio.gather(*(tool._arun(message) for tool in self._tools))
+        result = {section: _as_dict(value) for section, value in zip(SECTIONS, results)}
+        if any(isinstance(value, dict) and "error" in value for value in result.values()):
+            raise _PartialResult(result)
+        return result
+
+    def _run(
+        self,
+        message: str,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> Dict[str, Any]:
+        """동기 실행을 위한 메서드"""
+        return asyncio.run(self._arun(message, run_manager))
+
+    async def _arun(
+        self,
+        message: str,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> Dict[str, Any]:
+        """비동기 실행을 위한 메서드"""
+        try:
+            if not settings.TOOL_CACHE_ENABLED:
+                return await self._analyze(message)
+            return await get_tool_cache().get_or_call(
+                self.name, self._cache_args(message), lambda: self._analyze(message)
+            )
+        except _PartialResult as e:
+            return e.result
+        except Exception as e:
+            return {"error": f"통합 분석 중 오류 발생: {str(e)}"}
@@ -0,0 +1,264 @@
+"""
+도구 결과 캐시 (Tavily / Perplexity 검색 결과 재사용)
+
+- 키: 정규화된 도구 이름 + 정규화된 인자(공백/대소문자 정리, 키 정렬 JSON)의 해시
+- 1차: 메모리 LRU (TTL, 항목 수 상한)
+- 2차: 선택적 SQLite 파일 (재시작 후에도 유지, 여러 워커가 공유)
+- 같은 키에 대한 동시 호출은 하나의 실제 호출만 수행 (single-flight)
+- 비동기 경로(get_or_call)의 SQLite 조회/저장은 이벤트 루프를 막지 않도록 스레드에서 실행
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config.settings import settings
+from utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+TOOL_CACHE_REQUESTS = registry.counter(
+    "poli_tool_cache_requests_total", "도구 결과 캐시 조회 수 (result: memory_hit/disk_hit/coalesced/miss)", ("tool", "result"))
+
+_MISS = object()
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split()).lower()
+    if isinstance(value, dict):
+        return {str(k).strip().lower(): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_cache_key(tool_name: str, args: Dict[str, Any]) -> str:
+    """도구 이름과 인자로 캐시 키 생성 (인자 순서/공백/대소문자 차이는 같은 키)"""
+    canonical = json.dumps(_normalize(args), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(f"{tool_name.strip().lower()}\x00{canonical}".encode("utf-8")).hexdigest()
+    return digest
+
+
+class _SQLiteTier:
+    """만료 시각과 함께 JSON 으로 결과를 저장하는 디스크 계층"""
+
+    def __init__(self, path: str, max_entries: int):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tool_cache ("
+            " key TEXT PRIMARY KEY,"
+            " tool TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tool_cache_expires ON tool_cache (expires_at)")
+
+    def get(self, key: str) -> Tuple[Any, float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM tool_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        if row is None:
+            return _MISS, 0.0
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, tool_name: str, value: Any, expires_at: float) -> None:
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO tool_cache (key, tool, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, tool_name, payload, expires_at),
+                )
+                # 만료 항목과 상한 초과 항목(만료가 가장 이른 것부터) 제거
+                self._conn.execute("DELETE FROM tool_cache WHERE expires_at <= ?", (time.time(),))
+                self._conn.execute(
+                    "DELETE FROM tool_cache WHERE key IN ("
+                    " SELECT key FROM tool_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tool_cache").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM tool_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ToolResultCache:
+    """메모리 LRU + 선택적 SQLite 2계층 도구 결과 캐시"""
+
+    def __init__(
+        self,
+        ttl_seconds: int = None,
+        max_entries: int = None,
+        sqlite_path: Optional[str] = None,
+        disk_max_entries: int = None,
+        ttls: Optional[Dict[str, int]] = None,
+    ):
+        self.ttl_seconds = ttl_seconds or settings.TOOL_CACHE_TTL_SECONDS
+        self.max_entries = max_entries or settings.TOOL_CACHE_MAX_ENTRIES
+        self.ttls = settings.TOOL_CACHE_TTLS if ttls is None else ttls
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # key -> (만료 시각, 결과)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._disk = _SQLiteTier(sqlite_path, disk_max_entries or settings.TOOL_CACHE_DISK_MAX_ENTRIES) if sqlite_path else None
+
+    def _ttl(self, tool_name: str) -> int:
+        return self.ttls.get(tool_name, self.ttl_seconds)
+
+    def _memory_set(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _memory_get(self, key: str) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+        return _MISS
+
+    def _disk_get(self, key: str) -> Any:
+        """디스크 계층 조회 (적중하면 메모리 계층에도 저장)"""
+        try:
+            value, expires_at = self._disk.get(key)
+        except sqlite3.Error:
+            logger.warning("도구 캐시 디스크 조회 실패", exc_info=True)
+            return _MISS
+        if value is not _MISS:
+            self._memory_set(key, value, expires_at)
+        return value
+
+    def _disk_set(self, key: str, tool_name: str, value: Any, expires_at: float) -> None:
+        try:
+            self._disk.set(key, tool_name, value, expires_at)
+        except (sqlite3.Error, TypeError, ValueError):
+            logger.warning("도구 캐시 디스크 저장 실패", exc_info=True)
+
+    def _lookup(self, key: str) -> Tuple[Any, str]:
+        """(결과 또는 _MISS, 적중 계층) 반환"""
+        value = self._memory_get(key)
+        if value is not _MISS:
+            return value, "memory_hit"
+        if self._disk is not None:
+            value = self._disk_get(key)
+            if value is not _MISS:
+                return value, "disk_hit"
+        return _MISS, "miss"
+
+    def get(self, tool_name: str, args: Dict[str, Any]) -> Any:
+        """캐시된 결과 반환, 없으면 _MISS (메트릭 기록 포함)"""
+        value, result = self._lookup(make_cache_key(tool_name, args))
+        TOOL_CACHE_REQUESTS.inc(tool=tool_name, result=result)
+        return value
+
+    def set(self, tool_name: str, args: Dict[str, Any], value: Any) -> None:
+        key = make_cache_key(tool_name, args)
+        expires_at = time.time() + self._ttl(tool_name)
+        self._memory_set(key, value, expires_at)
+        if self._disk is not None:
+            self._disk_set(key, tool_name, value, expires_at)
+
+    async def get_or_call(self, tool_name: str, args: Dict[str, Any], call: Callable[[], Awaitable[Any]]) -> Any:
+        """캐시에 있으면 반환하고, 없으면 call() 결과를 저장 후 반환 (같은 키의 동시 호출은 한 번만 실행)"""
+        key = make_cache_key(tool_name, args)
+        cached = self._memory_get(key)
+        if cached is not _MISS:
+            TOOL_CACHE_REQUESTS.inc(tool=tool_name, result="memory_hit")
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            TOOL_CACHE_REQUESTS.inc(tool=tool_name, result="coalesced")
+            return await asyncio.shield(pending)
+
+        # 디스크 조회 중에 들어온 같은 키의 호출도 이 future 를 기다림
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await asyncio.to_thread(self._disk_get, key) if self._disk is not None else _MISS
+            if value is not _MISS:
+                TOOL_CACHE_REQUESTS.inc(tool=tool_name, result="disk_hit")
+                future.set_result(value)
+                return value
+
+            TOOL_CACHE_REQUESTS.inc(tool=tool_name, result="miss")
+            value = await call()
+            expires_at = time.time() + self._ttl(tool_name)
+            self._memory_set(key, value, expires_at)
+            future.set_result(value)
+            if self._disk is not None:
+                await asyncio.to_thread(self._disk_set, key, tool_name, value, expires_at)
+            return value
+        except BaseException as e:
+            if future.done():
+                raise
+            if isinstance(e, asyncio.CancelledError):
+                # 먼저 호출한 쪽이 취소(타임아웃)되어도 대기 중인 호출은 일반 오류로 처리
+                e = RuntimeError("동일한 도구 호출이 취소되었습니다")
+            future.set_exception(e)
+            # 대기자가 없을 때 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            memory_entries = len(self._memory)
+        stats: Dict[str, Any] = {
+            "memory_entries": memory_entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "disk_enabled": self._disk is not None,
+        }
+        if self._disk is not None:
+            stats["disk_entries"] = self._disk.count()
+        return stats
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+
+
+@lru_cache(maxsize=None)
+def get_tool_cache() -> ToolResultCache:
+    return ToolResultCache(sqlite_path=settings.TOOL_CACHE_SQLITE_PATH or None)
@@ -1,10 +1,12 @@
 # 설명: 사용자 메시지에서 상세 정보를 수집하고 분석하는 도구
 from langchain_core.tools import BaseTool
 from typing import Type, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from datetime import datetime
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+from utils.llm import get_site_model
+from utils.usage import usage_component
+from prompt.registry import get_prompt
 from langchain_core.callbacks import (
     AsyncCallbackManagerForToolRun,
     CallbackManagerForToolRun,
@@ -29,9 +31,15 @@ class Detail(BaseTool):
     description: str = "사용자 질문에서 정보를 추출하는 도구입니다."
     args_schema: Type[BaseModel] = DetailCollectorInput
     return_direct: bool = False
-    llm: ChatOpenAI = Field(
-        default_factory=lambda: ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    llm: Runnable = Field(
+        default_factory=lambda: get_site_model("tools", temperature=0)
     )
+    _chain: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        # 프롬프트 | 모델 | 파서 체인은 도구 생성 시 한 번만 구성 (프롬프트는 레지스트리에서 생성)
+        self._chain = get_prompt("tool.detail").template | self.llm | detail_parser
 
     def _run(
         self,
@@ -49,43 +57,11 @@ class Detail(BaseTool):
     ) -> Dict[str, Any]:
         """비동기 실행을 위한 메서드"""
         try:
-            # 통합된 상세 정보 및 상황 분석 프롬프트
-            detail_prompt = ChatPromptTemplate.from_template(
-                """사용자의 메시지를 바탕으로 사기 피해 사건의 상세 정보와 상황을 분석해주세요.
-
-                다음 항목들을 중점적으로 파악해주세요:
-                - 사건의 시간적 흐름과 발생 시점을 구체적으로 파악
-                - 보유하고 있는 증거자료(통화내역, 문자메시지, 계좌내역, 녹음파일 등) 목록화
-                - 지금까지 취한 대응 조치들을 시간순으로 정리
-                - 관련된 모든 당사자들(피해자, 가해자, 목격자, 기관 등)의 정보 수집
-                - 금전적 피해 내역을 항목별로 구체적으로 산출
-                - 법적 대응이나 피해 구제에 도움될 만한 추가 정보들을 수집
-                - 사기 수법의 유형과 특징
-                - 피해 규모와 심각성
-                - 피해자의 현재 상황
-                - 즉각적인 대응이 필요한 사항
-                - 관련 법적 이슈와 고려사항
-                - 추가 피해 발생 가능성
-
-                사용자 메시지: {message}
-
-                위 정보들을 최대한 구체적이고 체계적으로 분류하여 제시해주세요.
-                
-                {format_instructions}
-                """
-            )
-            
-            # 통합된 프롬프트 체인
-            detail_chain = detail_prompt | self.llm | detail_parser
-            
-            # 통합 분석 실행
-            detail_response = await detail_chain.ainvoke({
-                "message": message,
-                "format_instructions": detail_parser.get_format_instructions()
-            })
+            with usage_component(f"tool.{self.name}"):
+                detail_response = await self._chain.ainvoke({"message": message})
 
             return detail_response
-              
+            
         except Exception as e:
             return {"error": f"상세 정보 수집 중 오류 발생: {str(e)}"}
 
@@ -1,13 +1,15 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Dict, Any, Optional, Type
 from datetime import datetime
-from langchain_core.prompts import ChatPromptTemplate
+from prompt.registry import get_prompt
 from langchain_core.tools import BaseTool
 from langchain_core.callbacks import (
     AsyncCallbackManagerForToolRun,
     CallbackManagerForToolRun,
 )
-from langchain_openai import ChatOpenAI
+from langchain_core.runnables import Runnable
+from utils.llm import get_site_model
+from utils.usage import usage_component
 from tools.output_parser import emotion_parser
 from dotenv import load_dotenv
 import asyncio
@@ -22,9 +24,15 @@ class Emotion(BaseTool):
     description: str = "사용자 질문에서 감정 상태를 분석하는 도구입니다."
     args_schema: Type[BaseModel] = EmotionInput
     return_direct: bool = False
-    llm: ChatOpenAI = Field(
-        default_factory=lambda: ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    llm: Runnable = Field(
+        default_factory=lambda: get_site_model("tools", temperature=0)
     )
+    _chain: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        # 요청마다 프롬프트를 만들지 않도록 체인을 미리 구성
+        self._chain = get_prompt("tool.emotion").template | self.llm | emotion_parser
 
     def _run(
         self,
@@ -41,26 +49,11 @@ class Emotion(BaseTool):
     ) -> Dict[str, Any]:
         """비동기 실행을 위한 메서드"""
         try:
-            emotion_prompt = ChatPromptTemplate.from_template(
-                """사용자의 메시지를 바탕으로 감정 상태를 분석해주세요.
-
-                사용자 메시지: {message}
-
-                감정 상태를 최대한 구체적이고 체계적으로 분석하여 제시해주세요.
-                
-                {format_instructions}
-                """
-            )
-            
-            emotion_chain = emotion_prompt | self.llm | emotion_parser
-            
-            emotion_response = await emotion_chain.ainvoke({
-                "message": message,
-                "format_instructions": emotion_parser.get_format_instructions()
-            })
+            with usage_component(f"tool.{self.name}"):
+                emotion_response = await self._chain.ainvoke({"message": message})
 
             return emotion_response
-              
+            
         except Exception as e:
             return {"error": f"감정 분석 중 오류 발생: {str(e)}"}
 
@@ -33,7 +33,14 @@ class EmotionalResponse(BaseModel):
     response_guidelines: Dict[str, List[str]] = Field(description="감정 상태에 따른 추천 응답 방식과 피해야 할 표현")
     support_approach: str = Field(description="감정 상태를 고려한 심리적 지원 접근 방식")
 
+class FusedAnalysis(BaseModel):
+    """상세 정보, 감정 상태, 해결방안을 한 번의 호출로 분석한 결과 (analysis_tool)"""
+    detail: DetailAnalysis = Field(description="사건 상세 정보와 상황 분석")
+    emotion: EmotionalResponse = Field(description="사용자 감정 상태 분석")
+    solution: SolutionInformation = Field(description="사기 유형에 따른 해결방안")
+
 # 파서 인스턴스 생성
 detail_parser = PydanticOutputParser(pydantic_object=DetailAnalysis)
 solution_parser = PydanticOutputParser(pydantic_object=SolutionInformation)
 emotion_parser = PydanticOutputParser(pydantic_object=EmotionalResponse)
+analysis_parser = PydanticOutputParser(pydantic_object=FusedAnalysis)
@@ -0,0 +1,53 @@
+from typing import Any, List, Optional
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_teddynote.models import ChatPerplexity
+from utils.http_client import get_async_http_client
+
+PERPLEXITY_API_URL = "https://api.perplexity.ai/chat/completions"
+
+
+class PooledChatPerplexity(ChatPerplexity):
+    """비동기 호출 시 스레드풀 + requests 대신 공유 HTTP 커넥션 풀을 사용하는 ChatPerplexity"""
+
+    # astream_events 아래에서도 requests 기반 동기 _stream 대신 _agenerate 를 사용
+    disable_streaming: bool = True
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        params = self._get_base_params()
+        params["messages"] = self._convert_messages_to_dict(messages)
+        params["stream"] = False
+        params.update(self.model_kwargs)
+        params.update(kwargs)
+        if stop:
+            params["stop"] = stop
+
+        response = await get_async_http_client().post(
+            PERPLEXITY_API_URL, json=params, headers=self._get_api_headers()
+        )
+        response.raise_for_status()
+        response_data = response.json()
+
+        choice = response_data["choices"][0]
+        citations = response_data.get("citations", [])
+        if not citations and "metadata" in choice["message"]:
+            citations = choice["message"]["metadata"].get("citations", [])
+
+        message = AIMessage(
+            content=choice["message"]["content"],
+            additional_kwargs={"model_info": self._get_base_params()},
+            citations=citations,
+        )
+        generation_info = {
+            "model_name": response_data.get("model", self.model),
+            "usage": response_data.get("usage", {}),
+            "finish_reason": choice.get("finish_reason"),
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)], llm_output=generation_info)
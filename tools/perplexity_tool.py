@@ -1,7 +1,5 @@
-import asyncio
 from typing import Any, Dict, Optional
 from langchain_core.tools import BaseTool
-from langchain_teddynote.models import ChatPerplexity
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 from langchain_core.callbacks import AsyncCallbackManagerForToolRun
@@ -14,12 +12,18 @@ class PerplexityQAToolInput(BaseModel):
 class PerplexityQATool(BaseTool):
     name: str = "perplexity_qa_tool"
     description: str = "사용자 질의에 맞는 진정서 관련 정보를 검색 후 제공하는 도구"
-    perplexity: ChatPerplexity = Field(default=None, exclude=True)
+    perplexity: Any = Field(default=None, exclude=True)  # ChatPerplexity
 
     def __init__(self, **data):
         super().__init__(**data)
-        self.perplexity = ChatPerplexity(
-            model="llama-3.1-sonar-large-128k-online",
+        # langchain_teddynote(pandas, IPython 등 포함)는 도구 생성 시점에 로드
+        from app.config.settings import settings
+        from tools.perplexity_model import PooledChatPerplexity
+        from utils.llm import token_usage_handler
+        from utils.model_policy import tier_for
+
+        self.perplexity = PooledChatPerplexity(
+            model=settings.MODEL_TIERS[tier_for("search")],
             temperature=0.2,
             top_p=0.9,
             search_domain_filter=["perplexity.ai"],
@@ -29,18 +33,16 @@ class PerplexityQATool(BaseTool):
             streaming=False,
             presence_penalty=0,
             frequency_penalty=1,
+            callbacks=[token_usage_handler],
         )
 
     def _run(self, query: str) -> Dict[str, Any]:
         """동기 실행 메서드"""
-        return asyncio.run(self._arun(query))
+        # 이벤트 루프 안에서도 호출될 수 있으므로 asyncio.run 대신 동기 호출 사용
+        response = self.perplexity.invoke(query)
+        return {"content": response.content}
 
     async def _arun(self, query: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> Dict[str, Any]:
         """비동기 실행 메서드"""
         response = await self.perplexity.ainvoke(query)
-        return {"content": response.content}
-
-    async def ainvoke(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """args를 dict로 받고, "query" 키만 뽑아서 비동기 실행"""
-        query = args.get("query", "")
-        return await self._arun(query)
\ No newline at end of file
+        return {"content": response.content}
\ No newline at end of file
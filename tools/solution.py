@@ -1,9 +1,11 @@
 from langchain_core.tools import BaseTool
 from typing import Type, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from datetime import datetime
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+from utils.llm import get_site_model
+from utils.usage import usage_component
+from prompt.registry import get_prompt
 from langchain_core.callbacks import (
     AsyncCallbackManagerForToolRun,
     CallbackManagerForToolRun,
@@ -22,9 +24,14 @@ class Solution(BaseTool):
     description: str = "사기유형에 따른 해결방안을 제시하는 도구입니다."
     args_schema: Type[BaseModel] = SolutionInput
     return_direct: bool = False
-    llm: ChatOpenAI = Field(
-        default_factory=lambda: ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
+    llm: Runnable = Field(
+        default_factory=lambda: get_site_model("tools", temperature=0.1)
     )
+    _chain: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        self._chain = get_prompt("tool.solution").template | self.llm | solution_parser
 
     def _run(
         self,
@@ -41,37 +48,9 @@ class Solution(BaseTool):
     ) -> Dict[str, Any]:
         """비동기 실행을 위한 메서드"""
         try:
-            prompt = ChatPromptTemplate.from_template(
-                """사용자의 상황을 심층적으로 분석하여 실질적이고 구체적인 해결방안을 제시해주세요.
-
-                다음 사항들을 중점적으로 고려해주세요:
-                - 즉각적인 피해 방지를 위한 긴급 조치사항
-                - 법적 대응을 위한 단계별 실행 계획
-                - 추가 피해 예방을 위한 구체적인 안전장치
-                - 필요한 증거자료 확보 및 보관 방법
-                - 도움을 받을 수 있는 전문기관 및 법률 지원
-                - 심리적 회복을 위한 지원 방안
-                - 유사 사기 수법 예방을 위한 교훈과 조언
-                - 피해 금액 회수를 위한 전략적 접근
-                - 장기적 관점의 재발 방지 대책
-
-                각 해결방안에 대해 구체적인 실행 단계와 예상되는 결과, 주의사항을 포함해 설명해주세요.
+            with usage_component(f"tool.{self.name}"):
+                response = await self._chain.ainvoke({"message": message})
 
-                사용자 메시지: {message}
-                
-                위 요소들을 종합적으로 고려하여 체계적이고 실현 가능한 해결방안을 제시해주세요.
-                
-                {format_instructions}
-                """
-            )
-            
-            chain = prompt | self.llm | solution_parser
-            
-            response = await chain.ainvoke({
-                "message": message,
-                "format_instructions": solution_parser.get_format_instructions()
-            })
-            
             return response
             
         except Exception as e:
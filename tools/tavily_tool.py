@@ -0,0 +1,40 @@
+from typing import Any, Dict, List, Optional
+from langchain_community.tools import TavilySearchResults
+from langchain_community.utilities.tavily_search import TAVILY_API_URL, TavilySearchAPIWrapper
+from utils.http_client import get_async_http_client
+
+
+class PooledTavilySearchAPIWrapper(TavilySearchAPIWrapper):
+    """비동기 검색 시 세션을 매번 만들지 않고 공유 HTTP 커넥션 풀을 사용하는 Tavily API 래퍼"""
+
+    async def raw_results_async(
+        self,
+        query: str,
+        max_results: Optional[int] = 5,
+        search_depth: Optional[str] = "advanced",
+        include_domains: Optional[List[str]] = [],
+        exclude_domains: Optional[List[str]] = [],
+        include_answer: Optional[bool] = False,
+        include_raw_content: Optional[bool] = False,
+        include_images: Optional[bool] = False,
+    ) -> Dict:
+        params = {
+            "api_key": self.tavily_api_key.get_secret_value(),
+            "query": query,
+            "max_results": max_results,
+            "search_depth": search_depth,
+            "include_domains": include_domains,
+            "exclude_domains": exclude_domains,
+            "include_answer": include_answer,
+            "include_raw_content": include_raw_content,
+            "include_images": include_images,
+        }
+        response = await get_async_http_client().post(f"{TAVILY_API_URL}/search", json=params)
+        if response.status_code != 200:
+            raise Exception(f"Error {response.status_code}: {response.reason_phrase}")
+        return response.json()
+
+
+def create_tavily_tool(**kwargs: Any) -> TavilySearchResults:
+    """공유 커넥션 풀을 사용하는 TavilySearchResults 도구 생성"""
+    return TavilySearchResults(api_wrapper=PooledTavilySearchAPIWrapper(), **kwargs)
@@ -0,0 +1,186 @@
+"""
+토큰 예산 기반 대화 문맥 관리
+
+- 시스템 프롬프트와 현재 턴(마지막 사용자 메시지 이후의 도구 호출/결과 포함)은 항상 그대로 유지
+- 최근 N 턴은 예산 안에서 그대로 유지
+- 그보다 오래된 턴은 추출식 요약(사용자 제공 정보 우선) 하나의 SystemMessage 로 접음
+
+요약은 메시지별 요약 줄을 캐시해 재사용하므로 대화가 길어져도 LLM 호출이나 큰 비용 없이 갱신됩니다.
+"""
+import logging
+import re
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# 메시지당 역할/구분자 토큰 (OpenAI chat 포맷 기준 근사치)
+MESSAGE_OVERHEAD_TOKENS = 4
+SUMMARY_HEADER = "이전 대화 요약 (오래된 대화는 요약되어 있습니다):"
+
+# 진정서 작성에 필요한 사실(날짜, 금액, 연락처, 계좌 등)이 들어 있는 문장
+_FACT_PATTERN = re.compile(r"\d|@|계좌|은행|이름|성명|주소|연락처|아이디|닉네임|플랫폼|사이트")
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # 인코딩 파일을 받을 수 없는 환경(오프라인 등)에서는 근사치 사용 (모델별로 한 번만 기록)
+        logger.warning("tiktoken 인코딩을 사용할 수 없어 근사치로 토큰을 계산합니다: %s", e)
+        return None
+
+
+def load_encoding(model: str = "gpt-4o-mini") -> bool:
+    """
+    토큰 인코딩을 미리 로드 (시작 시 호출)
+
+    tiktoken 은 처음 사용할 때 BPE 파일을 동기로 내려받으므로, 첫 요청의 이벤트 루프를 막지 않도록
+    lifespan 에서 별도 스레드로 호출합니다. 근사치를 사용하게 되면 False 를 반환합니다.
+    """
+    return _encoding(model) is not None
+
+
+def approx_tokens(text: str) -> int:
+    """토크나이저 없이 계산하는 토큰 수 근사치 (UTF-8 바이트 수 / 3, 한글은 글자당 1토큰)"""
+    return max(1, len(text.encode("utf-8")) // 3) if text else 0
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """문자열 토큰 수 (tiktoken 이 없으면 approx_tokens 로 근사)"""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return approx_tokens(text)
+    return len(encoding.encode(text))
+
+
+def message_tokens(message: BaseMessage, model: str = "gpt-4o-mini") -> int:
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    tokens = MESSAGE_OVERHEAD_TOKENS + count_tokens(content, model)
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        tokens += sum(count_tokens(f"{c['name']}{c['args']}", model) for c in tool_calls)
+    return tokens
+
+
+def messages_tokens(messages: Sequence[BaseMessage], model: str = "gpt-4o-mini") -> int:
+    return sum(message_tokens(m, model) for m in messages)
+
+
+@lru_cache(maxsize=8192)
+def _summary_line(role: str, content: str, max_chars: int) -> Tuple[str, bool]:
+    """메시지 하나의 요약 줄과 사실 포함 여부 (메시지 내용 단위로 캐시)"""
+    text = " ".join(content.split())
+    if len(text) > max_chars:
+        # 첫 문장(또는 앞부분)만 유지
+        cut = max(text.rfind(". ", 0, max_chars), text.rfind("? ", 0, max_chars))
+        text = text[:cut + 1] if cut > max_chars // 2 else text[:max_chars] + "…"
+    is_user = role == "human"
+    return f"- {'사용자' if is_user else '상담원'}: {text}", is_user and bool(_FACT_PATTERN.search(text))
+
+
+def split_turns(transcript: Sequence[BaseMessage]) -> List[List[BaseMessage]]:
+    """사용자 메시지를 기준으로 턴 단위로 분할 (첫 사용자 메시지 이전의 메시지는 별도 턴)"""
+    turns: List[List[BaseMessage]] = []
+    for message in transcript:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return turns
+
+
+class ContextWindowManager:
+    """에이전트별 토큰 예산에 맞게 대화 기록을 (요약 + 최근 턴) 으로 줄임"""
+
+    def __init__(self, budget_tokens: int, keep_last_turns: int = None, summary_max_tokens: int = None,
+                 model: str = "gpt-4o-mini"):
+        self.budget_tokens = budget_tokens
+        self.keep_last_turns = settings.CONTEXT_KEEP_LAST_TURNS if keep_last_turns is None else keep_last_turns
+        self.summary_max_tokens = settings.CONTEXT_SUMMARY_MAX_TOKENS if summary_max_tokens is None else summary_max_tokens
+        self.model = model
+
+    def summarize(self, messages: Sequence[BaseMessage], max_tokens: int) -> Optional[SystemMessage]:
+        """오래된 메시지를 추출식 요약으로 접음 (사실이 담긴 사용자 발화 우선, 최신 순으로 채움)"""
+        lines: List[Tuple[str, bool]] = []
+        for message in messages:
+            # 도구 호출/결과는 요약에서 제외 (해당 턴의 최종 답변에 반영되어 있음)
+            if isinstance(message, ToolMessage) or (isinstance(message, AIMessage) and message.tool_calls):
+                continue
+            content = message.content if isinstance(message.content, str) else ""
+            if content.strip():
+                lines.append(_summary_line(message.type, content, 160 if message.type == "human" else 80))
+        if not lines or max_tokens <= 0:
+            return None
+
+        budget = max_tokens - MESSAGE_OVERHEAD_TOKENS - count_tokens(SUMMARY_HEADER, self.model)
+        selected = set()
+        # 1) 사실이 담긴 사용자 발화, 2) 나머지 - 각각 최신 순으로 예산 안에서 선택
+        for facts_first in (True, False):
+            for index in range(len(lines) - 1, -1, -1):
+                line, has_fact = lines[index]
+                if index in selected or has_fact != facts_first:
+                    continue
+                cost = count_tokens(line, self.model) + 1
+                if cost > budget:
+                    continue
+                selected.add(index)
+                budget -= cost
+        if not selected:
+            return None
+        body = "\n".join(lines[i][0] for i in sorted(selected))
+        return SystemMessage(content=f"{SUMMARY_HEADER}\n{body}")
+
+    def fit(self, transcript: Sequence[BaseMessage], system: Sequence[BaseMessage] = (),
+            reserved_tokens: int = 0) -> Tuple[List[BaseMessage], List[BaseMessage]]:
+        """
+        전체 대화를 (줄인 기록, 현재 턴) 으로 반환
+
+        현재 턴은 마지막 사용자 메시지부터 끝까지이며 항상 그대로 유지됩니다.
+        기록은 예산을 넘지 않는 범위에서 최근 턴을 그대로 두고, 나머지는 요약 메시지 하나로 접습니다.
+        reserved_tokens 는 프롬프트 템플릿이 덧붙이는 고정 메시지(CompiledPrompt.static_tokens)처럼
+        system 으로 넘기지 않는 토큰으로, 예산에서 미리 뺍니다.
+        """
+        turns = split_turns(transcript)
+        if turns and isinstance(turns[-1][0], HumanMessage):
+            current = turns.pop()
+        else:
+            current = []
+
+        fixed = reserved_tokens + messages_tokens(system, self.model) + messages_tokens(current, self.model)
+        turn_tokens = [messages_tokens(turn, self.model) for turn in turns]
+        available = self.budget_tokens - fixed
+        if sum(turn_tokens) <= available:
+            return [m for turn in turns for m in turn], current
+
+        # 요약 자리를 남겨 두고 최근 턴부터 채움
+        room = available - self.summary_max_tokens
+        keep = 0
+        used = 0
+        while keep < min(self.keep_last_turns, len(turns)) and used + turn_tokens[-1 - keep] <= room:
+            used += turn_tokens[-1 - keep]
+            keep += 1
+
+        older = [m for turn in turns[:len(turns) - keep] for m in turn]
+        recent = [m for turn in turns[len(turns) - keep:] for m in turn]
+        summary = self.summarize(older, min(self.summary_max_tokens, available - used))
+        return ([summary] if summary else []) + recent, current
+
+
+@lru_cache(maxsize=None)
+def get_context_manager(agent: str) -> ContextWindowManager:
+    """에이전트별 예산(CONTEXT_BUDGETS, 없으면 CONTEXT_DEFAULT_BUDGET)을 사용하는 문맥 관리자"""
+    return ContextWindowManager(settings.CONTEXT_BUDGETS.get(agent, settings.CONTEXT_DEFAULT_BUDGET))
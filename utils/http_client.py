@@ -0,0 +1,149 @@
+import importlib.util
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.config.settings import settings
+from utils.llm_gateway import GatewayAsyncTransport, GatewaySyncTransport
+
+logger = logging.getLogger("http_client")
+
+_lock = threading.Lock()
+_async_client: Optional[httpx.AsyncClient] = None
+_sync_client: Optional[httpx.Client] = None
+_async_transport: Optional["_CountingAsyncTransport"] = None
+_sync_transport: Optional["_CountingSyncTransport"] = None
+
+
+class _CountingAsyncTransport(httpx.AsyncHTTPTransport):
+    """요청 수/진행 중 요청 수를 집계하는 비동기 전송 계층"""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.requests_total = 0
+        self.errors_total = 0
+        self.in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests_total += 1
+        self.in_flight += 1
+        try:
+            return await super().handle_async_request(request)
+        except Exception:
+            self.errors_total += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+class _CountingSyncTransport(httpx.HTTPTransport):
+    """요청 수/진행 중 요청 수를 집계하는 동기 전송 계층"""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.requests_total = 0
+        self.errors_total = 0
+        self.in_flight = 0
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests_total += 1
+        self.in_flight += 1
+        try:
+            return super().handle_request(request)
+        except Exception:
+            self.errors_total += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+def _http2_enabled() -> bool:
+    if not settings.HTTP2_ENABLED:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP2_ENABLED=true 이지만 h2 패키지가 없어 HTTP/1.1을 사용합니다. (pip install 'httpx[http2]')")
+        return False
+    return True
+
+
+def _transport_options() -> Dict[str, Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        "http2": _http2_enabled(),
+    }
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS)
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """프로세스 전역에서 공유하는 비동기 HTTP 클라이언트 (keep-alive 커넥션 풀, LLM 호출은 게이트웨이 경유)"""
+    global _async_client, _async_transport
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_transport = _CountingAsyncTransport(**_transport_options())
+                transport = GatewayAsyncTransport(_async_transport) if settings.LLM_GATEWAY_ENABLED else _async_transport
+                _async_client = httpx.AsyncClient(transport=transport, timeout=_timeout())
+    return _async_client
+
+
+def get_sync_http_client() -> httpx.Client:
+    """프로세스 전역에서 공유하는 동기 HTTP 클라이언트 (동기 invoke 경로용)"""
+    global _sync_client, _sync_transport
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                _sync_transport = _CountingSyncTransport(**_transport_options())
+                transport = GatewaySyncTransport(_sync_transport) if settings.LLM_GATEWAY_ENABLED else _sync_transport
+                _sync_client = httpx.Client(transport=transport, timeout=_timeout())
+    return _sync_client
+
+
+def _pool_stats(transport: Optional[httpx.BaseTransport]) -> Dict[str, Any]:
+    if transport is None:
+        return {"initialized": False}
+    connections = list(getattr(transport._pool, "connections", []))
+    idle = sum(1 for c in connections if c.is_idle())
+    return {
+        "initialized": True,
+        "connections": len(connections),
+        "idle_connections": idle,
+        "active_connections": len(connections) - idle,
+        "http2_connections": sum(1 for c in connections if "HTTP/2" in repr(c)),
+        "requests_total": transport.requests_total,
+        "errors_total": transport.errors_total,
+        "in_flight": transport.in_flight,
+    }
+
+
+def pool_stats() -> Dict[str, Any]:
+    """공유 커넥션 풀 상태"""
+    return {
+        "limits": {
+            "max_connections": settings.HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            "keepalive_expiry_seconds": settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            "http2": settings.HTTP2_ENABLED,
+        },
+        "async": _pool_stats(_async_transport),
+        "sync": _pool_stats(_sync_transport),
+    }
+
+
+async def aclose_http_clients() -> None:
+    """애플리케이션 종료 시 커넥션 풀 정리"""
+    global _async_client, _sync_client, _async_transport, _sync_transport
+    if _async_client is not None:
+        await _async_client.aclose()
+    if _sync_client is not None:
+        _sync_client.close()
+    _async_client = _sync_client = None
+    _async_transport = _sync_transport = None
@@ -0,0 +1,125 @@
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableSerializable
+from pydantic import ConfigDict
+
+from app.config.settings import settings
+from utils.http_client import get_async_http_client, get_sync_http_client
+from utils.metrics import LLM_CALLS, LLM_TOKENS
+from utils.usage import record_llm_usage
+
+
+def _extract_usage(response: LLMResult) -> Tuple[str, int, int]:
+    """LLMResult 에서 (모델명, 프롬프트 토큰, 완료 토큰) 추출"""
+    llm_output = response.llm_output or {}
+    model = llm_output.get("model_name") or llm_output.get("model") or "unknown"
+    usage = llm_output.get("token_usage") or llm_output.get("usage") or {}
+    prompt = usage.get("prompt_tokens", 0) or 0
+    completion = usage.get("completion_tokens", 0) or 0
+    if not prompt and not completion:
+        # 스트리밍 응답은 메시지의 usage_metadata 에만 사용량이 기록됨
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage_metadata = getattr(message, "usage_metadata", None) or {}
+                prompt += usage_metadata.get("input_tokens", 0)
+                completion += usage_metadata.get("output_tokens", 0)
+                metadata = getattr(message, "response_metadata", None) or {}
+                model = metadata.get("model_name", model)
+    return model, prompt, completion
+
+
+class TokenUsageCallbackHandler(BaseCallbackHandler):
+    """모든 LLM 호출의 토큰 사용량을 메트릭과 현재 요청의 사용량(utils.usage)으로 집계"""
+
+    run_inline = True  # 스레드풀 전환 없이 즉시 실행 (집계만 하므로 비용이 작음)
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        model, prompt, completion = _extract_usage(response)
+        LLM_CALLS.inc(model=model)
+        if prompt:
+            LLM_TOKENS.inc(prompt, model=model, type="prompt")
+        if completion:
+            LLM_TOKENS.inc(completion, model=model, type="completion")
+        record_llm_usage(model, prompt, completion)
+
+
+token_usage_handler = TokenUsageCallbackHandler()
+
+
+def get_chat_model(model: str = "gpt-4o-mini", **kwargs: Any):
+    """공유 HTTP 커넥션 풀과 토큰 사용량 집계 콜백을 사용하는 ChatOpenAI 생성"""
+    from langchain_openai import ChatOpenAI
+
+    if settings.LLM_GATEWAY_ENABLED:
+        # 재시도는 게이트웨이가 호스트 단위로 처리 (클라이언트별 재시도가 겹치지 않도록)
+        kwargs.setdefault("max_retries", 0)
+
+    return ChatOpenAI(
+        model=model,
+        http_client=get_sync_http_client(),
+        http_async_client=get_async_http_client(),
+        callbacks=[token_usage_handler],
+        stream_usage=True,  # 스트리밍 응답에서도 토큰 사용량 수신
+        **kwargs,
+    )
+
+
+class TieredChatModel(RunnableSerializable):
+    """
+    호출할 때마다 모델 등급 정책(utils.model_policy)으로 등급을 골라 해당 모델에 위임
+
+    bind_tools / with_structured_output 은 등급별 모델 모두에 적용한 새 TieredChatModel 을 반환하므로,
+    체인과 에이전트는 한 번만 구성하고 요청마다 모델만 바뀝니다.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    site: str
+    models: Dict[str, Runnable]  # 등급 -> 모델 (기본 등급이 첫 항목)
+
+    def _select(self) -> Runnable:
+        from utils.model_policy import select_tier
+
+        return self.models.get(select_tier(self.site)) or next(iter(self.models.values()))
+
+    def _map(self, func: Callable[[Runnable], Runnable]) -> "TieredChatModel":
+        return TieredChatModel(site=self.site, models={tier: func(model) for tier, model in self.models.items()})
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        return self._select().invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        return await self._select().ainvoke(input, config, **kwargs)
+
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator[Any]:
+        yield from self._select().stream(input, config, **kwargs)
+
+    async def astream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> AsyncIterator[Any]:
+        async for chunk in self._select().astream(input, config, **kwargs):
+            yield chunk
+
+    def bind_tools(self, *args: Any, **kwargs: Any) -> "TieredChatModel":
+        return self._map(lambda model: model.bind_tools(*args, **kwargs))
+
+    def with_structured_output(self, *args: Any, **kwargs: Any) -> "TieredChatModel":
+        return self._map(lambda model: model.with_structured_output(*args, **kwargs))
+
+
+def get_site_model(site: str, **kwargs: Any):
+    """
+    호출 위치(MODEL_TIER_POLICY 의 키)에 맞는 모델 생성
+
+    하향할 등급이 없으면 기본 등급 모델을 그대로 반환하고,
+    있으면 요청 상태에 따라 등급을 고르는 TieredChatModel 을 반환합니다.
+    """
+    from utils.model_policy import tier_chain
+
+    tiers = tier_chain(site)
+    if len(tiers) == 1:
+        return get_chat_model(settings.MODEL_TIERS[tiers[0]], **kwargs)
+    return TieredChatModel(
+        site=site, models={tier: get_chat_model(settings.MODEL_TIERS[tier], **kwargs) for tier in tiers}
+    )
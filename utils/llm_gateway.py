@@ -0,0 +1,420 @@
+"""
+LLM 게이트웨이
+
+공유 HTTP 클라이언트(utils.http_client)의 전송 계층을 감싸, 에이전트/서비스/도구의 모든 LLM API 호출이
+프로세스 안의 한 곳을 거치도록 합니다.
+- 호스트별 분당 요청(RPM)/토큰(TPM) 토큰 버킷 (LLM_RATE_LIMITS)
+- 버킷이 비면 엔드포인트 우선순위(LLM_GATEWAY_PRIORITIES), 도착 순서대로 대기
+- 429 는 Retry-After 만큼 해당 호스트 호출을 모두 멈춘 뒤 재시도, 5xx/연결 오류는 지수 백오프(jitter) 후 재시도
+  (모델 클라이언트마다 따로 재시도하면 폭주가 커지므로 ChatOpenAI 자체 재시도는 끔)
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from app.config.settings import settings
+from utils.metrics import registry
+from utils.usage import current_usage
+
+logger = logging.getLogger("llm_gateway")
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+GATEWAY_WAIT = registry.histogram(
+    "poli_llm_gateway_wait_seconds", "LLM 게이트웨이 대기열 대기 시간", ("host", "priority"),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+GATEWAY_RETRIES = registry.counter(
+    "poli_llm_gateway_retries_total", "LLM 게이트웨이 재시도 횟수 (reason: 응답 상태 코드 또는 error)", ("host", "reason"))
+GATEWAY_REJECTED = registry.counter(
+    "poli_llm_gateway_rejected_total", "대기 시간 초과(LLM_GATEWAY_MAX_WAIT_SECONDS)로 거절한 요청 수", ("host",))
+
+Ticket = Tuple[int, int]  # (우선순위, 도착 순서)
+
+
+class QueueTimeout(Exception):
+    pass
+
+
+class _Bucket:
+    """분당 한도를 초 단위로 채우는 토큰 버킷 (한도 0 이면 제한 없음)"""
+
+    def __init__(self, per_minute: float, burst_seconds: float):
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, self.rate * burst_seconds) if per_minute else 0.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def delay(self, amount: float, now: float) -> float:
+        """amount 만큼 꺼낼 수 있을 때까지 남은 시간"""
+        if not self.rate:
+            return 0.0
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        if self.rate:
+            self.tokens -= min(amount, self.capacity)
+
+
+class HostLimiter:
+    """
+    한 호스트의 요청/토큰 버킷과 우선순위 대기열
+
+    이벤트 루프/스레드에 묶이지 않도록 상태는 락으로 보호합니다.
+    대기열 선두(가장 높은 우선순위 중 먼저 온 요청)만 버킷에서 꺼낼 수 있고, 버킷이 찰 때까지만 잠듭니다.
+    선두가 아닌 대기자는 주기적으로 확인하지 않고, 앞선 요청이 빠져 선두가 되었을 때 깨웁니다.
+    """
+
+    def __init__(self, host: str, rpm: float = 0, tpm: float = 0, burst_seconds: float = 6.0):
+        self.host = host
+        self.rpm, self.tpm = rpm, tpm
+        self._requests = _Bucket(rpm, burst_seconds)
+        self._tokens = _Bucket(tpm, burst_seconds)
+        self._lock = threading.Lock()
+        self._heap: List[Ticket] = []
+        self._live: Set[Ticket] = set()
+        self._wakers: Dict[Ticket, Callable[[], None]] = {}
+        self._seq = itertools.count()
+        self.paused_until = 0.0
+        self.acquired_total = 0
+        self.rejected_total = 0
+        self.wait_seconds_total = 0.0
+
+    @property
+    def counts_tokens(self) -> bool:
+        return bool(self.tpm)
+
+    def ticket(self, priority: int) -> Ticket:
+        return priority, next(self._seq)
+
+    def queue_depth(self) -> int:
+        with self._lock:
+            return len(self._live)
+
+    def pause(self, seconds: float) -> None:
+        """429 응답 후 seconds 동안 이 호스트의 모든 호출을 멈춤"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def _wake_head(self) -> None:
+        """새 선두 대기자를 깨움 (호출자가 잠금 보유)"""
+        while self._heap and self._heap[0] not in self._live:
+            heapq.heappop(self._heap)
+        if self._heap:
+            waker = self._wakers.get(self._heap[0])
+            if waker is not None:
+                waker()
+
+    def _try_take(self, ticket: Ticket, tokens: int, waker: Callable[[], None]) -> Optional[float]:
+        """꺼냈으면 0, 버킷이 비었으면 찰 때까지 기다릴 시간, 선두가 아니면 None (선두가 되면 waker 호출)"""
+        with self._lock:
+            if ticket not in self._live:
+                self._live.add(ticket)
+                heapq.heappush(self._heap, ticket)
+            self._wakers[ticket] = waker
+            while self._heap[0] not in self._live:
+                heapq.heappop(self._heap)
+            if self._heap[0] != ticket:
+                return None
+            now = time.monotonic()
+            delay = max(self.paused_until - now, self._requests.delay(1, now), self._tokens.delay(tokens, now))
+            if delay > 0:
+                return delay
+            heapq.heappop(self._heap)
+            self._live.discard(ticket)
+            del self._wakers[ticket]
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            self._wake_head()
+            return 0.0
+
+    def _leave(self, ticket: Ticket) -> None:
+        with self._lock:
+            if ticket in self._live:
+                self._live.discard(ticket)
+                self._wakers.pop(ticket, None)
+                self._wake_head()
+
+    def _record(self, ticket: Ticket, waited: float) -> None:
+        self.acquired_total += 1
+        self.wait_seconds_total += waited
+        GATEWAY_WAIT.observe(waited, host=self.host, priority=ticket[0])
+
+    def _reject(self) -> QueueTimeout:
+        self.rejected_total += 1
+        GATEWAY_REJECTED.inc(host=self.host)
+        return QueueTimeout(f"{self.host} 대기 시간 초과")
+
+    async def acquire(self, ticket: Ticket, tokens: int = 0) -> float:
+        """버킷에서 요청 1개와 tokens 를 꺼낼 때까지 대기하고 대기 시간을 반환"""
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        woken = asyncio.Event()
+
+        def wake() -> None:
+            # 다른 스레드/이벤트 루프에서 선두를 넘겨줄 수 있으므로 스레드 안전하게 설정
+            try:
+                loop.call_soon_threadsafe(woken.set)
+            except RuntimeError:
+                pass  # 루프가 이미 닫힘
+
+        try:
+            while True:
+                woken.clear()
+                delay = self._try_take(ticket, tokens, wake)
+                waited = time.monotonic() - started
+                if delay == 0:
+                    self._record(ticket, waited)
+                    return waited
+                timeout = settings.LLM_GATEWAY_MAX_WAIT_SECONDS - waited
+                if timeout <= 0 or (delay is not None and delay > timeout):
+                    raise self._reject()
+                try:
+                    await asyncio.wait_for(woken.wait(), delay if delay is not None else timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._leave(ticket)
+
+    def acquire_sync(self, ticket: Ticket, tokens: int = 0) -> float:
+        """acquire 의 동기 버전 (동기 invoke 경로용)"""
+        started = time.monotonic()
+        woken = threading.Event()
+        try:
+            while True:
+                woken.clear()
+                delay = self._try_take(ticket, tokens, woken.set)
+                waited = time.monotonic() - started
+                if delay == 0:
+                    self._record(ticket, waited)
+                    return waited
+                timeout = settings.LLM_GATEWAY_MAX_WAIT_SECONDS - waited
+                if timeout <= 0 or (delay is not None and delay > timeout):
+                    raise self._reject()
+                woken.wait(delay if delay is not None else timeout)
+        finally:
+            self._leave(ticket)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limits": {"rpm": self.rpm, "tpm": self.tpm},
+            "queue_depth": self.queue_depth(),
+            "paused_seconds": round(max(0.0, self.paused_until - time.monotonic()), 3),
+            "acquired_total": self.acquired_total,
+            "rejected_total": self.rejected_total,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+        }
+
+
+class LLMGateway:
+    """LLM_RATE_LIMITS 에 있는 호스트별 HostLimiter 보관"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, HostLimiter] = {}
+
+    def limiter(self, host: str) -> Optional[HostLimiter]:
+        limits = settings.LLM_RATE_LIMITS.get(host)
+        if limits is None:
+            return None
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(host)
+                if limiter is None:
+                    limiter = self._limiters[host] = HostLimiter(
+                        host, limits.get("rpm", 0), limits.get("tpm", 0), settings.LLM_GATEWAY_BURST_SECONDS)
+        return limiter
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.LLM_GATEWAY_ENABLED,
+            "hosts": {host: limiter.stats() for host, limiter in list(self._limiters.items())},
+        }
+
+
+@lru_cache(maxsize=None)
+def get_llm_gateway() -> LLMGateway:
+    return LLMGateway()
+
+
+def current_priority() -> int:
+    """현재 요청 엔드포인트의 대기 우선순위 (작을수록 먼저)"""
+    usage = current_usage()
+    endpoint = usage.endpoint if usage is not None else None
+    return settings.LLM_GATEWAY_PRIORITIES.get(endpoint, settings.LLM_GATEWAY_DEFAULT_PRIORITY)
+
+
+def estimate_tokens(request: httpx.Request) -> int:
+    """
+    TPM 버킷에서 미리 차감할 토큰 수 (입력 메시지 토큰 근사치 + max_tokens 또는 기본 출력 예상치)
+
+    요청 본문은 매번 다르므로 토크나이저 캐시에 넣지 않고, 이벤트 루프에서 바로 계산되는 근사치를 사용합니다.
+    """
+    from utils.context_window import approx_tokens
+
+    try:
+        payload = json.loads(request.content)
+    except ValueError:
+        return settings.LLM_GATEWAY_COMPLETION_TOKENS
+    completion = (payload.get("max_completion_tokens") or payload.get("max_tokens")
+                  or settings.LLM_GATEWAY_COMPLETION_TOKENS)
+    return approx_tokens(json.dumps(payload.get("messages", ""), ensure_ascii=False)) + int(completion)
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """retry-after-ms / Retry-After(초 또는 HTTP 날짜) 헤더 값"""
+    value = response.headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    """full jitter 지수 백오프"""
+    cap = min(settings.LLM_GATEWAY_BACKOFF_MAX_SECONDS, settings.LLM_GATEWAY_BACKOFF_BASE_SECONDS * 2 ** attempt)
+    return random.uniform(0, cap)
+
+
+def _retry_delay(limiter: HostLimiter, response: Optional[httpx.Response], attempt: int) -> Optional[float]:
+    """
+    재시도 전 직접 기다릴 시간 (재시도하지 않으면 None)
+
+    429 는 Retry-After(+jitter) 동안 호스트 전체를 멈추고 대기열에서 기다리므로 0 을 반환합니다.
+    """
+    if attempt >= settings.LLM_GATEWAY_MAX_RETRIES:
+        return None
+    if response is None:
+        GATEWAY_RETRIES.inc(host=limiter.host, reason="error")
+        return _backoff(attempt)
+    if response.status_code not in RETRY_STATUSES:
+        return None
+    GATEWAY_RETRIES.inc(host=limiter.host, reason=response.status_code)
+    retry_after = retry_after_seconds(response)
+    if response.status_code == 429:
+        delay = _backoff(attempt) if retry_after is None else retry_after
+        limiter.pause(delay + random.uniform(0, settings.LLM_GATEWAY_BACKOFF_BASE_SECONDS))
+        return 0.0
+    return _backoff(attempt) if retry_after is None else retry_after
+
+
+def _rejected(request: httpx.Request) -> httpx.Response:
+    # 모델 클라이언트가 일반적인 속도 제한 오류로 처리하도록 429 로 응답
+    return httpx.Response(
+        429,
+        headers={"retry-after": "1"},
+        json={"error": {"message": "LLM gateway queue wait exceeded", "type": "rate_limit_exceeded"}},
+        request=request,
+    )
+
+
+class GatewayAsyncTransport(httpx.AsyncBaseTransport):
+    """속도 제한/재시도를 적용하는 비동기 전송 계층 (LLM_RATE_LIMITS 에 없는 호스트는 그대로 전달)"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, gateway: Optional[LLMGateway] = None):
+        self._transport = transport
+        self._gateway = gateway or get_llm_gateway()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = self._gateway.limiter(request.url.host)
+        if limiter is None:
+            return await self._transport.handle_async_request(request)
+
+        await request.aread()  # 재시도할 때 본문을 다시 보내기 위해
+        tokens = estimate_tokens(request) if limiter.counts_tokens else 0
+        ticket = limiter.ticket(current_priority())  # 재시도해도 대기열 순서 유지
+        attempt = 0
+        while True:
+            try:
+                await limiter.acquire(ticket, tokens)
+            except QueueTimeout:
+                return _rejected(request)
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError:
+                delay = _retry_delay(limiter, None, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = _retry_delay(limiter, response, attempt)
+                if delay is None:
+                    return response
+                await response.aclose()
+            logger.info(f"{request.url.host} 재시도 {attempt + 1}/{settings.LLM_GATEWAY_MAX_RETRIES}")
+            attempt += 1
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class GatewaySyncTransport(httpx.BaseTransport):
+    """GatewayAsyncTransport 의 동기 버전"""
+
+    def __init__(self, transport: httpx.BaseTransport, gateway: Optional[LLMGateway] = None):
+        self._transport = transport
+        self._gateway = gateway or get_llm_gateway()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = self._gateway.limiter(request.url.host)
+        if limiter is None:
+            return self._transport.handle_request(request)
+
+        request.read()
+        tokens = estimate_tokens(request) if limiter.counts_tokens else 0
+        ticket = limiter.ticket(current_priority())
+        attempt = 0
+        while True:
+            try:
+                limiter.acquire_sync(ticket, tokens)
+            except QueueTimeout:
+                return _rejected(request)
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError:
+                delay = _retry_delay(limiter, None, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = _retry_delay(limiter, response, attempt)
+                if delay is None:
+                    return response
+                response.close()
+            logger.info(f"{request.url.host} 재시도 {attempt + 1}/{settings.LLM_GATEWAY_MAX_RETRIES}")
+            attempt += 1
+            if delay:
+                time.sleep(delay)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+def gateway_stats() -> Dict[str, Any]:
+    """호스트별 한도, 대기열 길이, 누적 대기/거절 현황"""
+    return get_llm_gateway().stats()
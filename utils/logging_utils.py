@@ -1,31 +1,238 @@
+import atexit
+import json
 import logging
 import os
+import queue
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Optional
+
+from app.config.settings import settings
+from utils.metrics import registry
 
 # httpx 로거 비활성화
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
-# 로그 디렉토리 생성
-log_dir = 'log'
-if not os.path.exists(log_dir):
-    os.makedirs(log_dir)
-
-# 기본 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(log_dir, 'poli_agent.log')),
-        logging.StreamHandler()
-    ]
-)
+LOG_RECORDS_DROPPED = registry.counter(
+    "poli_log_records_dropped_total", "샘플링/속도 제한/큐 포화로 버려진 로그 레코드 수", ("logger", "reason"))
+
+# LogRecord 기본 속성 (이외의 속성은 extra 로 전달된 구조화 필드)
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+def _truncate(value: Any, limit: int) -> Any:
+    """긴 문자열/컬렉션을 잘라 로그 한 줄의 크기를 제한"""
+    if isinstance(value, str):
+        return value if len(value) <= limit else value[:limit] + f"...(+{len(value) - limit})"
+    if isinstance(value, dict):
+        return {k: _truncate(v, limit) for k, v in list(value.items())[:50]}
+    if isinstance(value, (list, tuple)):
+        return [_truncate(v, limit) for v in value[:50]]
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 JSON 한 줄로 직렬화 (extra 로 전달된 필드 포함)"""
+
+    def __init__(self, max_field_chars: int = 500):
+        super().__init__()
+        self.max_field_chars = max_field_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = _truncate(value, self.max_field_chars)
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    """크기(maxBytes) 또는 시간 간격 중 먼저 도달하는 조건으로 파일을 교체"""
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int, interval_seconds: int, encoding: str = "utf-8"):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.interval_seconds = interval_seconds
+        self.rollover_at = time.time() + interval_seconds if interval_seconds else None
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        if self.interval_seconds:
+            self.rollover_at = time.time() + self.interval_seconds
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    로거별 샘플링 비율과 초당 레코드 수 제한 (WARNING 이상은 항상 통과)
+
+    sample_rates: {"로거 이름(접두사)": 0.0~1.0}, rate_limits: {"로거 이름(접두사)": 초당 레코드 수}
+    """
+
+    def __init__(self, sample_rates: Dict[str, float], rate_limits: Dict[str, float]):
+        super().__init__()
+        self.sample_rates = sample_rates
+        self.rate_limits = rate_limits
+        self._buckets: Dict[str, list] = {}  # 로거 접두사 -> [토큰 수, 마지막 갱신 시각]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _match(name: str, table: Dict[str, float]) -> Optional[str]:
+        while name:
+            if name in table:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        key = self._match(record.name, self.sample_rates)
+        if key is not None and random.random() >= self.sample_rates[key]:
+            LOG_RECORDS_DROPPED.inc(logger=record.name, reason="sampled")
+            return False
+
+        key = self._match(record.name, self.rate_limits)
+        if key is not None:
+            rate = self.rate_limits[key]
+            now = time.monotonic()
+            with self._lock:
+                bucket = self._buckets.setdefault(key, [rate, now])
+                bucket[0] = min(rate, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                if bucket[0] < 1:
+                    LOG_RECORDS_DROPPED.inc(logger=record.name, reason="rate_limited")
+                    return False
+                bucket[0] -= 1
+        return True
+
 
+_CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
 
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    큐가 가득 차면 요청 처리를 막지 않고 WARNING 미만 레코드를 버리는 QueueHandler
 
-def log_tool_usage(agent_name: str, tool_name: str, args: str):
+    WARNING 이상은 버리지 않고 콘솔(stderr)에 바로 기록합니다.
+    """
+
+    def __init__(self, queue_):
+        super().__init__(queue_)
+        self._fallback = logging.StreamHandler()
+        self._fallback.setFormatter(logging.Formatter(_CONSOLE_FORMAT))
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지 인자만 확정하고, 포맷팅/직렬화는 백그라운드 스레드의 핸들러에서 수행
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                self._fallback.handle(record)
+                return
+            LOG_RECORDS_DROPPED.inc(logger=record.name, reason="queue_full")
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging() -> None:
+    """루트 로거에 큐 기반 비동기 로깅 파이프라인 설정 (파일: JSON lines, 콘솔: 텍스트, LOG_DIR 이 비어 있으면 콘솔만)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    handlers = []
+    if settings.LOG_DIR:
+        os.makedirs(settings.LOG_DIR, exist_ok=True)
+        file_handler = SizeAndTimeRotatingFileHandler(
+            os.path.join(settings.LOG_DIR, "poli_agent.log"),
+            max_bytes=settings.LOG_FILE_MAX_BYTES,
+            backup_count=settings.LOG_FILE_BACKUP_COUNT,
+            interval_seconds=settings.LOG_ROTATE_INTERVAL_SECONDS,
+        )
+        file_handler.setFormatter(JsonFormatter(settings.LOG_MAX_FIELD_CHARS))
+        handlers.append(file_handler)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(_CONSOLE_FORMAT))
+    handlers.append(stream_handler)
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(settings.LOG_SAMPLE_RATES, settings.LOG_RATE_LIMITS))
+
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL)
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 레코드를 모두 기록하고 백그라운드 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+setup_logging()
+
+
+def log_tool_usage(agent_name: str, tool_name: str, args: Any):
     logger = logging.getLogger(agent_name)
-    logger.info(f"Tool Used - Tool: {tool_name}, Arguments: {args}")
+    # 인자 직렬화는 백그라운드 포맷터에서 길이 제한과 함께 수행
+    logger.info(
+        "Tool Used - Tool: %s", tool_name,
+        extra={"event": "tool_usage", "agent": agent_name, "tool": tool_name, "tool_args": args},
+    )
+
+# 로그에 남기는 사용자 발화의 개인정보 마스킹 (구체적인 형식부터 적용)
+_REDACTIONS = (
+    (re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"), "<email>"),
+    (re.compile(r"(?<!\d)\d{6}-?[1-4]\d{6}(?!\d)"), "<rrn>"),
+    (re.compile(r"(?<!\d)01[016789][-.\s]?\d{3,4}[-.\s]?\d{4}(?!\d)"), "<phone>"),
+    (re.compile(r"(?<!\d)\d{2,6}(?:-\d{2,7}){1,4}(?!\d)|(?<!\d)\d{10,14}(?!\d)"), "<account>"),
+    (re.compile(r"\d"), "#"),
+)
+
+
+def redact_text(text: str) -> str:
+    """이메일, 주민등록번호, 전화번호, 계좌번호를 치환하고 남은 숫자도 # 으로 가림"""
+    for pattern, replacement in _REDACTIONS:
+        text = pattern.sub(replacement, text)
+    return text
+
 
-def log_agent_routing(from_agent: str, to_agent: str, reason: str = None):
+def log_agent_routing(from_agent: str, to_agent: str, reason: str = None, **fields: Any):
+    """라우팅 결정 기록 (fields: text, source, confidence 등 라우터 학습/분석용 구조화 필드, text 는 마스킹해서 기록)"""
+    if fields.get("text"):
+        fields["text"] = redact_text(fields["text"])
     logger = logging.getLogger("supervisor")
-    logger.info(f"Agent Routing - From: {from_agent}, To: {to_agent}, Reason: {reason}") 
\ No newline at end of file
+    logger.info(
+        "Agent Routing - From: %s, To: %s, Reason: %s", from_agent, to_agent, reason,
+        extra={"event": "agent_routing", "from_agent": from_agent, "to_agent": to_agent, "reason": reason, **fields},
+    )
@@ -0,0 +1,89 @@
+"""
+모델 등급 정책
+
+- 호출 위치(router, chat, poli, collection, check, letter, tools, search)마다 등급(MODEL_TIER_POLICY)을,
+  등급마다 모델(MODEL_TIERS)을 설정에서 지정합니다.
+- 요청마다 부하(동시 처리 중인 요청 수)와 남은 지연 예산(X-Latency-Budget-Ms)을 보고
+  MODEL_DOWNGRADE 에 따라 낮은 등급으로 바꿔 호출합니다.
+"""
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from app.config.settings import settings
+from utils.metrics import registry
+
+MODEL_SELECTIONS = registry.counter(
+    "poli_model_selections_total",
+    "호출 위치별 선택된 모델 등급 (reason: policy 기본 등급, load 부하로 하향, budget 지연 예산 부족으로 하향)",
+    ("site", "tier", "reason"))
+
+
+@dataclass
+class RequestBudget:
+    budget_ms: Optional[float]  # None 이면 제한 없음
+    started: float = field(default_factory=time.perf_counter)
+
+    def remaining_ms(self) -> Optional[float]:
+        if self.budget_ms is None:
+            return None
+        return self.budget_ms - (time.perf_counter() - self.started) * 1000
+
+
+_current_budget: ContextVar[Optional[RequestBudget]] = ContextVar("poli_request_budget", default=None)
+_inflight = 0
+
+
+def start_request(budget_ms: Optional[float] = None) -> RequestBudget:
+    """요청 시작: 지연 예산을 현재 컨텍스트에 바인딩하고 동시 처리 요청 수 증가"""
+    global _inflight
+    _inflight += 1
+    budget = RequestBudget(budget_ms if budget_ms and budget_ms > 0 else None)
+    _current_budget.set(budget)
+    return budget
+
+
+def finish_request() -> None:
+    global _inflight
+    _inflight = max(0, _inflight - 1)
+
+
+def inflight_requests() -> int:
+    return _inflight
+
+
+def tier_for(site: str) -> str:
+    """호출 위치의 기본 등급 (정책에 없는 위치는 tools 등급)"""
+    return settings.MODEL_TIER_POLICY.get(site, settings.MODEL_TIER_POLICY["tools"])
+
+
+def tier_chain(site: str) -> List[str]:
+    """기본 등급부터 하향 가능한 등급까지 순서대로"""
+    tiers = [tier_for(site)]
+    while settings.MODEL_DOWNGRADE.get(tiers[-1]) and settings.MODEL_DOWNGRADE[tiers[-1]] not in tiers:
+        tiers.append(settings.MODEL_DOWNGRADE[tiers[-1]])
+    return tiers
+
+
+def _downgrade_reason(tier: str) -> Optional[str]:
+    if settings.MODEL_DOWNGRADE_INFLIGHT and _inflight >= settings.MODEL_DOWNGRADE_INFLIGHT:
+        return "load"
+    budget = _current_budget.get()
+    remaining = budget.remaining_ms() if budget is not None else None
+    if remaining is not None and remaining < settings.MODEL_TIER_LATENCY_MS.get(tier, 0):
+        return "budget"
+    return None
+
+
+def select_tier(site: str) -> str:
+    """현재 요청 상태에서 호출 위치가 사용할 등급"""
+    tiers = tier_chain(site)
+    tier, reason = tiers[0], "policy"
+    for lower in tiers[1:]:
+        why = _downgrade_reason(tier)
+        if why is None:
+            break
+        tier, reason = lower, why
+    MODEL_SELECTIONS.inc(site=site, tier=tier, reason=reason)
+    return tier
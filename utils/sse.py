@@ -0,0 +1,19 @@
+import json
+from typing import Any, AsyncIterator, Dict
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events 형식의 메시지 문자열을 생성"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def sse_stream(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """{"event": ..., "data": ...} 형태의 이벤트 스트림을 SSE 문자열 스트림으로 변환"""
+    async for item in events:
+        yield format_sse(item["event"], item["data"])
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # nginx 프록시 버퍼링 비활성화
+}
@@ -0,0 +1,198 @@
+"""
+요청 단위 LLM 토큰/비용 집계
+
+HTTP 요청마다 RequestUsage 를 contextvar 로 바인딩하고, 토큰 사용량 콜백(utils.llm)이 요청 처리 중 발생한
+모든 LLM 호출(슈퍼바이저 그래프, CheckService, LetterService, 도구)을 현재 요청에 기록합니다.
+어느 경로에서 호출했는지는 usage_component() 로 지정한 구성 요소 이름(예: supervisor.poliagent, check)으로 구분합니다.
+
+요청이 끝나면 엔드포인트별/세션별 누적값(UsageTracker)과 메트릭에 합산합니다.
+"""
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from app.config.settings import settings
+from utils.metrics import registry
+
+LLM_COST = registry.counter(
+    "poli_llm_cost_usd_total", "LLM 추정 비용 (USD)", ("model", "endpoint", "component"))
+LLM_REQUEST_TOKENS = registry.counter(
+    "poli_llm_request_tokens_total", "엔드포인트/구성 요소별 LLM 토큰 사용량", ("endpoint", "component", "type"))
+LLM_REQUEST_COST = registry.histogram(
+    "poli_llm_request_cost_usd", "요청당 LLM 추정 비용 (USD)", ("endpoint",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+
+_current_usage: ContextVar[Optional["RequestUsage"]] = ContextVar("llm_request_usage", default=None)
+_current_component: ContextVar[str] = ContextVar("llm_usage_component", default="other")
+
+
+def _price(model: str) -> Optional[Tuple[float, float]]:
+    """LLM_PRICES 에서 모델 단가 조회 (gpt-4o-mini-2024-07-18 처럼 날짜가 붙은 이름은 가장 긴 접두사로 매칭)"""
+    prices = settings.LLM_PRICES
+    if model in prices:
+        return tuple(prices[model])
+    matches = [name for name in prices if model.startswith(name)]
+    return tuple(prices[max(matches, key=len)]) if matches else None
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """100만 토큰당 (입력, 출력) 단가로 비용 추정 (단가를 모르는 모델은 0)"""
+    price = _price(model)
+    if price is None:
+        return 0.0
+    return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+
+def _empty() -> Dict[str, float]:
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+
+
+def _add(total: Dict[str, float], calls: int, prompt: int, completion: int, cost: float) -> None:
+    total["calls"] += calls
+    total["prompt_tokens"] += prompt
+    total["completion_tokens"] += completion
+    total["cost_usd"] += cost
+
+
+def _rounded(total: Dict[str, float]) -> Dict[str, Any]:
+    return {**total, "cost_usd": round(total["cost_usd"], 6)}
+
+
+class RequestUsage:
+    """요청 하나에서 발생한 LLM 호출의 모델별/구성 요소별 사용량"""
+
+    def __init__(self, endpoint: str = "other", session_id: Optional[str] = None):
+        self.endpoint = endpoint
+        self.session_id = session_id
+        self.total = _empty()
+        self.by_model: Dict[str, Dict[str, float]] = {}
+        self.by_component: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()  # 동기 도구는 스레드풀에서 실행됨
+
+    def record(self, model: str, component: str, prompt: int, completion: int) -> float:
+        cost = estimate_cost(model, prompt, completion)
+        with self._lock:
+            _add(self.total, 1, prompt, completion, cost)
+            _add(self.by_model.setdefault(model, _empty()), 1, prompt, completion, cost)
+            _add(self.by_component.setdefault(component, _empty()), 1, prompt, completion, cost)
+        return cost
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **_rounded(self.total),
+                "by_model": {k: _rounded(v) for k, v in self.by_model.items()},
+                "by_component": {k: _rounded(v) for k, v in self.by_component.items()},
+            }
+
+    def header_value(self) -> str:
+        """응답 헤더용 요약 (예: calls=3; prompt_tokens=1200; completion_tokens=150; cost_usd=0.000270)"""
+        total = self.total
+        return (f"calls={total['calls']}; prompt_tokens={total['prompt_tokens']}; "
+                f"completion_tokens={total['completion_tokens']}; cost_usd={total['cost_usd']:.6f}")
+
+
+class UsageTracker:
+    """엔드포인트별, 세션별 누적 사용량 (세션은 최근 USAGE_MAX_SESSIONS 개만 유지)"""
+
+    def __init__(self, max_sessions: int = None):
+        self.max_sessions = settings.USAGE_MAX_SESSIONS if max_sessions is None else max_sessions
+        self._endpoints: Dict[str, Dict[str, float]] = {}
+        self._sessions: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, usage: RequestUsage) -> None:
+        total = usage.total
+        args = (total["calls"], total["prompt_tokens"], total["completion_tokens"], total["cost_usd"])
+        with self._lock:
+            endpoint = self._endpoints.setdefault(usage.endpoint, {**_empty(), "requests": 0})
+            endpoint["requests"] += 1
+            _add(endpoint, *args)
+            if usage.session_id:
+                session = self._sessions.pop(usage.session_id, None) or {**_empty(), "requests": 0}
+                session["requests"] += 1
+                _add(session, *args)
+                self._sessions[usage.session_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+
+    def endpoints(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {k: _rounded(v) for k, v in self._endpoints.items()}
+
+    def session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            total = self._sessions.get(session_id)
+            return _rounded(total) if total else None
+
+    def top_sessions(self, limit: int = 10) -> Dict[str, Dict[str, Any]]:
+        """비용이 큰 세션 순으로 반환"""
+        with self._lock:
+            ranked = sorted(self._sessions.items(), key=lambda item: item[1]["cost_usd"], reverse=True)
+            return {k: _rounded(v) for k, v in ranked[:limit]}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"endpoints": self.endpoints(), "sessions": len(self._sessions), "top_sessions": self.top_sessions()}
+
+
+@lru_cache(maxsize=None)
+def get_usage_tracker() -> UsageTracker:
+    return UsageTracker()
+
+
+def current_usage() -> Optional[RequestUsage]:
+    return _current_usage.get()
+
+
+def start_request_usage(endpoint: str = "other", session_id: Optional[str] = None) -> RequestUsage:
+    """현재 컨텍스트(및 이후 생성되는 태스크)에 요청 사용량 집계를 바인딩"""
+    usage = RequestUsage(endpoint, session_id)
+    _current_usage.set(usage)
+    return usage
+
+
+def finish_request_usage(usage: RequestUsage) -> None:
+    """요청 사용량을 엔드포인트/세션 누적값과 요청당 비용 메트릭에 합산 (LLM 호출이 없던 요청은 제외)"""
+    if not usage.total["calls"]:
+        return
+    get_usage_tracker().add(usage)
+    LLM_REQUEST_COST.observe(usage.total["cost_usd"], endpoint=usage.endpoint)
+
+
+def bind_session(session_id: str) -> None:
+    """현재 요청의 사용량을 세션에 귀속 (요청 본문에서 세션 ID를 알게 된 시점에 호출)"""
+    usage = _current_usage.get()
+    if usage is not None and session_id:
+        usage.session_id = session_id
+
+
+@contextmanager
+def usage_component(name: str) -> Iterator[None]:
+    """블록 안에서 발생한 LLM 호출을 name 구성 요소로 기록"""
+    token = _current_component.set(name)
+    try:
+        yield
+    finally:
+        try:
+            _current_component.reset(token)
+        except ValueError:
+            # 클라이언트 연결 종료 등으로 비동기 제너레이터가 다른 컨텍스트에서 닫힌 경우
+            pass
+
+
+def record_llm_usage(model: str, prompt: int, completion: int) -> None:
+    """LLM 호출 하나의 사용량을 현재 요청과 메트릭에 기록 (요청 밖의 호출은 endpoint=none)"""
+    usage = _current_usage.get()
+    component = _current_component.get()
+    endpoint = usage.endpoint if usage is not None else "none"
+    cost = usage.record(model, component, prompt, completion) if usage is not None \
+        else estimate_cost(model, prompt, completion)
+    if prompt:
+        LLM_REQUEST_TOKENS.inc(prompt, endpoint=endpoint, component=component, type="prompt")
+    if completion:
+        LLM_REQUEST_TOKENS.inc(completion, endpoint=endpoint, component=component, type="completion")
+    if cost:
+        LLM_COST.inc(cost, model=model, endpoint=endpoint, component=component)